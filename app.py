@@ -1,19 +1,49 @@
 from pathlib import Path
-import copy
 import json
 import os
 import tempfile
+import time
+
+STARTED = time.perf_counter()
 
 os.environ.setdefault("MPLCONFIGDIR", str(Path(tempfile.gettempdir()) / "poverty_dashboard_matplotlib"))
 
 import streamlit as st
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-import folium
-import requests
-from streamlit_folium import st_folium
+
+# Path dan skema kolom didefinisikan di dashboard/config.py agar bisa dipakai CLI.
+# Folium, streamlit_folium, dan requests diimpor saat dibutuhkan (lihat dashboard/warmup.py).
+from dashboard import (
+    charts, data_store, export, geo_source, geometry, loader, partitions, prediction, province_cube, render_cache,
+    snapshot, tiles, tracing, warmup,
+)
+from dashboard.config import (
+    CHART_BACKEND,
+    DATA_PATH,
+    DISTRICT_GEOJSON_KEY,
+    DISTRICT_GEOJSON_PATH,
+    GEOJSON_URL,
+    GEOMETRY_LEVEL,
+    LOCAL_GEOJSON_PATH,
+    MAP_RENDERER,
+    MAP_ZOOM_START,
+    MODEL_PATH,
+    PARTITION_DIR,
+    PROVINCE_REGIONS,
+    SCALER_PATH,
+    TRACE_LOG,
+    WARMUP,
+)
+from dashboard.aggregation import WEIGHT_COLUMNS
+from dashboard.correlation import CorrelationEngine
+from dashboard.geo_source import GeoJSONUnavailable, validate_geojson
+from dashboard.query import DatasetIndex, FilteredDataset, Query, filtered_dataset
+
+warmup.record_import('app', time.perf_counter() - STARTED)
+
+if TRACE_LOG:
+    tracing.configure_logging()
 
 # Konfigurasi Halaman Streamlit
 st.set_page_config(
@@ -22,46 +52,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- KONSTANTA PATH ---
-BASE_DIR = Path(__file__).resolve().parent
-DATA_PATH = BASE_DIR / 'data' / 'df_cleaned.csv'
-LOCAL_GEOJSON_PATH = BASE_DIR / 'data' / 'prov 34.geojson'
-GEOJSON_URL = 'https://raw.githubusercontent.com/JfrAziz/indonesia-district/refs/heads/master/prov%2034%20simplified.geojson'
-GEOJSON_PROVINCE_KEY = 'feature.properties.name'
-
-COLUMN_MAPPING = {
-    'Provinsi': 'Provinsi',
-    'Kab/Kota': 'Kab/Kota',
-    'Indeks Pembangunan Manusia': 'Indeks Pembangunan Manusia',
-    'Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)': 'Persentase Kemiskinan (P0)',
-    'Rata-rata Lama Sekolah Penduduk 15+ (Tahun)': 'Rata-Rata Lama Sekolah',
-    'Pengeluaran per Kapita Disesuaikan (Ribu Rupiah/Orang/Tahun)': 'Pengeluaran Per Kapita',
-    'Umur Harapan Hidup (Tahun)': 'Umur Harapan Hidup',
-    'Persentase rumah tangga yang memiliki akses terhadap sanitasi layak': 'Akses Sanitasi Layak',
-    'Persentase rumah tangga yang memiliki akses terhadap air minum layak': 'Akses Air Minum Layak',
-    'Tingkat Pengangguran Terbuka': 'Tingkat Pengangguran Terbuka',
-    'Tingkat Partisipasi Angkatan Kerja': 'Tingkat Partisipasi Angkatan Kerja',
-    'PDRB atas Dasar Harga Konstan menurut Pengeluaran (Rupiah)': 'PDRB',
-}
-
-REQUIRED_COLUMNS = [
-    'Provinsi',
-    'Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)',
-]
-
-NUMERIC_COLUMNS = [
-    'Indeks Pembangunan Manusia',
-    'Persentase Kemiskinan (P0)',
-    'Rata-Rata Lama Sekolah',
-    'Pengeluaran Per Kapita',
-    'Umur Harapan Hidup',
-    'Akses Sanitasi Layak',
-    'Akses Air Minum Layak',
-    'Tingkat Pengangguran Terbuka',
-    'Tingkat Partisipasi Angkatan Kerja',
-    'PDRB',
-]
-
 # --- CUSTOM CSS ---
 def load_css():
     """Load custom CSS for better UI"""
@@ -89,55 +79,17 @@ def load_css():
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def preprocess_data(df):
-    """
-    Membersihkan, memproses, dan mengagregasi DataFrame.
-    """
-    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
-    if missing_columns:
-        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing_columns)}")
-
-    # Filter kolom yang ada di DataFrame
-    valid_columns = {k: v for k, v in COLUMN_MAPPING.items() if k in df.columns}
-    df_processed = df[list(valid_columns.keys())].copy()
-    df_processed.rename(columns=valid_columns, inplace=True)
-
-    for column in NUMERIC_COLUMNS:
-        if column in df_processed.columns:
-            df_processed[column] = pd.to_numeric(
-                df_processed[column].astype(str).str.strip().str.replace(',', '.', regex=False),
-                errors='coerce'
-            )
-
-    # Konversi Pengeluaran Per Kapita dari tahunan ke bulanan
-    if 'Pengeluaran Per Kapita' in df_processed.columns:
-        df_processed['Pengeluaran Per Kapita'] = df_processed['Pengeluaran Per Kapita'] / 12
-
-    # Normalisasi nama provinsi
-    if 'Provinsi' in df_processed.columns:
-        df_processed['Provinsi'] = df_processed['Provinsi'].astype(str).str.upper().str.strip()
-
-    invalid_provinces = df_processed['Provinsi'].isin(['', 'NAN', 'NONE'])
-    if df_processed['Provinsi'].isna().any() or invalid_provinces.any():
-        raise ValueError("Kolom Provinsi memiliki nilai kosong.")
-
-    invalid_numeric_columns = [
-        col for col in NUMERIC_COLUMNS
-        if col in df_processed.columns and df_processed[col].isna().any()
-    ]
-    if invalid_numeric_columns:
-        raise ValueError(f"Kolom numerik memiliki nilai tidak valid: {', '.join(invalid_numeric_columns)}")
-
-    # Agregasi data ke tingkat provinsi dengan rata-rata sederhana kabupaten/kota.
-    df_provinsi = df_processed.groupby('Provinsi').mean(numeric_only=True).reset_index()
+@st.cache_resource(show_spinner=False)
+def get_geojson_source(url):
+    """Sumber GeoJSON cadangan (cache disk + sesi HTTP) yang dibagi semua sesi di proses ini."""
+    return geo_source.RemoteGeoJSON(url)
 
-    return df_processed, df_provinsi
-
-@st.cache_data
 def load_geojson(local_path, fallback_url=None):
     """
-    Memuat data GeoJSON lokal terlebih dahulu, lalu URL cadangan jika perlu.
+    Memuat data GeoJSON lokal terlebih dahulu, lalu salinan cache URL cadangan.
+
+    URL cadangan tidak pernah ditunggu: jika belum ada salinan cache,
+    unduhan berjalan di latar dan `GeoJSONUnavailable` dilempar.
     """
     local_path = Path(local_path)
     if local_path.exists():
@@ -155,92 +107,343 @@ def load_geojson(local_path, fallback_url=None):
         st.error(f"**Error:** File GeoJSON tidak ditemukan: `{local_path}`")
         return None
 
-    try:
-        response = requests.get(fallback_url, timeout=10)
-        response.raise_for_status()
-        geojson_data = response.json()
-        validate_geojson(geojson_data)
-        return geojson_data
-    except requests.exceptions.Timeout:
-        st.error("**Timeout:** Koneksi ke server GeoJSON terlalu lama. Coba refresh halaman.")
-        return None
-    except requests.exceptions.RequestException as e:
-        st.error(f"**Error:** Gagal memuat GeoJSON. {str(e)}")
-        return None
-    except ValueError as e:
-        st.error(f"**Error:** Format GeoJSON tidak valid. {str(e)}")
-        return None
-
-def validate_geojson(geojson_data):
-    """Validate the minimal GeoJSON contract needed by the dashboard."""
-    if not isinstance(geojson_data, dict):
-        raise ValueError("GeoJSON harus berupa object JSON.")
+    return get_geojson_source(fallback_url).get()
 
-    if geojson_data.get('type') != 'FeatureCollection':
-        raise ValueError("GeoJSON harus bertipe FeatureCollection.")
+@st.cache_resource(show_spinner=False)
+def get_data_store():
+    """Data store memory-map yang dibagi antarproses worker."""
+    return data_store.DataStore()
 
-    features = geojson_data.get('features')
-    if not isinstance(features, list) or not features:
-        raise ValueError("GeoJSON tidak memiliki daftar features.")
+@st.cache_resource(show_spinner=False)
+def get_dataset_loader():
+    """Lapisan pemuatan dataset yang dipakai bersama oleh semua sesi di proses ini."""
+    return loader.DatasetLoader(get_data_store())
 
-    missing_name = [
-        idx for idx, feature in enumerate(features, start=1)
-        if not isinstance(feature, dict) or not feature.get('properties', {}).get('name')
-    ]
-    if missing_name:
-        raise ValueError(f"Properti name kosong pada feature: {missing_name[:5]}")
+@st.cache_resource(show_spinner=False)
+def get_partition_store():
+    """Penyimpanan dataset multi-tahun yang dipartisi per tahun dan provinsi."""
+    return partitions.PartitionStore(PARTITION_DIR)
 
-@st.cache_data
-def load_data(data_path):
+def load_dataset(data_path, year=None, quiet=False):
     """
-    Memuat dan memproses data kemiskinan dari file CSV.
+    Memuat dataset terproses satu tahun beserta versinya.
+
+    Kunci cache berasal dari sidik jari file sumber dan manifest partisi
+    sehingga rerun yang cache hit tidak menyentuh data sama sekali. Frame yang
+    dikembalikan dipakai bersama oleh semua sesi dan bersifat read-only.
+    `quiet=True` tidak menampilkan pesan error/peringatan (sudah ditampilkan halaman).
     """
     try:
         data_path = Path(data_path)
-        if not data_path.exists():
+        store = get_partition_store()
+        if not data_path.exists() and not store.years():
+            if quiet:
+                return None
             st.error(f"**Error:** File tidak ditemukan: `{data_path}`")
             st.info("**Catatan deployment:**\n"
                    "- Pastikan folder `data/` dan file `df_cleaned.csv` ada di repository\n"
                    "- Upload file melalui GitHub repository Anda\n"
                    "- Periksa struktur folder: `your_repo/data/df_cleaned.csv`")
-            return None, None
-        
-        df = pd.read_csv(data_path)
-        df_processed, df_provinsi = preprocess_data(df)
-        return df_processed, df_provinsi
+            return None
+
+        with tracing.span('load_dataset'):
+            dataset = loader.load_year(data_path, year, get_dataset_loader(), store)
+        if dataset.validation is not None:
+            warnings = [violation.message() for violation in dataset.validation.warnings]
+        else:
+            warnings = store.warnings(loader.resolve_year(store, data_path, year))
+        if not quiet and warnings:
+            lines = '\n'.join(f"- {message}" for message in warnings)
+            st.warning(f"**Peringatan validasi data:**\n\n{lines}")
+        return dataset
     except (OSError, pd.errors.ParserError, ValueError) as e:
-        st.error(f"**Error:** Gagal memuat data. {str(e)}")
+        if not quiet:
+            st.error(f"**Error:** Gagal memuat data. {str(e)}")
+        return None
+
+def map_geometry_level():
+    return geometry.level_for_zoom(MAP_ZOOM_START) if GEOMETRY_LEVEL == 'auto' else GEOMETRY_LEVEL
+
+def publish_map_geojson(local_geojson_path, level, store):
+    """
+    Siapkan varian GeoJSON peta dan publikasikan ke data store (tanpa pemanggilan st.*).
+
+    Dipakai oleh pemanasan awal; `load_map_cube` lalu cukup membaca hasilnya dari store.
+    """
+    local_geojson_path = Path(local_geojson_path)
+    geometry_version = snapshot.source_digest(local_geojson_path)
+    if store.attach_bytes('geojson', f"{geometry_version}-{level}") is not None:
+        return
+    with local_geojson_path.open(encoding='utf-8') as file:
+        geojson_data = json.load(file)
+    validate_geojson(geojson_data)
+    geojson_data = geometry.load_variant(geojson_data, geometry_version, level)
+    store.publish_bytes('geojson', f"{geometry_version}-{level}", geometry.encode_json(geojson_data))
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def load_map_cube(dataset_version, _df_provinsi, local_geojson_path, fallback_url=None, persist=True,
+                  remote_version=None):
+    """
+    Memuat kubus provinsi untuk halaman peta.
+
+    Memakai cache_resource agar setiap rerun berbagi objek yang sama tanpa
+    deserialisasi ulang GeoJSON; kubus tidak boleh dimodifikasi pemanggil.
+    Kunci cache adalah versi dataset (dan `remote_version`, digest salinan
+    GeoJSON cadangan); frame provinsi tidak ikut di-hash.
+    Kubus tampilan terfilter (`persist=False`) tidak ditulis ke disk.
+    `GeoJSONUnavailable` tidak di-cache sehingga rerun berikutnya mencoba lagi.
+    """
+    tracing.annotate(cache='miss')
+    # Varian geometri yang disederhanakan dipilih dari konfigurasi atau zoom awal peta.
+    level = map_geometry_level()
+    store = get_data_store()
+    # Varian mungkin sedang disiapkan oleh pemanasan awal; tunggu agar tidak dibangun dua kali.
+    get_warmup().result('geojson')
+    local_geojson_path = Path(local_geojson_path)
+    try:
+        geometry_version = snapshot.source_digest(local_geojson_path)
+    except OSError:
+        geometry_version = None
+
+    # GeoJSON varian yang sudah di-encode dipublikasikan sekali untuk semua worker.
+    encoded = store.attach_bytes('geojson', f"{geometry_version}-{level}") if geometry_version else None
+    if encoded is not None:
+        geojson_data = json.loads(encoded[:])
+    else:
+        with tracing.span('load_geojson'):
+            geojson_data = load_geojson(local_geojson_path, fallback_url)
+        if geojson_data is None:
+            return None
+        if geometry_version is None:
+            geometry_version = province_cube.geometry_version(geojson_data)
+        geojson_data = geometry.load_variant(geojson_data, geometry_version, level)
+        try:
+            store.publish_bytes('geojson', f"{geometry_version}-{level}", geometry.encode_json(geojson_data))
+        except OSError:
+            pass
+
+    return province_cube.load_province_cube(
+        _df_provinsi, geojson_data, dataset_version, f"{geometry_version}:{level}", persist=persist
+    )
+
+@st.cache_resource(show_spinner=False)
+def load_map_tiles(cube_version, _cube, _df_processed, local_geojson_path, district_geojson_path=None):
+    """
+    Memuat (atau membangun sekali) vector tile peta untuk kubus ini.
+
+    Mengembalikan (metadata tileset, legenda kab/kota atau None). Tile ditulis
+    di folder static Streamlit sehingga browser mengambilnya langsung.
+    """
+    tracing.annotate(cache='miss')
+    local_geojson_path = Path(local_geojson_path)
+    geojson_data = load_geojson(local_geojson_path)
+    if geojson_data is None:
         return None, None
+    geometry_version = snapshot.source_digest(local_geojson_path)
+    map_builder = warmup.timed_import('dashboard.map_builder')
+    _, fill_colors = map_builder.feature_fill_colors(_cube.df_provinsi, geojson_data)
+    layers = [tiles.province_layer(_cube, geojson_data, geometry_version, fill_colors)]
+    version_parts = [cube_version]
+
+    district_colormap = None
+    if district_geojson_path:
+        with Path(district_geojson_path).open(encoding='utf-8') as file:
+            district_geojson = json.load(file)
+        district_version = snapshot.source_digest(district_geojson_path)
+        district_colormap, district_colors = map_builder.district_fill_colors(_df_processed)
+        formats = tiles.district_formats(_df_processed, province_cube.PROPERTY_FORMATS)
+        layers.append(tiles.district_layer(
+            district_geojson, district_version, DISTRICT_GEOJSON_KEY, district_colors, formats
+        ))
+        version_parts += [district_version, DISTRICT_GEOJSON_KEY]
+
+    with tracing.span('build_tiles'):
+        tileset = tiles.load_tileset(layers, tiles.tileset_version(*version_parts))
+    return tileset, district_colormap
+
+def remote_geojson_version():
+    """Digest salinan GeoJSON cadangan yang dipakai jika file lokal tidak ada, selain itu None."""
+    if LOCAL_GEOJSON_PATH.exists():
+        return None
+    return get_geojson_source(GEOJSON_URL).version()
 
-def create_correlation_heatmap(df):
-    """Create correlation heatmap with proper sizing"""
-    fig, ax = plt.subplots(figsize=(14, 10))
-    numeric_df = df.select_dtypes(include=np.number)
-    
-    if len(numeric_df.columns) > 1:
-        corr_matrix = numeric_df.corr()
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', 
-                   fmt=".2f", ax=ax, square=True,
-                   linewidths=0.5, cbar_kws={"shrink": 0.8})
-        plt.xticks(rotation=45, ha='right')
-        plt.yticks(rotation=0)
-        plt.tight_layout()
-        return fig
+def use_vector_tiles():
+    """Tile hanya bisa dipakai jika Streamlit menyajikan folder static."""
+    if MAP_RENDERER == 'geojson':
+        return False
+    return MAP_RENDERER == 'tiles' or bool(st.get_option('server.enableStaticServing'))
+
+@st.cache_resource(show_spinner=False)
+def get_warmup():
+    """
+    Pemanasan awal sekali per proses.
+
+    Snapshot dataset dan varian GeoJSON peta dimuat bersamaan di thread latar
+    sementara kerangka halaman pertama dirender; artefak model menyusul
+    setelah run pertama selesai.
+    """
+    pool = warmup.Warmup()
+    if WARMUP:
+        pool.submit('dataset', loader.load_year, Path(DATA_PATH), None, get_dataset_loader(), get_partition_store())
+        if LOCAL_GEOJSON_PATH.exists():
+            pool.submit('geojson', publish_map_geojson, LOCAL_GEOJSON_PATH, map_geometry_level(), get_data_store())
+        else:
+            # Salinan GeoJSON cadangan direvalidasi di thread sendiri; halaman tidak menunggunya.
+            get_geojson_source(GEOJSON_URL).refresh_in_background()
+        # Impor xgboost memegang GIL cukup lama, jadi model baru dimuat setelah run pertama selesai.
+        pool.defer('model', prediction.load_model, MODEL_PATH, SCALER_PATH)
+    return pool
+
+@st.cache_resource(show_spinner=False)
+def get_prediction_model():
+    """
+    Model XGBoost dan scaler dimuat sekali per proses.
+
+    Mengembalikan (model, pesan_error); model None jika dependency prediksi
+    belum terpasang atau artefak model tidak bisa dibaca.
+    """
+    try:
+        return get_warmup().result('model', prediction.load_model, MODEL_PATH, SCALER_PATH), None
+    except (ImportError, OSError, ValueError) as e:
+        return None, str(e)
+
+@st.cache_resource(show_spinner=False)
+def load_predictions(dataset_version, model_version, _df_processed, _model):
+    """
+    Prediksi per kabupaten/kota dan ringkasan per provinsi.
+
+    Kunci cache adalah versi dataset dan versi model; frame dan model tidak ikut di-hash.
+    """
+    tracing.annotate(cache='miss')
+    predictions = prediction.load_predictions(_model, _df_processed, dataset_version, get_data_store())
+    return predictions, prediction.aggregate_predictions(_df_processed, predictions)
+
+def get_predictions(dataset):
+    """
+    Prediksi untuk dataset, atau (None, None) jika model tidak tersedia.
+
+    Tampilan terfilter memakai baris prediksi dataset asli; hanya ringkasan
+    provinsinya yang dihitung ulang.
+    """
+    model, _ = get_prediction_model()
+    if model is None:
+        return None, None
+    base = dataset.base if isinstance(dataset, FilteredDataset) else dataset
+    try:
+        with tracing.span('load_predictions', cache='hit'):
+            predictions, aggregated = load_predictions(base.version, model.version, base.df_processed, model)
+    except ValueError as e:
+        st.warning(f"Prediksi tidak dapat dihitung: {e}")
+        return None, None
+    if base is dataset:
+        return predictions, aggregated
+    predictions = predictions.iloc[dataset.rows].reset_index(drop=True)
+    return predictions, prediction.aggregate_predictions(dataset.df_processed, predictions)
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_index(dataset_version, _df_processed):
+    """
+    Indeks peringkat dan bitmap provinsi untuk filter sidebar.
+
+    Dibangun sekali per versi dataset; hasil kueri di-cache di indeks.
+    """
+    tracing.annotate(cache='miss')
+    return DatasetIndex(_df_processed)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def load_filtered_dataset(dataset_version, query_key, _dataset, _index, _query):
+    """Tampilan terfilter yang dipakai bersama oleh semua sesi dengan filter yang sama."""
+    tracing.annotate(cache='miss')
+    return filtered_dataset(_dataset, _index, _query)
+
+def get_filtered_dataset(dataset, query):
+    """Dataset terfilter sesuai `query`; dataset asli jika tanpa filter."""
+    if dataset is None or query is None or query.is_empty:
+        return dataset
+    index = get_dataset_index(dataset.version, dataset.df_processed)
+    with tracing.span('filter_dataset', cache='hit'):
+        return load_filtered_dataset(dataset.version, query.key, dataset, index, query)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_correlation_engine(dataset_version, _df_processed):
+    """
+    Akumulator co-moment per provinsi untuk heatmap korelasi.
+
+    Dibangun sekali per versi dataset; matriks per subset wilayah di-cache di engine.
+    """
+    tracing.annotate(cache='miss')
+    return CorrelationEngine.from_frame(_df_processed)
+
+@st.cache_resource(show_spinner=False)
+def get_render_cache():
+    """Cache PNG gambar EDA yang dipakai bersama oleh semua sesi di proses ini."""
+    return render_cache.RenderCache()
+
+@st.cache_resource(show_spinner=False)
+def get_export_store():
+    """Buffer ekspor yang dipakai bersama oleh semua sesi di proses ini."""
+    return export.ExportStore()
+
+def get_chart(backend, dataset_version, figure_name, build, persist=True, **params):
+    """
+    Buat grafik lewat backend; hasil render server disimpan di render cache.
+
+    Grafik tampilan terfilter (`persist=False`) hanya disimpan di memori.
+    """
+    span_name = f"chart:{figure_name}" + (f":{params['feature']}" if 'feature' in params else '')
+    with tracing.span(span_name) as chart_span:
+        if not backend.cacheable:
+            chart = build()
+        else:
+            def render_png():
+                chart = build()
+                return chart.image if chart is not None else None
+
+            key = render_cache.figure_key(dataset_version, figure_name, backend=backend.name, **params)
+            png = get_render_cache().get_or_render(key, render_png, persist)
+            chart = charts.Chart('image', image=png) if png else None
+
+        if chart_span.enabled:
+            chart_span.bytes = charts.payload_bytes(chart)
+    return chart
+
+def display_chart(chart):
+    """Tampilkan grafik sesuai jenis keluaran backend."""
+    if chart.kind == 'image':
+        st.image(chart.image, use_container_width=True)
     else:
+        st.vega_lite_chart(chart.data, chart.spec, use_container_width=True)
+
+def create_correlation_heatmap(df, backend, dataset_version, regions=(), persist=True):
+    """
+    Heatmap korelasi dari akumulator per provinsi.
+
+    `regions` kosong berarti seluruh Indonesia; selain itu hanya provinsi di
+    wilayah terpilih yang digabung, tanpa memindai ulang baris data.
+    """
+    with tracing.span('correlation_engine', cache='hit'):
+        engine = get_correlation_engine(dataset_version, df)
+    provinces = None
+    if regions:
+        provinces = [province for region in regions for province in PROVINCE_REGIONS[region]]
+
+    def build():
+        corr_matrix = engine.correlation(provinces)
+        if corr_matrix is None:
+            return None
+        return backend.correlation_heatmap(df, corr_matrix)
+
+    chart = get_chart(
+        backend, dataset_version, 'correlation_heatmap',
+        build, persist, figsize=(14, 10), cmap='coolwarm', regions=','.join(sorted(regions)),
+    )
+    if chart is None:
         st.warning("Data tidak cukup untuk membuat heatmap korelasi.")
-        return None
+    return chart
 
-def create_scatter_plots(df):
+def create_scatter_plots(df, backend, dataset_version, persist=True):
     """Create scatter plots for features vs poverty"""
-    all_feature_cols = [
-        'Pengeluaran Per Kapita', 
-        'Rata-Rata Lama Sekolah', 
-        'Indeks Pembangunan Manusia',
-        'Umur Harapan Hidup',
-        'Tingkat Pengangguran Terbuka'
-    ]
-    
-    available_features = [col for col in all_feature_cols if col in df.columns]
+    available_features = [col for col in charts.SCATTER_FEATURES if col in df.columns]
     
     if 'Persentase Kemiskinan (P0)' not in df.columns:
         st.warning("Kolom 'Persentase Kemiskinan (P0)' tidak ditemukan.")
@@ -257,19 +460,31 @@ def create_scatter_plots(df):
             if feature_idx < len(available_features):
                 feature = available_features[feature_idx]
                 with cols[col_idx]:
-                    fig, ax = plt.subplots(figsize=(7, 5))
-                    sns.scatterplot(data=df, x=feature, y='Persentase Kemiskinan (P0)', 
-                                  ax=ax, alpha=0.6, s=50)
-                    ax.set_title(f'Hubungan {feature} dengan Kemiskinan', 
-                               fontsize=12, fontweight='bold')
-                    ax.set_xlabel(feature, fontsize=10)
-                    ax.set_ylabel('Persentase Kemiskinan (%)', fontsize=10)
-                    ax.grid(True, alpha=0.3)
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    plt.close()
-
-def run_eda_page():
+                    chart = get_chart(
+                        backend, dataset_version, 'scatter',
+                        lambda: backend.scatter_plot(df, feature), persist, feature=feature, figsize=(7, 5)
+                    )
+                    display_chart(chart)
+
+def render_province_statistics(aggregator):
+    """Rata-rata, rata-rata berbobot, dan simpangan baku per provinsi dari statistik cukup."""
+    column = st.selectbox("Indikator", aggregator.stats.columns, key="province_statistics_column")
+    st.dataframe(aggregator.stats.summary(column), hide_index=True, use_container_width=True)
+
+def render_filter_notice(dataset):
+    """Keterangan filter aktif; False jika tidak ada baris yang lolos filter."""
+    if not isinstance(dataset, FilteredDataset):
+        return True
+    if dataset.df_processed.empty:
+        st.warning("Tidak ada kabupaten/kota yang lolos filter. Longgarkan filter di sidebar.")
+        return False
+    st.info(
+        f"Filter aktif: {len(dataset.df_processed):,} dari "
+        f"{len(dataset.base.df_processed):,} kabupaten/kota ditampilkan."
+    )
+    return True
+
+def run_eda_page(query=None, year=None):
     """
     Halaman Analisis Data Eksplorasi.
     """
@@ -277,9 +492,16 @@ def run_eda_page():
     st.markdown("---")
     
     with st.spinner("Memuat data..."):
-        df_processed, df_provinsi = load_data(DATA_PATH)
+        dataset = get_filtered_dataset(load_dataset(DATA_PATH, year), query)
+
+    if dataset is not None:
+        if not render_filter_notice(dataset):
+            return
+        df_processed, df_provinsi = dataset.df_processed, dataset.df_provinsi
+        dataset_version = dataset.version
+        # Seperti peta: ekspor dan gambar tampilan terfilter tidak ditulis ke cache disk.
+        persist = not isinstance(dataset, FilteredDataset)
 
-    if df_processed is not None:
         # Statistics Overview
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -298,139 +520,62 @@ def run_eda_page():
         # Data Preview
         st.subheader("Pratinjau Data")
         with st.expander("Lihat Data"):
-            st.dataframe(df_processed.head(20), use_container_width=True)
+            preview = df_processed.head(20)
+            predictions, _ = get_predictions(dataset)
+            if predictions is not None:
+                preview = pd.concat([preview, predictions.head(20)], axis=1)
+            st.dataframe(preview, use_container_width=True)
             
-            # Download button
-            csv = df_processed.to_csv(index=False)
+            # Download button: file hanya dibuat saat tombol diklik.
+            export_format = st.selectbox(
+                "Format unduhan",
+                list(export.EXPORT_FORMATS),
+                format_func=lambda key: export.EXPORT_FORMATS[key].label,
+            )
+            export_spec = export.EXPORT_FORMATS[export_format]
             st.download_button(
-                label="Download Data CSV",
-                data=csv,
-                file_name="data_kemiskinan_indonesia.csv",
-                mime="text/csv"
+                label=f"Download Data {export_spec.label}",
+                data=lambda: get_export_store().get_bytes(
+                    df_processed, dataset_version, export_format, persist
+                ),
+                file_name=f"data_kemiskinan_indonesia.{export_spec.extension}",
+                mime=export_spec.mime
             )
 
         # Descriptive Statistics
         st.subheader("Statistik Deskriptif")
         with st.expander("Lihat Statistik"):
             st.dataframe(df_processed.describe(), use_container_width=True)
+        with st.expander("Statistik per Provinsi"):
+            render_province_statistics(dataset.aggregator)
 
         # Correlation Heatmap
         st.subheader("Heatmap Korelasi Antar Variabel")
         st.write("Heatmap menunjukkan korelasi antar variabel. Nilai mendekati 1 (merah) = korelasi positif kuat, "
                 "mendekati -1 (biru) = korelasi negatif kuat.")
         
-        fig = create_correlation_heatmap(df_processed)
-        if fig:
-            st.pyplot(fig)
-            plt.close()
+        regions = st.multiselect(
+            "Filter wilayah", list(PROVINCE_REGIONS), key="correlation_regions",
+            help="Kosongkan untuk seluruh Indonesia.",
+        )
+        chart_backend = charts.get_backend(CHART_BACKEND)
+        with tracing.span('create_correlation_heatmap'):
+            heatmap = create_correlation_heatmap(
+                df_processed, chart_backend, dataset_version, tuple(regions), persist
+            )
+            if heatmap:
+                display_chart(heatmap)
 
         # Scatter Plots
         st.subheader("Distribusi Fitur vs Persentase Kemiskinan")
         st.write("Visualisasi hubungan antara setiap fitur dengan tingkat kemiskinan.")
-        create_scatter_plots(df_processed)
+        with tracing.span('create_scatter_plots'):
+            create_scatter_plots(df_processed, chart_backend, dataset_version, persist)
         
     else:
         st.error("**Error:** Gagal memuat data. Periksa kembali file dan path-nya.")
 
-def create_folium_map(df_provinsi, geojson_data):
-    """Create interactive folium map"""
-    geojson_data = copy.deepcopy(geojson_data)
-
-    # Prepare GeoJSON with data
-    df_provinsi_indexed = df_provinsi.set_index('Provinsi')
-    
-    for feature in geojson_data['features']:
-        province_name = feature['properties'].get('name', '').upper().strip()
-        
-        if province_name in df_provinsi_indexed.index:
-            province_data = df_provinsi_indexed.loc[province_name]
-            feature['properties']['IPM_DISPLAY'] = f"{province_data.get('Indeks Pembangunan Manusia', 0):.2f}"
-            feature['properties']['PENDUDUK_MISKIN'] = f"{province_data.get('Persentase Kemiskinan (P0)', 0):.2f}%"
-            feature['properties']['LAMA_SEKOLAH'] = f"{province_data.get('Rata-Rata Lama Sekolah', 0):.2f} Tahun"
-            feature['properties']['PENGELUARAN_KAPITA'] = f"{province_data.get('Pengeluaran Per Kapita', 0):,.0f} Ribu Rupiah/Bulan"
-            feature['properties']['UMUR_HARAPAN_HIDUP'] = f"{province_data.get('Umur Harapan Hidup', 0):.2f} Tahun"
-            feature['properties']['SANITASI_LAYAK'] = f"{province_data.get('Akses Sanitasi Layak', 0):.2f}%"
-            feature['properties']['AIR_MINUM_LAYAK'] = f"{province_data.get('Akses Air Minum Layak', 0):.2f}%"
-            feature['properties']['PENGANGGURAN'] = f"{province_data.get('Tingkat Pengangguran Terbuka', 0):.2f}%"
-            feature['properties']['ANGKATAN_KERJA'] = f"{province_data.get('Tingkat Partisipasi Angkatan Kerja', 0):.2f}%"
-            feature['properties']['PDRB'] = f"{province_data.get('PDRB', 0):,.0f} Rupiah"
-        else:
-            for prop in ['IPM_DISPLAY', 'PENDUDUK_MISKIN', 'LAMA_SEKOLAH', 'PENGELUARAN_KAPITA', 
-                        'UMUR_HARAPAN_HIDUP', 'SANITASI_LAYAK', 'AIR_MINUM_LAYAK', 
-                        'PENGANGGURAN', 'ANGKATAN_KERJA', 'PDRB']:
-                feature['properties'][prop] = "Data Tidak Tersedia"
-
-    # Create map
-    m = folium.Map(
-        location=[-2.5, 118.0], 
-        zoom_start=5, 
-        tiles='OpenStreetMap',
-        control_scale=True
-    )
-
-    # Choropleth layer
-    folium.Choropleth(
-        geo_data=geojson_data,
-        name='Peta Kemiskinan',
-        data=df_provinsi,
-        columns=['Provinsi', 'Persentase Kemiskinan (P0)'],
-        key_on=GEOJSON_PROVINCE_KEY,
-        fill_color='YlOrRd',
-        fill_opacity=0.7,
-        line_opacity=0.5,
-        line_color='black',
-        line_weight=1,
-        legend_name='Persentase Penduduk Miskin (%)',
-        highlight=True,
-        nan_fill_color='lightgray'
-    ).add_to(m)
-
-    # Interactive layer with tooltip and popup
-    tooltip = folium.features.GeoJsonTooltip(
-        fields=['name', 'PENDUDUK_MISKIN'],
-        aliases=['Provinsi:', 'Penduduk Miskin:'],
-        localize=True,
-        sticky=False,
-        style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px; border-radius: 5px;"
-    )
-
-    popup = folium.features.GeoJsonPopup(
-        fields=[
-            'name', 'IPM_DISPLAY', 'PENDUDUK_MISKIN', 'LAMA_SEKOLAH',
-            'PENGELUARAN_KAPITA', 'UMUR_HARAPAN_HIDUP', 'SANITASI_LAYAK',
-            'AIR_MINUM_LAYAK', 'PENGANGGURAN', 'ANGKATAN_KERJA', 'PDRB'
-        ],
-        aliases=[
-            'Provinsi:', 'IPM:', 'Penduduk Miskin:', 'Lama Sekolah:',
-            'Pengeluaran per Kapita:', 'Harapan Hidup:', 'Sanitasi Layak:',
-            'Air Minum Layak:', 'Pengangguran:', 'Partisipasi Angkatan Kerja:', 'PDRB:'
-        ],
-        localize=True,
-        sticky=False,
-        labels=True,
-        max_width=450,
-        style="font-family: arial; font-size: 12px;"
-    )
-    
-    geojson_layer = folium.features.GeoJson(
-        geojson_data,
-        name='Detail Provinsi',
-        style_function=lambda x: {
-            'fillColor': 'transparent', 
-            'color': 'transparent', 
-            'weight': 0
-        },
-        control=False,
-        tooltip=tooltip,
-        popup=popup
-    )
-    geojson_layer.add_to(m)
-
-    folium.LayerControl().add_to(m)
-    
-    return m
-
-def run_map_page():
+def run_map_page(query=None, year=None):
     """
     Halaman Visualisasi Peta Interaktif.
     """
@@ -438,34 +583,97 @@ def run_map_page():
     st.markdown("---")
     st.info("Klik pada provinsi untuk melihat detail lengkap, atau arahkan kursor untuk informasi cepat.")
 
-    with st.spinner("Memuat peta..."):
-        df_processed, df_provinsi = load_data(DATA_PATH)
-        geojson_data = load_geojson(LOCAL_GEOJSON_PATH, GEOJSON_URL)
+    weight_options = {"Rata-rata sederhana": None, **{f"Berbobot {col}": col for col in WEIGHT_COLUMNS}}
+    weight_label = st.radio("Agregasi provinsi", list(weight_options), horizontal=True)
+    weight = weight_options[weight_label]
 
-    if df_provinsi is not None and geojson_data is not None:
+    # Folium hanya diimpor saat halaman peta dibuka; halaman EDA tidak membutuhkannya.
+    map_builder = warmup.timed_import('dashboard.map_builder')
+    st_folium = warmup.timed_import('streamlit_folium').st_folium
+
+    with st.spinner("Memuat peta..."):
+        dataset = get_filtered_dataset(load_dataset(DATA_PATH, year), query)
+        # Tampilan terfilter bersifat sementara: kubus tidak disimpan ke disk dan
+        # peta memakai GeoJSON inline alih-alih membangun tileset per kombinasi filter.
+        filtered = isinstance(dataset, FilteredDataset)
+        if filtered and not render_filter_notice(dataset):
+            return
+        cube = None
+        if dataset is not None:
+            df_provinsi = dataset.df_provinsi
+            if weight is not None:
+                # Rata-rata berbobot diambil dari statistik cukup agregator, tanpa memindai data.
+                df_provinsi = dataset.aggregator.means(weight)
+            try:
+                with tracing.span('load_map_cube', cache='hit'):
+                    cube = load_map_cube(
+                        f"{dataset.version}:{weight or 'mean'}", df_provinsi, LOCAL_GEOJSON_PATH, GEOJSON_URL,
+                        persist=not filtered, remote_version=remote_geojson_version(),
+                    )
+            except GeoJSONUnavailable as e:
+                # Halaman tidak menunggu jaringan; GeoJSON cadangan diunduh di latar.
+                st.info(
+                    "GeoJSON provinsi sedang diunduh dari server cadangan. "
+                    f"Muat ulang halaman beberapa saat lagi. ({str(e)})"
+                )
+                return
+
+    if cube is not None:
         required_cols = ['Provinsi', 'Persentase Kemiskinan (P0)']
-        if not all(col in df_provinsi.columns for col in required_cols):
+        if not all(col in cube.df_provinsi.columns for col in required_cols):
             st.error(f"**Error:** Kolom yang diperlukan tidak ditemukan: {required_cols}")
             return
 
-        geojson_provinces = {
-            feature['properties']['name'].upper().strip()
-            for feature in geojson_data.get('features', [])
-        }
-        data_provinces = set(df_provinsi['Provinsi'])
-        missing_in_geojson = sorted(data_provinces - geojson_provinces)
-        missing_in_data = sorted(geojson_provinces - data_provinces)
-        if missing_in_geojson or missing_in_data:
+        # Provinsi yang tersaring keluar memang tidak ada di data tampilan terfilter.
+        if cube.missing_in_geojson or (cube.missing_in_data and not filtered):
             st.warning(
                 "Ada perbedaan nama provinsi antara data dan GeoJSON. "
-                f"Tidak ada di GeoJSON: {missing_in_geojson or '-'}; "
-                f"Tidak ada di data: {missing_in_data or '-'}."
+                f"Tidak ada di GeoJSON: {cube.missing_in_geojson or '-'}; "
+                f"Tidak ada di data: {cube.missing_in_data or '-'}."
             )
 
+        df_prediksi = None
+        if st.checkbox("Tampilkan layer prediksi model", value=False):
+            _, df_prediksi = get_predictions(dataset)
+            if df_prediksi is None:
+                _, error = get_prediction_model()
+                if error:
+                    st.info(f"Prediksi model tidak tersedia. {error}")
+
+        tileset = None
+        # Tile dibangun dari file GeoJSON lokal; salinan cadangan memakai GeoJSON inline.
+        if use_vector_tiles() and not filtered and LOCAL_GEOJSON_PATH.exists():
+            try:
+                with tracing.span('load_map_tiles', cache='hit'):
+                    tile_args = (cube.version, cube, dataset.df_processed, LOCAL_GEOJSON_PATH, DISTRICT_GEOJSON_PATH)
+                    tileset, district_colormap = load_map_tiles(*tile_args)
+                    # Metadata di cache tidak menjamin tile masih di disk (dihapus worker lain): bangun ulang.
+                    if tileset is not None and not tiles.touch_tileset(tileset['version']):
+                        tracing.annotate(cache='miss')
+                        load_map_tiles.clear(*tile_args)
+                        tileset, district_colormap = load_map_tiles(*tile_args)
+            except OSError as e:
+                # Folder static read-only atau GeoJSON kab/kota tidak terbaca: kembali ke GeoJSON inline.
+                st.warning(f"Vector tile tidak tersedia, peta memakai GeoJSON inline. {str(e)}")
+
         # Display map
-        m = create_folium_map(df_provinsi, geojson_data)
-        st_folium(m, width=None, height=600, use_container_width=True)
-        st.caption("Catatan: angka provinsi dihitung sebagai rata-rata sederhana kabupaten/kota dalam dataset.")
+        with tracing.span('create_folium_map'):
+            if tileset is not None:
+                url = tiles.tile_url(tileset['version'], st.get_option('server.baseUrlPath') or '')
+                m = map_builder.create_tiled_map(
+                    cube, tileset, url, df_prediksi, prediction.SHARE_COLUMN, district_colormap
+                )
+            else:
+                m = map_builder.create_folium_map(cube, df_prediksi, prediction.SHARE_COLUMN)
+        with tracing.span('st_folium') as map_span:
+            if map_span.enabled:
+                # Render ulang HTML hanya saat tracing aktif untuk mengukur payload peta.
+                map_span.bytes = len(m.get_root().render().encode('utf-8'))
+            st_folium(m, width=None, height=600, use_container_width=True)
+        if weight is None:
+            st.caption("Catatan: angka provinsi dihitung sebagai rata-rata sederhana kabupaten/kota dalam dataset.")
+        else:
+            st.caption(f"Catatan: angka provinsi dihitung sebagai rata-rata kabupaten/kota berbobot {weight}.")
 
         # Summary statistics
         st.subheader("Ringkasan Statistik Provinsi")
@@ -473,20 +681,109 @@ def run_map_page():
         
         with col1:
             st.markdown("**5 Provinsi Kemiskinan Tertinggi**")
-            top_5 = df_provinsi.nlargest(5, 'Persentase Kemiskinan (P0)')[['Provinsi', 'Persentase Kemiskinan (P0)']]
-            st.dataframe(top_5.reset_index(drop=True), use_container_width=True)
+            st.dataframe(cube.top_provinces, use_container_width=True)
         
         with col2:
             st.markdown("**5 Provinsi Kemiskinan Terendah**")
-            bottom_5 = df_provinsi.nsmallest(5, 'Persentase Kemiskinan (P0)')[['Provinsi', 'Persentase Kemiskinan (P0)']]
-            st.dataframe(bottom_5.reset_index(drop=True), use_container_width=True)
+            st.dataframe(cube.bottom_provinces, use_container_width=True)
     else:
         st.error("**Error:** Gagal memuat data peta. Periksa koneksi internet dan ketersediaan file.")
 
+def render_filter_sidebar(container, year=None):
+    """
+    Filter provinsi dan rentang indikator di sidebar; mengembalikan Query.
+
+    Rentang yang masih penuh tidak dianggap filter, sehingga tampilan tetap
+    memakai dataset asli (dan cache-nya) sampai pengguna benar-benar menyaring.
+    """
+    dataset = load_dataset(DATA_PATH, year, quiet=True)
+    if dataset is None:
+        return Query()
+    index = get_dataset_index(dataset.version, dataset.df_processed)
+
+    container.markdown("### Filter Data")
+    provinces = container.multiselect(
+        "Provinsi", index.provinces, key="filter_provinces", help="Kosongkan untuk semua provinsi."
+    )
+    range_columns = container.multiselect("Rentang indikator", index.columns, key="filter_columns")
+    ranges = []
+    for column in range_columns:
+        low, high = index.bounds(column)
+        if low is None or low == high:
+            continue
+        selected = container.slider(column, low, high, (low, high), key=f"filter_range:{column}")
+        if selected != (low, high):
+            ranges.append((column, float(selected[0]), float(selected[1])))
+    query = Query(tuple(sorted(provinces)), tuple(ranges))
+    if not query.is_empty:
+        with tracing.span('query_select'):
+            container.caption(f"{index.count(query):,} dari {index.size:,} kabupaten/kota lolos filter.")
+
+    with container.expander("Peringkat Kabupaten/Kota"):
+        default = 'Persentase Kemiskinan (P0)'
+        column = st.selectbox(
+            "Indikator", index.columns, key="ranking_column",
+            index=index.columns.index(default) if default in index.columns else 0,
+        )
+        n = st.number_input("Jumlah", min_value=1, max_value=100, value=10, key="ranking_n")
+        order = st.radio("Urutan", ["Tertinggi", "Terendah"], horizontal=True, key="ranking_order")
+        with tracing.span('query_top'):
+            ranking = index.top(column, int(n), query, largest=order == "Tertinggi")
+        st.dataframe(ranking, hide_index=True, use_container_width=True)
+    return query
+
+def index_stats(year=None):
+    """Statistik cache kueri indeks dataset aktif."""
+    dataset = load_dataset(DATA_PATH, year, quiet=True)
+    return get_dataset_index(dataset.version, dataset.df_processed).stats() if dataset is not None else {}
+
+def render_performance_panel(trace, year=None):
+    """Panel sidebar berisi span tracing rerun ini dan statistik cache proses."""
+    with st.sidebar.expander("Performance", expanded=True):
+        st.metric("Total rerun", f"{trace.total_ms:,.0f} ms")
+        rows = [
+            {
+                'Span': '\u2003' * span.depth + span.name,
+                'Durasi (ms)': span.duration_ms,
+                'Cache': span.cache or '',
+                'Byte': span.bytes,
+                'Puncak RSS (MB)': span.peak_rss_mb,
+            }
+            for span in trace.spans
+        ]
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.caption(
+            f"Dataset loader: {get_dataset_loader().stats()} · "
+            f"Indeks kueri: {index_stats(year)} · "
+            f"Render cache: {get_render_cache().stats()}"
+        )
+        if not LOCAL_GEOJSON_PATH.exists():
+            st.caption(f"GeoJSON cadangan: {get_geojson_source(GEOJSON_URL).stats()}")
+
+        # Cold start proses ini: impor, tugas pemanasan latar, dan first paint.
+        report = get_warmup().report()
+        startup_rows = [
+            {'Tahap': f"impor {name}", 'Durasi (ms)': round(seconds * 1000, 1), 'Status': ''}
+            for name, seconds in report['imports'].items()
+        ]
+        startup_rows += [
+            {'Tahap': f"pemanasan {name}",
+             'Durasi (ms)': round(task['seconds'] * 1000, 1) if task['seconds'] is not None else None,
+             'Status': task['status']}
+            for name, task in report['tasks'].items()
+        ]
+        if report['first_paint_seconds'] is not None:
+            st.metric("First paint", f"{report['first_paint_seconds'] * 1000:,.0f} ms")
+        if startup_rows:
+            st.dataframe(pd.DataFrame(startup_rows), hide_index=True, use_container_width=True)
+
 def main():
     """
     Fungsi utama aplikasi.
     """
+    # Dimulai sebelum kerangka halaman agar aset dimuat selagi header dan sidebar dirender.
+    startup = get_warmup()
     load_css()
     
     # Header
@@ -508,6 +805,12 @@ def main():
         list(page_options.keys())
     )
 
+    # Hanya manifest yang dibaca di sini; partisi tahun terpilih dimuat oleh halaman.
+    years = loader.available_years(get_partition_store(), DATA_PATH)
+    year = None
+    if years:
+        year = st.sidebar.selectbox("Tahun Data", years, index=len(years) - 1, key="dataset_year")
+
     st.sidebar.markdown("---")
     st.sidebar.markdown("### Tentang")
     st.sidebar.info(
@@ -519,11 +822,33 @@ def main():
     st.sidebar.markdown("- Dataset indikator sosial-ekonomi lokal")
     st.sidebar.markdown("- Batas provinsi lokal `data/prov 34.geojson`")
 
-    # Route to selected page
-    if page_options[selected_page] == "map":
-        run_map_page()
-    elif page_options[selected_page] == "eda":
-        run_eda_page()
+    st.sidebar.markdown("---")
+    # Filter diisi di dalam trace agar biaya kueri ikut terukur.
+    filter_container = st.sidebar.container()
+    st.sidebar.markdown("---")
+    show_performance = st.sidebar.checkbox("Tampilkan panel Performance", value=False)
+
+    startup.mark_first_paint(STARTED)
+
+    # Tracing hanya aktif jika panel dibuka atau log JSON diaktifkan.
+    page = page_options[selected_page]
+    trace = tracing.start_trace(page, log=TRACE_LOG) if show_performance or TRACE_LOG else None
+    try:
+        query = render_filter_sidebar(filter_container, year)
+        # Route to selected page
+        if page == "map":
+            run_map_page(query, year)
+        elif page == "eda":
+            run_eda_page(query, year)
+    finally:
+        if trace is not None:
+            tracing.finish_trace(trace)
+        startup.start_deferred()
+        if TRACE_LOG:
+            startup.log_once()
+
+    if show_performance:
+        render_performance_panel(trace, year)
 
 if __name__ == "__main__":
     main()
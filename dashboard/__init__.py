@@ -0,0 +1 @@
+"""Modul pendukung Dashboard Analisis Kemiskinan di Indonesia."""
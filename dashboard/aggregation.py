@@ -0,0 +1,308 @@
+"""
+Agregasi provinsi inkremental dari statistik cukup (sufficient statistics).
+
+Untuk setiap provinsi dan kolom indikator disimpan jumlah baris `n`, jumlah
+`s`, dan jumlah kuadrat `q` (dari nilai yang digeser konstanta per kolom agar
+variansi stabil secara numerik), serta versi berbobot (`W`, `S`, `Q`) untuk
+setiap kolom bobot. Statistik ini bisa dijumlahkan dan dikurangkan, sehingga:
+
+- batch regional atau baris yang dikoreksi hanya memicu perhitungan ulang
+  provinsi yang terdampak; provinsi lain tidak dipindai;
+- rata-rata, rata-rata berbobot, dan variansi dihitung dari tabel kecil
+  (satu baris per provinsi) tanpa memindai data lagi.
+
+Dataset tidak memiliki kolom jumlah penduduk, sehingga bobot default adalah
+PDRB; kolom bobot lain (misalnya penduduk) bisa diberikan lewat `weights`.
+"""
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ['Provinsi', 'Kab/Kota']
+WEIGHT_COLUMNS = ['PDRB']
+
+
+class ProvinceStats:
+    """Tabel statistik cukup per provinsi. Immutable; operasi mengembalikan objek baru."""
+
+    def __init__(self, table, columns, weights, shift):
+        self.table = table
+        self.columns = list(columns)
+        self.weights = list(weights)
+        self.shift = shift
+
+    @classmethod
+    def from_frame(cls, df, columns=None, weights=WEIGHT_COLUMNS, shift=None):
+        """Hitung statistik dari frame kab/kota dalam satu kali pemindaian."""
+        if columns is None:
+            columns = [col for col in df.select_dtypes(include=np.number).columns]
+        weights = [weight for weight in weights if weight in df.columns]
+        if shift is None:
+            # Pergeseran per kolom (rata-rata global) cukup dihitung sekali dan dipakai bersama.
+            shift = pd.Series(
+                [df[col].mean() if len(df) else 0.0 for col in columns], index=columns, dtype=float
+            ).fillna(0.0)
+
+        codes, provinces = pd.factorize(df['Provinsi'], sort=True)
+        # Array disimpan per kolom (kolom x baris) dan diurutkan per provinsi sekali, sehingga
+        # setiap statistik cukup satu np.add.reduceat yang berjalan di memori kontigu.
+        # Baris tanpa provinsi (kode -1) dibuang, seperti groupby('Provinsi').
+        order = np.flatnonzero(codes >= 0)
+        order = order[np.argsort(codes[order], kind='stable')]
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, np.diff(sorted_codes) != 0]) if len(order) else None
+        sorted_values = np.ascontiguousarray(df[columns].to_numpy(dtype=float)[order].T)
+
+        def reduce(array):
+            if starts is None:
+                return np.zeros((0, len(columns)))
+            return np.add.reduceat(array, starts, axis=1).T
+
+        valid = ~np.isnan(sorted_values)
+        shifted = np.where(valid, sorted_values - shift[columns].to_numpy()[:, None], 0.0)
+        blocks = {
+            'n': reduce(valid.astype(float)),
+            # Jumlah mentah lewat groupby pandas (penjumlahan terkompensasi yang sama dengan mean(),
+            # urutan baris dalam provinsi tetap), agar rata-rata sederhana identik dengan groupby().mean().
+            'x': pd.DataFrame(sorted_values.T, copy=False).groupby(sorted_codes, sort=True).sum().to_numpy(),
+            's': reduce(shifted),
+            'q': reduce(shifted * shifted),
+        }
+        for weight in weights:
+            w = np.nan_to_num(df[weight].to_numpy(dtype=float))[order] * valid
+            weighted = w * shifted
+            blocks[f'W|{weight}'] = reduce(w)
+            blocks[f'S|{weight}'] = reduce(weighted)
+            blocks[f'Q|{weight}'] = reduce(weighted * shifted)
+
+        table = pd.DataFrame(
+            {f'{name}|{col}': block[:, idx] for name, block in blocks.items() for idx, col in enumerate(columns)},
+            index=pd.Index(np.asarray(provinces, dtype=object), name='Provinsi'),
+        )
+        return cls(table, columns, weights, shift)
+
+    def _combine(self, other, sign):
+        if other.columns != self.columns or other.weights != self.weights:
+            raise ValueError("Statistik provinsi dengan kolom berbeda tidak bisa digabung.")
+        other_table = other._reshifted(self.shift)
+        table = self.table.add(sign * other_table, fill_value=0.0)
+        # Provinsi tanpa baris tersisa dihapus; sisa pembulatan kecil tidak dianggap data.
+        counts = table[[f'n|{col}' for col in self.columns]].max(axis=1)
+        table = table[counts > 0.5].sort_index()
+        return ProvinceStats(table, self.columns, self.weights, self.shift)
+
+    def _reshifted(self, shift):
+        """Tabel statistik ini jika digeser dengan konstanta `shift` lain."""
+        delta = self.shift - shift
+        if not delta.any():
+            return self.table
+        table = self.table.copy()
+        for col in self.columns:
+            d = delta[col]
+            n, s = table[f'n|{col}'], table[f's|{col}']
+            table[f'q|{col}'] = table[f'q|{col}'] + 2 * d * s + n * d * d
+            table[f's|{col}'] = s + n * d
+            for weight in self.weights:
+                w, ws = table[f'W|{weight}|{col}'], table[f'S|{weight}|{col}']
+                table[f'Q|{weight}|{col}'] = table[f'Q|{weight}|{col}'] + 2 * d * ws + w * d * d
+                table[f'S|{weight}|{col}'] = ws + w * d
+        return table
+
+    def without(self, provinces):
+        """Statistik tanpa provinsi tertentu."""
+        return ProvinceStats(self.table.drop(index=provinces, errors='ignore'), self.columns, self.weights, self.shift)
+
+    def merge(self, other):
+        """Gabungkan dua statistik (misalnya dua batch regional)."""
+        return self._combine(other, 1.0)
+
+    def subtract(self, other):
+        """Keluarkan baris yang statistiknya ada di `other`."""
+        return self._combine(other, -1.0)
+
+    @property
+    def provinces(self):
+        return self.table.index.tolist()
+
+    def _moments(self, weight):
+        if weight is None:
+            prefix = ('n', 's', 'q')
+        elif weight in self.weights:
+            prefix = (f'W|{weight}', f'S|{weight}', f'Q|{weight}')
+        else:
+            raise ValueError(f"Kolom bobot tidak tersedia: {weight}")
+        total = self.table[[f'{prefix[0]}|{col}' for col in self.columns]].to_numpy()
+        sums = self.table[[f'{prefix[1]}|{col}' for col in self.columns]].to_numpy()
+        squares = self.table[[f'{prefix[2]}|{col}' for col in self.columns]].to_numpy()
+        return total, sums, squares
+
+    def _frame(self, values):
+        df = pd.DataFrame(values, columns=self.columns)
+        df.insert(0, 'Provinsi', self.table.index.to_numpy())
+        return df
+
+    def means(self, weight=None):
+        """Rata-rata per provinsi (sederhana, atau berbobot kolom `weight`)."""
+        total, sums, _ = self._moments(weight)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if weight is None:
+                values = self.table[[f'x|{col}' for col in self.columns]].to_numpy() / total
+            else:
+                values = self.shift.to_numpy() + sums / total
+        return self._frame(values)
+
+    def variances(self, weight=None, ddof=1):
+        """
+        Variansi per provinsi.
+
+        Tanpa bobot memakai koreksi `ddof`; dengan bobot memberi variansi
+        berbobot (dibagi jumlah bobot).
+        """
+        total, sums, squares = self._moments(weight)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if weight is None:
+                values = (squares - sums * sums / total) / (total - ddof)
+                values[total - ddof <= 0] = np.nan
+            else:
+                mean = sums / total
+                values = squares / total - mean * mean
+        return self._frame(np.clip(values, 0.0, None))
+
+    def counts(self):
+        total, _, _ = self._moments(None)
+        return self._frame(total.astype(np.int64))
+
+    def summary(self, column):
+        """Tabel per provinsi satu indikator: jumlah, rata-rata, dan simpangan baku (juga berbobot)."""
+        table = pd.DataFrame({
+            'Provinsi': self.provinces,
+            'Jumlah Kab/Kota': self.counts()[column],
+            'Rata-rata': self.means()[column],
+            'Simpangan Baku': np.sqrt(self.variances()[column]),
+        })
+        for weight in self.weights:
+            table[f'Rata-rata Berbobot {weight}'] = self.means(weight)[column]
+            table[f'Simpangan Baku Berbobot {weight}'] = np.sqrt(self.variances(weight)[column])
+        return table
+
+
+class ProvinceAggregator:
+    """
+    Agregat provinsi yang bisa diperbarui per batch kab/kota.
+
+    Agregator dari `from_frame` hanya merujuk frame sumbernya (misalnya frame
+    memory-map dari data store) tanpa menyalin baris. Partisi per provinsi
+    dengan indeks Kab/Kota baru dibangun saat `upsert`, `remove`, atau
+    `update` membutuhkannya. Operasi tersebut hanya menghitung ulang
+    statistik provinsi yang barisnya berubah, lalu mengembalikan agregator
+    baru beserta daftar provinsi yang berubah; agregator lama tetap bisa
+    dibaca oleh sesi lain.
+    """
+
+    def __init__(self, stats, frame=None, partitions=None):
+        self.stats = stats
+        self._frame = frame
+        self._partitions = partitions
+
+    @classmethod
+    def from_frame(cls, df, columns=None, weights=WEIGHT_COLUMNS):
+        return cls(ProvinceStats.from_frame(df, columns, weights), frame=df)
+
+    def with_frame(self, df):
+        """Agregator yang sama, merujuk `df` (isi identik, misalnya versi memory-map) sebagai sumber."""
+        return ProvinceAggregator(self.stats, frame=df)
+
+    @staticmethod
+    def _partition(df, stats):
+        """Pecah frame menjadi {provinsi: baris ber-indeks Kab/Kota}."""
+        keep = [*KEY_COLUMNS, *dict.fromkeys(stats.columns + stats.weights)]
+        rows = df[[col for col in keep if col in df.columns]]
+        if 'Kab/Kota' not in rows.columns:
+            raise ValueError("Kolom Kab/Kota dibutuhkan untuk pembaruan inkremental.")
+        rows = rows.set_index('Kab/Kota', drop=False)
+        return {province: part for province, part in rows.groupby('Provinsi', sort=False)}
+
+    @property
+    def partitions(self):
+        """Partisi per provinsi; untuk agregator berbasis frame dibangun ulang setiap dipanggil."""
+        if self._partitions is not None:
+            return self._partitions
+        return self._partition(self._frame, self.stats)
+
+    @property
+    def row_count(self):
+        if self._partitions is None:
+            return int(self._frame['Provinsi'].notna().sum())
+        return sum(len(part) for part in self._partitions.values())
+
+    def _apply(self, partitions, changed, frame=None):
+        """
+        Hitung ulang statistik provinsi yang berubah saja dari partisinya.
+
+        Provinsi lain tidak disentuh. Karena dihitung ulang (bukan dikurangi
+        lalu ditambah), hasilnya identik bit demi bit dengan agregasi penuh.
+        Jika `frame` diberikan, agregator baru merujuk frame itu alih-alih
+        menyimpan partisi.
+        """
+        changed = sorted(changed)
+        stats = self.stats
+        if changed:
+            affected = [partitions[province] for province in changed if province in partitions]
+            stats = stats.without(changed)
+            if affected:
+                stats = stats.merge(
+                    ProvinceStats.from_frame(pd.concat(affected), stats.columns, stats.weights, stats.shift)
+                )
+        if frame is not None:
+            return ProvinceAggregator(stats, frame=frame), changed
+        return ProvinceAggregator(stats, partitions=partitions), changed
+
+    def upsert(self, batch):
+        """Tambah baris baru atau ganti baris yang kuncinya sudah ada."""
+        partitions = dict(self.partitions)
+        for province, part in self._partition(batch, self.stats).items():
+            if not part.index.is_unique:
+                raise ValueError(f"Batch memiliki Kab/Kota ganda di provinsi {province}.")
+            existing = partitions.get(province)
+            if existing is not None:
+                part = pd.concat([existing[~existing.index.isin(part.index)], part])
+            partitions[province] = part
+        return self._apply(partitions, set(batch['Provinsi']))
+
+    def remove(self, keys):
+        """Hapus baris dengan kunci (Provinsi, Kab/Kota) yang ada di frame `keys`."""
+        partitions = dict(self.partitions)
+        changed = set()
+        for province, names in keys.groupby('Provinsi')['Kab/Kota']:
+            existing = partitions.get(province)
+            if existing is None or not existing.index.isin(names).any():
+                continue
+            remaining = existing[~existing.index.isin(names)]
+            if len(remaining):
+                partitions[province] = remaining
+            else:
+                del partitions[province]
+            changed.add(province)
+        return self._apply(partitions, changed)
+
+    def update(self, df):
+        """
+        Sinkronkan dengan versi baru seluruh frame kab/kota.
+
+        Partisi dibandingkan per provinsi; hanya provinsi yang barisnya
+        ditambah, dihapus, atau berubah nilainya yang dihitung ulang. Partisi
+        hanya dipakai selama pembandingan: agregator baru merujuk `df`.
+        """
+        previous = self.partitions
+        partitions = self._partition(df, self.stats)
+        changed = set(previous) - set(partitions)
+        for province, part in partitions.items():
+            existing = previous.get(province)
+            if existing is None or not existing.equals(part):
+                changed.add(province)
+        return self._apply(partitions, changed, frame=df)
+
+    def means(self, weight=None):
+        return self.stats.means(weight)
+
+    def variances(self, weight=None, ddof=1):
+        return self.stats.variances(weight, ddof)
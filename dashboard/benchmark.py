@@ -0,0 +1,270 @@
+"""
+Benchmark tahap-tahap pipeline dashboard pada dataset sintetis yang diperbesar.
+
+Dataset sintetis dibuat dari CSV bersih dengan sampling ulang baris dan noise
+kecil pada kolom numerik, sehingga skema `COLUMN_MAPPING` dan 34 provinsi di
+`prov 34.geojson` tetap sama. Setiap tahap diukur waktu wall/CPU-nya, lalu
+(opsional) dijalankan ulang di bawah `tracemalloc` untuk puncak alokasi.
+Alokasi buffer pyarrow tidak terlacak oleh tracemalloc, jadi puncak RSS
+proses setelah tahap juga dicatat.
+Hasil disimpan sebagai JSON agar bisa dibandingkan antar-commit:
+
+    python -m dashboard.benchmark --scales 1 10 100 1000
+    python -m dashboard.benchmark --scales 1 10 --compare .cache/benchmarks/baseline.json
+"""
+from pathlib import Path
+import argparse
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from dashboard import charts, export, geometry, ingest, province_cube, tracing
+from dashboard.config import (
+    BASE_DIR,
+    CACHE_DIR,
+    CHART_BACKEND,
+    COLUMN_MAPPING,
+    DATA_PATH,
+    GEOMETRY_LEVEL,
+    LOCAL_GEOJSON_PATH,
+    MAP_ZOOM_START,
+    NUMERIC_COLUMNS,
+)
+from dashboard.correlation import CorrelationEngine
+from dashboard.partitions import PartitionStore
+from dashboard.map_builder import create_folium_map
+from dashboard.pipeline import aggregate_provinces, clean_dataframe
+from dashboard.query import DatasetIndex, Query
+
+BENCHMARK_DIR = CACHE_DIR / 'benchmarks'
+DEFAULT_SCALES = [1, 10, 100, 1000]
+STAGES = ['ingest', 'clean', 'aggregate', 'query', 'partitions', 'map', 'heatmap', 'scatter', 'export']
+PERCENT_LIMIT = 100.0
+
+
+def synthetic_dataset(base_raw, scale, seed=0):
+    """
+    Perbesar dataset mentah (nama kolom CSV) menjadi `scale` kali jumlah barisnya.
+
+    Setiap replika memuat semua baris asli dengan noise ~2% pada kolom numerik,
+    sehingga semua provinsi selalu ada. Nama kab/kota diberi akhiran replika agar unik.
+    """
+    if scale == 1:
+        return base_raw.copy()
+
+    rng = np.random.default_rng(seed)
+    rows = len(base_raw) * scale
+    synthetic = base_raw.iloc[np.tile(np.arange(len(base_raw)), scale)].reset_index(drop=True)
+    replica = np.repeat(np.arange(scale), len(base_raw))
+    synthetic['Kab/Kota'] = synthetic['Kab/Kota'].astype(str) + np.where(replica == 0, '', ' #' + replica.astype(str))
+
+    numeric_sources = {source for source, target in COLUMN_MAPPING.items() if target in NUMERIC_COLUMNS}
+    for column in synthetic.columns:
+        if column not in numeric_sources:
+            continue
+        values = synthetic[column].to_numpy(dtype=float) * rng.normal(1.0, 0.02, size=rows)
+        if base_raw[column].max() <= PERCENT_LIMIT:
+            values = np.clip(values, 0.0, PERCENT_LIMIT)
+        synthetic[column] = values.round(2)
+    return synthetic
+
+
+def measure(function, memory=True):
+    """Jalankan `function` dan ukur wall/CPU; puncak alokasi diukur di run kedua."""
+    started_cpu = time.process_time()
+    started_wall = time.perf_counter()
+    result = function()
+    record = {
+        'wall_seconds': round(time.perf_counter() - started_wall, 4),
+        'cpu_seconds': round(time.process_time() - started_cpu, 4),
+        'peak_alloc_mb': None,
+        'peak_rss_mb': tracing.peak_rss_mb(),
+    }
+    if memory:
+        # Dijalankan terpisah karena tracemalloc memperlambat kode Python.
+        tracemalloc.start()
+        try:
+            function()
+            record['peak_alloc_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return result, record
+
+
+def map_variant(geojson_data):
+    """Varian geometri yang dipakai aplikasi secara default."""
+    level = geometry.level_for_zoom(MAP_ZOOM_START) if GEOMETRY_LEVEL == 'auto' else GEOMETRY_LEVEL
+    if level == geometry.FULL_LEVEL:
+        return geojson_data
+    return geometry.simplify_geojson(geojson_data, level)[0]
+
+
+def run_stages(raw, geojson_data, backend, stages=STAGES, memory=True, tmp_dir=None):
+    """Ukur setiap tahap untuk satu dataset mentah; mengembalikan daftar record."""
+    results = []
+
+    def record(stage, function, output_bytes=None):
+        value, metrics = measure(function, memory)
+        metrics['stage'] = stage
+        metrics['output_bytes'] = output_bytes(value) if output_bytes else None
+        results.append(metrics)
+        return value
+
+    csv_path = Path(tmp_dir or tempfile.gettempdir()) / 'benchmark_raw.csv'
+    if 'ingest' in stages:
+        raw.to_csv(csv_path, sep=';', decimal=',', index=False)
+        record('ingest', lambda: ingest.read_source(csv_path))
+
+    df_processed = clean_dataframe(raw)
+    if 'clean' in stages:
+        df_processed = record('clean', lambda: clean_dataframe(raw))
+    df_provinsi = aggregate_provinces(df_processed)
+    if 'aggregate' in stages:
+        df_provinsi = record('aggregate', lambda: aggregate_provinces(df_processed))
+
+    if 'query' in stages:
+        index = record('query:index', lambda: DatasetIndex(df_processed))
+        poverty = 'Persentase Kemiskinan (P0)'
+        low, high = index.bounds(poverty)
+        query = Query(('JAWA BARAT', 'JAWA TENGAH', 'JAWA TIMUR'), ((poverty, low, (low + high) / 2),))
+        record('query:select', lambda: index.select(query), len)
+        record('query:top', lambda: index.top(poverty, 10, query), len)
+
+    if 'partitions' in stages:
+        # Tiga tahun sintetis; halaman hanya membaca satu tahun (dan kolom/provinsi tertentu).
+        store = PartitionStore(Path(tmp_dir or tempfile.mkdtemp()) / 'benchmark_partitions')
+        for year in (2021, 2022, 2023):
+            store.write_year(df_processed, year)
+
+        def frame_bytes(df):
+            return int(df.memory_usage(deep=True).sum())
+
+        record('partitions:all_years', lambda: store.scan(), frame_bytes)
+        record('partitions:one_year', lambda: store.scan(years=[2023]), frame_bytes)
+        record('partitions:one_year_columns', lambda: store.scan(
+            years=[2023], columns=['Provinsi', 'Persentase Kemiskinan (P0)']
+        ), frame_bytes)
+        record('partitions:one_province', lambda: store.scan(years=[2023], provinces=['ACEH']), frame_bytes)
+
+    if 'map' in stages:
+        def render_map():
+            payload = province_cube.build_cube_payload(df_provinsi, geojson_data, 'benchmark')
+            cube = province_cube.cube_from_payload(payload, geojson_data)
+            return create_folium_map(cube).get_root().render()
+
+        record('map', render_map, lambda html: len(html.encode('utf-8')))
+
+    if 'heatmap' in stages:
+        def heatmap():
+            engine = CorrelationEngine.from_frame(df_processed)
+            return backend.correlation_heatmap(df_processed, engine.correlation())
+
+        record('heatmap', heatmap, charts.payload_bytes)
+
+    if 'scatter' in stages:
+        def scatter_plots():
+            return [backend.scatter_plot(df_processed, feature)
+                    for feature in charts.SCATTER_FEATURES if feature in df_processed.columns]
+
+        record('scatter', scatter_plots, lambda plots: sum(charts.payload_bytes(plot) for plot in plots))
+
+    if 'export' in stages:
+        for fmt in export.EXPORT_FORMATS:
+            def encode(fmt=fmt):
+                buffer = io.BytesIO()
+                export.encode_export(df_processed, fmt, buffer)
+                return buffer.getvalue()
+
+            record(f'export:{fmt}', encode, len)
+    return results
+
+
+def git_commit():
+    """Commit saat ini, atau None jika bukan repositori git."""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, stages=STAGES, backend_name=CHART_BACKEND, memory=True,
+                   data_path=DATA_PATH, geojson_path=LOCAL_GEOJSON_PATH, seed=0):
+    """Jalankan semua tahap untuk setiap skala; hasilnya siap ditulis sebagai JSON."""
+    base_raw = ingest.read_source(data_path)
+    with Path(geojson_path).open(encoding='utf-8') as file:
+        geojson_data = map_variant(json.load(file))
+    backend = charts.get_backend(backend_name)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            raw = synthetic_dataset(base_raw, scale, seed)
+            for record in run_stages(raw, geojson_data, backend, stages, memory, tmp_dir):
+                results.append({'scale': scale, 'rows': len(raw), **record})
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'chart_backend': backend.name,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """Rasio waktu wall terhadap baseline per (tahap, skala); >1 berarti lebih lambat."""
+    baseline_times = {(item['stage'], item['scale']): item['wall_seconds'] for item in baseline['results']}
+    comparison = []
+    for item in current['results']:
+        previous = baseline_times.get((item['stage'], item['scale']))
+        comparison.append({
+            'stage': item['stage'],
+            'scale': item['scale'],
+            'wall_seconds': item['wall_seconds'],
+            'baseline_seconds': previous,
+            'ratio': round(item['wall_seconds'] / previous, 3) if previous else None,
+        })
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap pipeline dengan dataset sintetis.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Faktor perbesaran dataset.")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES, help="Tahap yang diukur.")
+    parser.add_argument('--backend', default=CHART_BACKEND, choices=sorted(charts.CHART_BACKENDS),
+                        help="Backend grafik untuk heatmap dan scatter.")
+    parser.add_argument('--no-memory', action='store_true', help="Lewati pengukuran puncak alokasi.")
+    parser.add_argument('--output', default=None, help="Lokasi file JSON hasil.")
+    parser.add_argument('--compare', default=None, help="File JSON baseline untuk dibandingkan.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scales, args.stages, args.backend, memory=not args.no_memory)
+    output = Path(args.output) if args.output else (
+        BENCHMARK_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Hasil benchmark disimpan di: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        print(json.dumps(compare(report, baseline), indent=2))
+
+
+if __name__ == '__main__':
+    main()
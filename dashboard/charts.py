@@ -0,0 +1,264 @@
+"""
+Backend grafik untuk halaman EDA.
+
+Setiap backend menghasilkan objek `Chart` yang netral terhadap Streamlit:
+
+- `matplotlib`: gambar PNG dirender di server (seaborn/matplotlib).
+- `vega-lite`: spesifikasi Vega-Lite ditambah data kolom seminimal mungkin
+  (float32, hanya kolom yang dipakai); browser yang menggambar grafiknya.
+  Streamlit mengirim DataFrame ke browser dalam format Arrow, sehingga data
+  tetap terkirim sebagai array bertipe.
+
+Benchmark CPU server dan ukuran payload kedua backend:
+
+    python -m dashboard.charts --benchmark --rows 514 100000
+"""
+from dataclasses import dataclass
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dashboard.config import DATA_PATH
+from dashboard.render_cache import figure_to_png
+
+POVERTY_COLUMN = 'Persentase Kemiskinan (P0)'
+SCATTER_FEATURES = [
+    'Pengeluaran Per Kapita',
+    'Rata-Rata Lama Sekolah',
+    'Indeks Pembangunan Manusia',
+    'Umur Harapan Hidup',
+    'Tingkat Pengangguran Terbuka',
+]
+DEFAULT_BACKEND = 'vega-lite'
+
+
+@dataclass(frozen=True)
+class Chart:
+    """Hasil satu backend: `image` (PNG) atau `spec` + `data` (Vega-Lite)."""
+
+    kind: str
+    image: bytes = None
+    spec: dict = None
+    data: pd.DataFrame = None
+
+
+def numeric_frame(df):
+    return df.select_dtypes(include=np.number)
+
+
+def correlation_matrix(df, corr_matrix=None):
+    """
+    Matriks korelasi untuk heatmap, atau None jika fitur numerik kurang dari dua.
+
+    `corr_matrix` yang sudah dihitung (misalnya dari `CorrelationEngine`) dipakai
+    langsung tanpa memindai baris `df`.
+    """
+    if corr_matrix is None:
+        numeric_df = numeric_frame(df)
+        if len(numeric_df.columns) <= 1:
+            return None
+        corr_matrix = numeric_df.corr()
+    return corr_matrix if len(corr_matrix.columns) > 1 else None
+
+
+def scatter_title(feature):
+    return f'Hubungan {feature} dengan Kemiskinan'
+
+
+class MatplotlibBackend:
+    """Render di server menjadi PNG; hasilnya layak disimpan di render cache."""
+
+    name = 'matplotlib'
+    cacheable = True
+
+    def correlation_heatmap(self, df, corr_matrix=None):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        corr_matrix = correlation_matrix(df, corr_matrix)
+        if corr_matrix is None:
+            return None
+
+        fig, ax = plt.subplots(figsize=(14, 10))
+        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm',
+                    fmt=".2f", ax=ax, square=True,
+                    linewidths=0.5, cbar_kws={"shrink": 0.8})
+        plt.xticks(rotation=45, ha='right')
+        plt.yticks(rotation=0)
+        plt.tight_layout()
+        png = figure_to_png(fig)
+        plt.close(fig)
+        return Chart('image', image=png)
+
+    def scatter_plot(self, df, feature):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        fig, ax = plt.subplots(figsize=(7, 5))
+        sns.scatterplot(data=df, x=feature, y=POVERTY_COLUMN,
+                        ax=ax, alpha=0.6, s=50)
+        ax.set_title(scatter_title(feature), fontsize=12, fontweight='bold')
+        ax.set_xlabel(feature, fontsize=10)
+        ax.set_ylabel('Persentase Kemiskinan (%)', fontsize=10)
+        ax.grid(True, alpha=0.3)
+        plt.tight_layout()
+        png = figure_to_png(fig)
+        plt.close(fig)
+        return Chart('image', image=png)
+
+
+class VegaLiteBackend:
+    """Kirim spesifikasi dan data ringkas; grafik digambar di browser."""
+
+    name = 'vega-lite'
+    cacheable = False
+
+    def correlation_heatmap(self, df, corr_matrix=None):
+        # Matriks korelasi kecil (fitur x fitur) dihitung di server; baris data tidak dikirim.
+        corr_matrix = correlation_matrix(df, corr_matrix)
+        if corr_matrix is None:
+            return None
+
+        columns = list(corr_matrix.columns)
+        data = corr_matrix.stack().rename_axis(['x', 'y']).reset_index(name='value')
+        data['value'] = data['value'].astype('float32')
+
+        axis_x = {'field': 'x', 'type': 'nominal', 'sort': columns, 'title': None,
+                  'axis': {'labelAngle': -45}}
+        axis_y = {'field': 'y', 'type': 'nominal', 'sort': columns, 'title': None}
+        spec = {
+            'height': 600,
+            'layer': [
+                {
+                    'mark': 'rect',
+                    'encoding': {
+                        'x': axis_x,
+                        'y': axis_y,
+                        'color': {
+                            'field': 'value', 'type': 'quantitative', 'title': None,
+                            'scale': {'scheme': 'redblue', 'domain': [-1, 1], 'reverse': True},
+                        },
+                    },
+                },
+                {
+                    'mark': {'type': 'text', 'fontSize': 10},
+                    'encoding': {
+                        'x': axis_x,
+                        'y': axis_y,
+                        'text': {'field': 'value', 'type': 'quantitative', 'format': '.2f'},
+                        'color': {
+                            'condition': {'test': 'abs(datum.value) > 0.6', 'value': 'white'},
+                            'value': 'black',
+                        },
+                    },
+                },
+            ],
+        }
+        return Chart('vega_lite', spec=spec, data=data)
+
+    def scatter_plot(self, df, feature):
+        data = pd.DataFrame({
+            'x': df[feature].to_numpy(dtype=np.float32),
+            'y': df[POVERTY_COLUMN].to_numpy(dtype=np.float32),
+        })
+        spec = {
+            'title': scatter_title(feature),
+            'mark': {'type': 'circle', 'opacity': 0.6, 'size': 50},
+            'encoding': {
+                'x': {'field': 'x', 'type': 'quantitative', 'title': feature, 'scale': {'zero': False}},
+                'y': {'field': 'y', 'type': 'quantitative', 'title': 'Persentase Kemiskinan (%)',
+                      'scale': {'zero': False}},
+            },
+        }
+        return Chart('vega_lite', spec=spec, data=data)
+
+
+CHART_BACKENDS = {
+    MatplotlibBackend.name: MatplotlibBackend,
+    VegaLiteBackend.name: VegaLiteBackend,
+}
+
+
+def get_backend(name=DEFAULT_BACKEND):
+    """Buat instance backend berdasarkan nama."""
+    try:
+        return CHART_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Backend grafik tidak dikenal: {name}") from None
+
+
+def payload_bytes(chart):
+    """Perkiraan byte yang dikirim ke browser untuk satu grafik."""
+    if chart is None:
+        return 0
+    if chart.kind == 'image':
+        return len(chart.image)
+
+    table = pa.Table.from_pandas(chart.data, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size + len(json.dumps(chart.spec).encode('utf-8'))
+
+
+def render_page_charts(backend, df):
+    """Buat semua grafik halaman EDA dengan satu backend."""
+    charts = [backend.correlation_heatmap(df)]
+    charts.extend(backend.scatter_plot(df, feature) for feature in SCATTER_FEATURES if feature in df.columns)
+    return charts
+
+
+def synthetic_rows(df, rows, seed=0):
+    """Perbesar dataset dengan sampling ulang dan sedikit noise pada kolom numerik."""
+    rng = np.random.default_rng(seed)
+    sample = df.iloc[rng.integers(0, len(df), size=rows)].reset_index(drop=True)
+    for column in numeric_frame(sample).columns:
+        values = sample[column].to_numpy(dtype=float)
+        sample[column] = values * rng.normal(1.0, 0.02, size=rows)
+    return sample
+
+
+def benchmark_backends(df, row_counts, backends=None):
+    """CPU server dan ukuran payload per tampilan halaman EDA untuk setiap backend."""
+    results = []
+    for rows in row_counts:
+        frame = df if rows == len(df) else synthetic_rows(df, rows)
+        for name in backends or CHART_BACKENDS:
+            backend = get_backend(name)
+            started_cpu = time.process_time()
+            started_wall = time.perf_counter()
+            charts = render_page_charts(backend, frame)
+            results.append({
+                'backend': name,
+                'rows': rows,
+                'server_cpu_seconds': round(time.process_time() - started_cpu, 4),
+                'wall_seconds': round(time.perf_counter() - started_wall, 4),
+                'payload_bytes': sum(payload_bytes(chart) for chart in charts),
+                'charts': len(charts),
+            })
+    return results
+
+
+def main(argv=None):
+    from dashboard.pipeline import clean_dataframe
+
+    parser = argparse.ArgumentParser(description="Benchmark backend grafik halaman EDA.")
+    parser.add_argument('--benchmark', action='store_true', help="Jalankan benchmark dan cetak JSON.")
+    parser.add_argument('--rows', type=int, nargs='+', default=None,
+                        help="Jumlah baris (default: ukuran dataset dan 100000).")
+    args = parser.parse_args(argv)
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    df = clean_dataframe(pd.read_csv(DATA_PATH))
+    row_counts = args.rows or [len(df), 100_000]
+    print(json.dumps(benchmark_backends(df, row_counts), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Konstanta path dan skema kolom yang dipakai bersama oleh aplikasi dan CLI."""
+from pathlib import Path
+import os
+
+# --- KONSTANTA PATH ---
+BASE_DIR = Path(__file__).resolve().parents[1]
+# Bisa berupa CSV bersih atau ekspor mentah BPS (lihat dashboard/ingest.py).
+DATA_PATH = Path(os.environ.get('POVERTY_DASHBOARD_DATA', BASE_DIR / 'data' / 'df_cleaned.csv'))
+LOCAL_GEOJSON_PATH = BASE_DIR / 'data' / 'prov 34.geojson'
+GEOJSON_URL = 'https://raw.githubusercontent.com/JfrAziz/indonesia-district/refs/heads/master/prov%2034%20simplified.geojson'
+GEOJSON_PROVINCE_KEY = 'feature.properties.name'
+MODEL_PATH = BASE_DIR / 'Model' / 'xgb_poverty_model.pkl'
+SCALER_PATH = BASE_DIR / 'Model' / 'scaler.pkl'
+
+# Artefak turunan (snapshot, cache, dll.) tidak ikut di-commit.
+CACHE_DIR = Path(os.environ.get('POVERTY_DASHBOARD_CACHE_DIR', BASE_DIR / '.cache'))
+
+# Frame dan GeoJSON yang dibagi antarproses worker. Di Linux bisa diarahkan ke /dev/shm.
+DATA_STORE_DIR = Path(os.environ.get('POVERTY_DASHBOARD_STORE_DIR', CACHE_DIR / 'store'))
+
+# Dataset multi-tahun yang dipartisi per tahun dan provinsi (lihat dashboard/partitions.py).
+# DATA_PATH otomatis disinkronkan sebagai tahun DATA_YEAR; tahun lain ditambahkan lewat CLI.
+PARTITION_DIR = Path(os.environ.get('POVERTY_DASHBOARD_PARTITIONS', BASE_DIR / 'data' / 'partitions'))
+DATA_YEAR = int(os.environ.get('POVERTY_DASHBOARD_DATA_YEAR', '2021'))
+
+# GeoJSON cadangan dari GEOJSON_URL (jika file lokal tidak ada) disimpan di cache disk dan
+# dianggap segar selama GEOJSON_MAX_AGE detik; setelah itu direvalidasi di latar.
+GEOJSON_MAX_AGE = int(os.environ.get('POVERTY_DASHBOARD_GEOJSON_MAX_AGE', str(24 * 3600)))
+GEOJSON_FETCH_TIMEOUT = float(os.environ.get('POVERTY_DASHBOARD_GEOJSON_TIMEOUT', '10'))
+
+# Tingkat detail geometri peta: 'auto' (mengikuti zoom awal), 'low', 'medium', 'high', atau 'full'.
+GEOMETRY_LEVEL = os.environ.get('POVERTY_DASHBOARD_GEOMETRY', 'auto')
+# Backend grafik halaman EDA: 'vega-lite' (digambar di browser) atau 'matplotlib' (PNG dari server).
+CHART_BACKEND = os.environ.get('POVERTY_DASHBOARD_CHART_BACKEND', 'vega-lite')
+
+# Tulis satu baris log JSON berisi span tracing untuk setiap rerun (lihat dashboard/tracing.py).
+TRACE_LOG = os.environ.get('POVERTY_DASHBOARD_TRACE_LOG', '').lower() in ('1', 'true', 'yes')
+
+# Muat dataset, GeoJSON peta, dan model bersamaan di thread latar saat proses baru mulai.
+WARMUP = os.environ.get('POVERTY_DASHBOARD_WARMUP', '1').lower() in ('1', 'true', 'yes')
+WARMUP_WORKERS = int(os.environ.get('POVERTY_DASHBOARD_WARMUP_WORKERS', '3'))
+
+# Vector tile peta ditulis di folder `static/` Streamlit agar disajikan di /app/static/.
+STATIC_DIR = BASE_DIR / 'static'
+TILE_DIR = STATIC_DIR / 'tiles'
+# Tileset yang tidak dipakai selama TILE_MAX_AGE detik boleh dihapus, kecuali beberapa versi terbaru.
+TILE_MAX_AGE = int(os.environ.get('POVERTY_DASHBOARD_TILE_MAX_AGE', str(7 * 24 * 3600)))
+# Renderer peta: 'auto' (tile jika static serving aktif), 'tiles', atau 'geojson' (inline).
+MAP_RENDERER = os.environ.get('POVERTY_DASHBOARD_MAP_RENDERER', 'auto')
+# Batas kabupaten/kota opsional (tidak disertakan di repositori) untuk layer tile kab/kota.
+DISTRICT_GEOJSON_PATH = os.environ.get('POVERTY_DASHBOARD_DISTRICT_GEOJSON') or None
+DISTRICT_GEOJSON_KEY = os.environ.get('POVERTY_DASHBOARD_DISTRICT_KEY', 'name')
+
+MAP_CENTER = [-2.5, 118.0]
+MAP_ZOOM_START = 5
+
+# Naikkan versi ini setiap kali logika pembersihan data berubah agar
+# artefak turunan yang lama dianggap kedaluwarsa.
+PIPELINE_VERSION = '2'
+
+COLUMN_MAPPING = {
+    'Provinsi': 'Provinsi',
+    'Kab/Kota': 'Kab/Kota',
+    'Indeks Pembangunan Manusia': 'Indeks Pembangunan Manusia',
+    'Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)': 'Persentase Kemiskinan (P0)',
+    'Rata-rata Lama Sekolah Penduduk 15+ (Tahun)': 'Rata-Rata Lama Sekolah',
+    'Pengeluaran per Kapita Disesuaikan (Ribu Rupiah/Orang/Tahun)': 'Pengeluaran Per Kapita',
+    'Umur Harapan Hidup (Tahun)': 'Umur Harapan Hidup',
+    'Persentase rumah tangga yang memiliki akses terhadap sanitasi layak': 'Akses Sanitasi Layak',
+    'Persentase rumah tangga yang memiliki akses terhadap air minum layak': 'Akses Air Minum Layak',
+    'Tingkat Pengangguran Terbuka': 'Tingkat Pengangguran Terbuka',
+    'Tingkat Partisipasi Angkatan Kerja': 'Tingkat Partisipasi Angkatan Kerja',
+    'PDRB atas Dasar Harga Konstan menurut Pengeluaran (Rupiah)': 'PDRB',
+}
+
+# Nama provinsi lama di ekspor BPS -> nama provinsi di GeoJSON.
+PROVINCE_ALIASES = {
+    'D I YOGYAKARTA': 'DAERAH ISTIMEWA YOGYAKARTA',
+    'KEP. BANGKA BELITUNG': 'KEPULAUAN BANGKA BELITUNG',
+}
+
+# Kelompok pulau untuk filter wilayah di halaman EDA.
+PROVINCE_REGIONS = {
+    'Sumatera': [
+        'ACEH', 'SUMATERA UTARA', 'SUMATERA BARAT', 'RIAU', 'KEPULAUAN RIAU', 'JAMBI',
+        'SUMATERA SELATAN', 'KEPULAUAN BANGKA BELITUNG', 'BENGKULU', 'LAMPUNG',
+    ],
+    'Jawa': ['DKI JAKARTA', 'JAWA BARAT', 'BANTEN', 'JAWA TENGAH', 'DAERAH ISTIMEWA YOGYAKARTA', 'JAWA TIMUR'],
+    'Bali dan Nusa Tenggara': ['BALI', 'NUSA TENGGARA BARAT', 'NUSA TENGGARA TIMUR'],
+    'Kalimantan': [
+        'KALIMANTAN BARAT', 'KALIMANTAN TENGAH', 'KALIMANTAN SELATAN', 'KALIMANTAN TIMUR', 'KALIMANTAN UTARA',
+    ],
+    'Sulawesi': [
+        'SULAWESI UTARA', 'GORONTALO', 'SULAWESI TENGAH', 'SULAWESI BARAT', 'SULAWESI SELATAN',
+        'SULAWESI TENGGARA',
+    ],
+    'Maluku': ['MALUKU', 'MALUKU UTARA'],
+    'Papua': ['PAPUA', 'PAPUA BARAT'],
+}
+
+REQUIRED_COLUMNS = [
+    'Provinsi',
+    'Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)',
+]
+
+NUMERIC_COLUMNS = [
+    'Indeks Pembangunan Manusia',
+    'Persentase Kemiskinan (P0)',
+    'Rata-Rata Lama Sekolah',
+    'Pengeluaran Per Kapita',
+    'Umur Harapan Hidup',
+    'Akses Sanitasi Layak',
+    'Akses Air Minum Layak',
+    'Tingkat Pengangguran Terbuka',
+    'Tingkat Partisipasi Angkatan Kerja',
+    'PDRB',
+]
@@ -0,0 +1,165 @@
+"""
+Korelasi antarindikator dari akumulator co-moment per provinsi.
+
+Untuk setiap provinsi disimpan jumlah baris `n`, vektor rata-rata, dan matriks
+co-moment `M2 = sum((x - mean)(x - mean)^T)`. Akumulator ini bisa digabung
+dengan rumus paralel Welford/Chan, sehingga korelasi untuk gabungan provinsi
+mana pun (satu pulau, beberapa pulau, atau seluruh Indonesia) dihitung dalam
+O(provinsi x fitur^2) tanpa memindai baris data lagi. Batch baru juga cukup
+digabung ke akumulator provinsinya (`with_batch`).
+
+Baris dengan nilai kosong pada salah satu kolom numerik tidak dihitung
+(listwise). Data bersih tidak memiliki nilai kosong, sehingga hasilnya sama
+dengan `DataFrame.corr()`.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+
+import numpy as np
+import pandas as pd
+
+CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class CoMoments:
+    """Akumulator co-moment untuk satu himpunan baris. Perlakukan array sebagai read-only."""
+
+    count: int
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def from_array(cls, values):
+        """Akumulator dari array baris x fitur tanpa nilai kosong."""
+        count = len(values)
+        if count == 0:
+            width = values.shape[1]
+            return cls(0, np.zeros(width), np.zeros((width, width)))
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return cls(count, mean, centered.T @ centered)
+
+    def merge(self, other):
+        """Gabungkan dua akumulator (rumus paralel Chan dkk.)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.count / count)
+        m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.count * other.count / count)
+        return CoMoments(count, mean, m2)
+
+    def covariance(self, ddof=1):
+        if self.count - ddof <= 0:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.count - ddof)
+
+    def correlation(self):
+        m2 = self.m2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = np.sqrt(np.diag(m2))
+            corr = m2 / np.outer(scale, scale)
+        np.fill_diagonal(corr, np.where(scale > 0, 1.0, np.nan))
+        return np.clip(corr, -1.0, 1.0)
+
+
+def combine(accumulators):
+    """Gabungkan banyak akumulator sekaligus (tervektorisasi, tanpa melipat satu per satu)."""
+    accumulators = [acc for acc in accumulators if acc.count]
+    if not accumulators:
+        return None
+    counts = np.array([acc.count for acc in accumulators], dtype=float)
+    means = np.stack([acc.mean for acc in accumulators])
+    total = counts.sum()
+    mean = counts @ means / total
+    deviation = means - mean
+    m2 = sum(acc.m2 for acc in accumulators) + np.einsum('k,ki,kj->ij', counts, deviation, deviation)
+    return CoMoments(int(total), mean, m2)
+
+
+def province_moments(df, columns):
+    """Akumulator per provinsi dalam satu kali pemindaian frame."""
+    values = df[columns].to_numpy(dtype=float)
+    complete = ~np.isnan(values).any(axis=1)
+    codes, provinces = pd.factorize(df['Provinsi'].to_numpy()[complete], sort=True)
+    values = values[complete]
+
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(provinces) + 1))
+    sorted_values = values[order]
+    return {
+        province: CoMoments.from_array(sorted_values[bounds[idx]:bounds[idx + 1]])
+        for idx, province in enumerate(provinces)
+    }
+
+
+class CorrelationEngine:
+    """
+    Matriks korelasi per subset provinsi dengan cache LRU.
+
+    Objek ini dipakai bersama oleh semua sesi (thread-safe); akumulatornya
+    tidak pernah diubah setelah dibuat.
+    """
+
+    def __init__(self, columns, accumulators, cache_size=CACHE_SIZE):
+        self.columns = list(columns)
+        self.accumulators = accumulators
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_frame(cls, df, columns=None, cache_size=CACHE_SIZE):
+        if columns is None:
+            columns = list(df.select_dtypes(include=np.number).columns)
+        return cls(columns, province_moments(df, columns), cache_size)
+
+    @property
+    def provinces(self):
+        return sorted(self.accumulators)
+
+    def with_batch(self, df):
+        """Engine baru dengan batch baris tambahan digabung ke akumulator provinsinya."""
+        accumulators = dict(self.accumulators)
+        for province, moments in province_moments(df, self.columns).items():
+            existing = accumulators.get(province)
+            accumulators[province] = existing.merge(moments) if existing is not None else moments
+        return CorrelationEngine(self.columns, accumulators, self.cache_size)
+
+    def moments(self, provinces=None):
+        """Akumulator gabungan untuk subset provinsi (None = semua)."""
+        selected = self.accumulators if provinces is None else {
+            province: self.accumulators[province] for province in provinces if province in self.accumulators
+        }
+        return combine(selected[province] for province in sorted(selected))
+
+    def correlation(self, provinces=None):
+        """Matriks korelasi (DataFrame fitur x fitur), atau None jika subset kosong."""
+        key = None if provinces is None else frozenset(provinces)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        moments = self.moments(provinces)
+        result = None
+        if moments is not None:
+            result = pd.DataFrame(moments.correlation(), index=self.columns, columns=self.columns)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
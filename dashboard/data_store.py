@@ -0,0 +1,158 @@
+"""
+Penyimpanan data lintas proses berbasis file yang di-memory-map.
+
+Frame terproses dipublikasikan sekali sebagai file Arrow IPC dan GeoJSON
+sebagai byte JSON yang sudah di-encode, dengan nama yang memuat versinya.
+Setiap proses worker kemudian me-memory-map file yang sama; halaman memori
+dibagi oleh kernel (page cache), sehingga kolom numerik dan string Arrow
+tidak disalin per worker maupun per rerun. Frame hasil `attach_frame`
+bersifat read-only. Versi yang di-attach dibatasi LRU (`max_entries`);
+versi yang tersingkir dilepas setelah tidak ada lagi yang merujuknya.
+
+Di disk, setiap nama hanya menyimpan `keep_versions` versi yang terakhir
+dipublikasikan atau di-attach (mtime file); versi lain dihapus saat versi
+baru dipublikasikan. Worker yang masih me-memory-map file terhapus tetap
+bisa membacanya, dan versi yang dibutuhkan lagi cukup dipublikasikan ulang.
+"""
+import os
+
+from collections import OrderedDict
+from pathlib import Path
+import mmap
+import re
+import threading
+
+import pyarrow as pa
+
+from dashboard.config import DATA_STORE_DIR
+from dashboard.fsutil import write_atomic
+
+FRAME_SUFFIX = '.arrow'
+BYTES_SUFFIX = '.bin'
+
+
+def safe_name(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', value)
+
+
+class DataStore:
+    """Publikasi dan attach frame/byte read-only yang dibagi antarproses."""
+
+    def __init__(self, store_dir=DATA_STORE_DIR, max_entries=8, keep_versions=8):
+        self.store_dir = Path(store_dir)
+        self.max_entries = max_entries
+        self.keep_versions = keep_versions
+        self._attached = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key):
+        with self._lock:
+            value = self._attached.get(key)
+            if value is not None:
+                self._attached.move_to_end(key)
+            return value
+
+    def _remember(self, key, value):
+        """Simpan objek ter-attach; worker lain yang lebih dulu menang. Entri terlama disingkirkan."""
+        with self._lock:
+            value = self._attached.setdefault(key, value)
+            self._attached.move_to_end(key)
+            while len(self._attached) > self.max_entries:
+                self._attached.popitem(last=False)
+            return value
+
+    def path_for(self, name, version, suffix):
+        return self.store_dir / f"{safe_name(name)}-{safe_name(version)}{suffix}"
+
+    @staticmethod
+    def _touch(path):
+        """Tandai file baru saja dipakai agar tidak dibersihkan lebih dulu."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def remove_old_versions(self, name, suffix):
+        """Hapus file `name` di luar `keep_versions` yang terakhir dipakai; mengembalikan path terhapus."""
+        files = []
+        for path in self.store_dir.glob(f"{safe_name(name)}-*{suffix}"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        files.sort(reverse=True)
+        removed = []
+        for _, path in files[self.keep_versions:]:
+            try:
+                path.unlink()
+            except OSError:
+                # Sudah dihapus worker lain, atau masih terbuka di platform yang melarang unlink.
+                continue
+            removed.append(path)
+        return removed
+
+    def _publish(self, name, suffix, path, write):
+        write_atomic(path, write)
+        self.remove_old_versions(name, suffix)
+        return path
+
+    def publish_frame(self, name, version, df):
+        """Tulis DataFrame sebagai Arrow IPC jika versi ini belum dipublikasikan."""
+        path = self.path_for(name, version, FRAME_SUFFIX)
+        if path.exists():
+            self._touch(path)
+            return path
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        def write(file):
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+
+        return self._publish(name, FRAME_SUFFIX, path, write)
+
+    def attach_frame(self, name, version):
+        """
+        Memory-map frame yang sudah dipublikasikan, atau None jika belum ada.
+
+        Kolom numerik tanpa nilai kosong dan kolom string Arrow tidak disalin.
+        """
+        key = ('frame', name, version)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        path = self.path_for(name, version, FRAME_SUFFIX)
+        try:
+            source = pa.memory_map(str(path), 'r')
+            table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None
+        df = table.to_pandas(split_blocks=True)
+        self._touch(path)
+        return self._remember(key, df)
+
+    def publish_bytes(self, name, version, data):
+        """Tulis byte yang sudah di-encode (misalnya GeoJSON) jika belum ada."""
+        path = self.path_for(name, version, BYTES_SUFFIX)
+        if path.exists():
+            self._touch(path)
+            return path
+        return self._publish(name, BYTES_SUFFIX, path, lambda file: file.write(data))
+
+    def attach_bytes(self, name, version):
+        """Memory-map byte yang sudah dipublikasikan sebagai objek mmap read-only."""
+        key = ('bytes', name, version)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        path = self.path_for(name, version, BYTES_SUFFIX)
+        try:
+            with path.open('rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError: file kosong tidak bisa di-mmap.
+            return None
+        self._touch(path)
+        return self._remember(key, mapped)
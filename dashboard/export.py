@@ -0,0 +1,152 @@
+"""
+Ekspor dataset terproses (CSV, CSV gzip, Parquet) yang dibuat hanya saat diminta.
+
+Encoding dilakukan per potongan baris sehingga memori saat membuat file tetap
+terbatas, lalu hasilnya ditulis ke `.cache/exports/` dan disimpan sebagai satu
+buffer byte per versi dataset dan format. Semua sesi di proses yang sama
+memakai buffer yang sama; proses lain cukup membaca file yang sudah jadi.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import io
+import threading
+import zlib
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboard import tracing
+from dashboard.config import CACHE_DIR
+from dashboard.fsutil import write_atomic
+
+EXPORT_DIR = CACHE_DIR / 'exports'
+EXPORT_FORMAT_VERSION = '1'
+CHUNK_ROWS = 50_000
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """Metadata satu format unduhan."""
+
+    key: str
+    label: str
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS = {
+    'csv': ExportFormat('csv', 'CSV', 'csv', 'text/csv'),
+    'csv.gz': ExportFormat('csv.gz', 'CSV (gzip)', 'csv.gz', 'application/gzip'),
+    'parquet': ExportFormat('parquet', 'Parquet', 'parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def iter_csv_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Encode DataFrame menjadi potongan byte CSV (UTF-8), header di potongan pertama."""
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode('utf-8')
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode('utf-8')
+
+
+def iter_gzip_chunks(chunks, level=6):
+    """Kompres aliran potongan byte menjadi satu aliran gzip."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def write_parquet(df, sink, chunk_rows=CHUNK_ROWS):
+    """Tulis DataFrame ke Parquet dengan satu row group per potongan."""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def encode_export(df, fmt, file, chunk_rows=CHUNK_ROWS):
+    """Encode DataFrame ke objek file biner, potongan demi potongan."""
+    if fmt == 'parquet':
+        write_parquet(df, file, chunk_rows)
+        return
+    chunks = iter_csv_chunks(df, chunk_rows)
+    if fmt == 'csv.gz':
+        chunks = iter_gzip_chunks(chunks)
+    for chunk in chunks:
+        file.write(chunk)
+
+
+def write_export(df, fmt, path, chunk_rows=CHUNK_ROWS):
+    """Tulis ekspor ke file secara atomik."""
+    return write_atomic(path, lambda file: encode_export(df, fmt, file, chunk_rows))
+
+
+class ExportStore:
+    """Buffer ekspor bersama per (versi dataset, format) dengan batas LRU."""
+
+    def __init__(self, export_dir=EXPORT_DIR, max_entries=4):
+        self.export_dir = Path(export_dir)
+        self.max_entries = max_entries
+        self._buffers = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def export_path(self, dataset_version, fmt):
+        safe_version = dataset_version.replace(':', '-')
+        return self.export_dir / safe_version / f"data_v{EXPORT_FORMAT_VERSION}.{EXPORT_FORMATS[fmt].extension}"
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_bytes(self, df, dataset_version, fmt, persist=True):
+        """
+        Kembalikan byte ekspor; dibuat sekali per versi dataset dan format.
+
+        Pemanggil serentak untuk kunci yang sama menunggu satu proses build.
+        `persist=False` (tampilan terfilter) meng-encode di memori saja tanpa
+        menulis ke direktori ekspor.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+
+        key = (dataset_version, fmt)
+        with self._lock:
+            data = self._buffers.get(key)
+            if data is not None:
+                self._buffers.move_to_end(key)
+                tracing.annotate(cache='hit', bytes=len(data))
+                return data
+        tracing.annotate(cache='miss')
+
+        with self._key_lock(key):
+            with self._lock:
+                data = self._buffers.get(key)
+            if data is None and persist:
+                path = self.export_path(dataset_version, fmt)
+                try:
+                    if not path.exists():
+                        write_export(df, fmt, path)
+                    data = path.read_bytes()
+                except OSError:
+                    # Direktori cache read-only: encode langsung di memori.
+                    data = None
+            if data is None:
+                buffer = io.BytesIO()
+                encode_export(df, fmt, buffer)
+                data = buffer.getvalue()
+        tracing.annotate(bytes=len(data))
+
+        with self._lock:
+            self._buffers[key] = data
+            self._buffers.move_to_end(key)
+            while len(self._buffers) > self.max_entries:
+                self._buffers.popitem(last=False)
+        return data
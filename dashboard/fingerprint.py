@@ -0,0 +1,75 @@
+"""
+Sidik jari file sumber untuk kunci cache yang murah.
+
+Kunci cache dibentuk dari path, ukuran, dan mtime file (satu panggilan
+`os.stat`) ditambah versi pipeline, sehingga pengecekan cache tidak perlu
+membaca atau meng-hash isi data. Hash isi (SHA-256) hanya dihitung jika
+diminta, dan hasilnya diingat selama stat file tidak berubah: hanya stat
+terakhir per path yang diingat, untuk paling banyak `MEMO_MAX_PATHS` path.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import os
+import threading
+
+from dashboard.config import PIPELINE_VERSION
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MEMO_MAX_PATHS = 64
+
+# path -> (ukuran, mtime_ns, digest), urutan LRU.
+_digest_memo = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Identitas murah sebuah file sumber."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str = None
+
+    def cache_key(self, pipeline_version=PIPELINE_VERSION):
+        """Kunci cache proses lokal: berubah jika file atau pipeline berubah."""
+        return f"{self.path}:{self.size}:{self.mtime_ns}:{pipeline_version}"
+
+
+def content_digest(path):
+    """Hitung hash SHA-256 isi file secara bertahap."""
+    digest = hashlib.sha256()
+    with Path(path).open('rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path, with_digest=False):
+    """
+    Buat sidik jari file; `with_digest=True` menambahkan hash isi.
+
+    Hash isi diingat per path bersama ukuran dan mtime-nya sehingga hanya
+    dihitung ulang ketika file benar-benar berubah.
+    """
+    path = str(Path(path).resolve())
+    stat = os.stat(path)
+    digest = None
+    if with_digest:
+        stat_key = (stat.st_size, stat.st_mtime_ns)
+        with _digest_lock:
+            size, mtime_ns, memo_digest = _digest_memo.get(path, (None, None, None))
+            if (size, mtime_ns) == stat_key:
+                digest = memo_digest
+                _digest_memo.move_to_end(path)
+        if digest is None:
+            digest = content_digest(path)
+            with _digest_lock:
+                # Entri lama path ini langsung tergantikan; path terlama disingkirkan.
+                _digest_memo[path] = (*stat_key, digest)
+                _digest_memo.move_to_end(path)
+                while len(_digest_memo) > MEMO_MAX_PATHS:
+                    _digest_memo.popitem(last=False)
+    return SourceFingerprint(path, stat.st_size, stat.st_mtime_ns, digest)
@@ -0,0 +1,31 @@
+"""
+Utilitas file bersama tanpa dependency berat.
+
+Semua artefak cache dan build ditulis lewat `write_atomic`, sehingga worker
+lain tidak pernah membaca file setengah jadi.
+"""
+from pathlib import Path
+import os
+import tempfile
+
+
+def write_atomic(path, write, mode='wb', **open_kwargs):
+    """
+    Tulis file lewat file sementara di direktori yang sama lalu rename.
+
+    `write(file)` menerima file yang dibuka dengan `mode` (dan `open_kwargs`,
+    misalnya `encoding`); file sementara dihapus jika penulisan gagal.
+    Mengembalikan `path`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as file:
+            write(file)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,290 @@
+"""
+Sumber GeoJSON jarak jauh dengan cache disk dan revalidasi kondisional.
+
+Dipakai jika file GeoJSON lokal tidak ada atau rusak. Halaman tidak pernah
+menunggu jaringan:
+
+- cache segar dikembalikan langsung;
+- cache basi (lebih tua dari `max_age`) tetap dikembalikan sementara thread
+  latar merevalidasinya (stale-while-revalidate) dengan `If-None-Match` /
+  `If-Modified-Since`, sehingga respons 304 tidak mengunduh ulang isi file;
+- tanpa cache, unduhan dimulai di latar dan `GeoJSONUnavailable` dilempar
+  agar halaman menampilkan pesan alih-alih menunggu.
+
+Revalidasi memegang kunci file sehingga beberapa proses worker mengunduh
+paling banyak sekali: proses yang menunggu kunci melihat cache yang baru
+segar lalu berhenti. Setelah gagal, revalidasi berikutnya ditunda
+`retry_after` detik dan salinan lama tetap dipakai. Isi baru hanya
+menggantikan cache setelah lolos `validate_geojson`.
+
+    python -m dashboard.geo_source            # isi/revalidasi cache sekarang
+    python -m dashboard.geo_source --force    # abaikan umur cache
+"""
+from contextlib import contextmanager
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya kunci antar-thread, bukan antarproses.
+    fcntl = None
+
+from dashboard import tracing, warmup
+from dashboard.config import CACHE_DIR, GEOJSON_FETCH_TIMEOUT, GEOJSON_MAX_AGE, GEOJSON_URL
+from dashboard.fsutil import write_atomic
+
+GEOJSON_CACHE_DIR = CACHE_DIR / 'geojson'
+RETRY_AFTER = 60
+POOL_SIZE = 4
+USER_AGENT = 'poverty-in-indonesia-dashboard'
+
+logger = logging.getLogger(__name__)
+
+
+class GeoJSONUnavailable(RuntimeError):
+    """GeoJSON jarak jauh belum ada di cache; unduhan sedang berjalan di latar."""
+
+
+def validate_geojson(geojson_data):
+    """Validate the minimal GeoJSON contract needed by the dashboard."""
+    if not isinstance(geojson_data, dict):
+        raise ValueError("GeoJSON harus berupa object JSON.")
+
+    if geojson_data.get('type') != 'FeatureCollection':
+        raise ValueError("GeoJSON harus bertipe FeatureCollection.")
+
+    features = geojson_data.get('features')
+    if not isinstance(features, list) or not features:
+        raise ValueError("GeoJSON tidak memiliki daftar features.")
+
+    missing_name = [
+        idx for idx, feature in enumerate(features, start=1)
+        if not isinstance(feature, dict) or not feature.get('properties', {}).get('name')
+    ]
+    if missing_name:
+        raise ValueError(f"Properti name kosong pada feature: {missing_name[:5]}")
+
+
+@contextmanager
+def file_lock(path):
+    """Kunci eksklusif lintas proses selama blok berjalan."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a') as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class RemoteGeoJSON:
+    """Satu URL GeoJSON beserta salinan cache disk dan sesi HTTP-nya."""
+
+    def __init__(self, url=GEOJSON_URL, cache_dir=GEOJSON_CACHE_DIR, max_age=GEOJSON_MAX_AGE,
+                 timeout=GEOJSON_FETCH_TIMEOUT, retry_after=RETRY_AFTER):
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+        self.meta_path = self.cache_dir / f"{self.name}.json"
+        self.lock_path = self.cache_dir / f"{self.name}.lock"
+        self._lock = threading.Lock()
+        self._session = None
+        self._refresh_thread = None
+        self._data = None
+        self._data_digest = None
+        self._counts = {'hits': 0, 'stale': 0, 'misses': 0, 'fetches': 0, 'not_modified': 0, 'errors': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def session(self):
+        """Sesi HTTP dengan pool koneksi, dibuat sekali dan dipakai ulang."""
+        with self._lock:
+            if self._session is None:
+                requests = warmup.timed_import('requests')
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=1)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                self._session = session
+            return self._session
+
+    def meta(self):
+        """Metadata cache (file, digest, ETag, Last-Modified, waktu cek), atau {} jika belum ada."""
+        try:
+            with self.meta_path.open(encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta):
+        payload = json.dumps(meta, ensure_ascii=False, indent=1).encode('utf-8')
+        write_atomic(self.meta_path, lambda file: file.write(payload))
+
+    def is_fresh(self, meta, now=None):
+        now = time.time() if now is None else now
+        return bool(meta.get('file')) and meta.get('checked_at', 0) + self.max_age > now
+
+    def cached(self, meta=None):
+        """GeoJSON dari cache disk (didekode sekali per digest), atau None."""
+        meta = self.meta() if meta is None else meta
+        digest = meta.get('digest')
+        if not digest:
+            return None
+        with self._lock:
+            if self._data_digest == digest:
+                return self._data
+        try:
+            data = json.loads((self.cache_dir / meta['file']).read_bytes())
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._data, self._data_digest = data, digest
+        return data
+
+    def version(self):
+        """Digest isi cache saat ini; berubah setelah revalidasi mengunduh isi baru."""
+        return self.meta().get('digest')
+
+    def get(self, block=False):
+        """
+        GeoJSON untuk halaman tanpa menunggu jaringan.
+
+        Cache basi dikembalikan sambil direvalidasi di latar. Tanpa cache,
+        `block=True` mengunduh sekarang (untuk CLI); selain itu unduhan latar
+        dimulai dan `GeoJSONUnavailable` dilempar.
+        """
+        meta = self.meta()
+        data = self.cached(meta)
+        if data is not None:
+            if self.is_fresh(meta):
+                self._count('hits')
+            else:
+                self._count('stale')
+                self.refresh_in_background()
+            return data
+
+        self._count('misses')
+        if block:
+            self.refresh()
+            meta = self.meta()
+            data = self.cached(meta)
+            if data is None:
+                raise GeoJSONUnavailable(meta.get('error') or "GeoJSON jarak jauh tidak tersedia.")
+            return data
+        self.refresh_in_background()
+        raise GeoJSONUnavailable(meta.get('error') or "GeoJSON sedang diunduh.")
+
+    def refresh_in_background(self):
+        """Mulai revalidasi di thread latar; paling banyak satu thread per proses."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            thread = threading.Thread(target=self._refresh_quietly, name='geojson-refresh', daemon=True)
+            self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:  # noqa: BLE001 - thread latar tidak boleh mematikan proses
+            logger.exception("Revalidasi GeoJSON %s gagal.", self.url)
+
+    def refresh(self, force=False):
+        """
+        Revalidasi cache sekali lintas proses.
+
+        Mengembalikan 'fresh' (proses lain baru saja memperbarui), 'backoff'
+        (gagal belum lama ini), 'not_modified', 'updated', atau 'failed'.
+        """
+        requests = warmup.timed_import('requests')
+        with file_lock(self.lock_path):
+            meta = self.meta()
+            now = time.time()
+            if not force and self.is_fresh(meta, now):
+                return 'fresh'
+            if not force and meta.get('failed_at') and meta['failed_at'] + self.retry_after > now:
+                return 'backoff'
+
+            has_body = bool(meta.get('file')) and (self.cache_dir / meta['file']).exists()
+            headers = {}
+            if has_body and meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if has_body and meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+            self._count('fetches')
+            try:
+                with tracing.span('fetch_geojson') as span:
+                    response = self.session().get(self.url, headers=headers, timeout=self.timeout)
+                    if response.status_code == 304 and has_body:
+                        self._count('not_modified')
+                        self._write_meta({**meta, 'checked_at': now, 'failed_at': None, 'error': None})
+                        return 'not_modified'
+                    response.raise_for_status()
+                    content = response.content
+                    if span.enabled:
+                        span.bytes = len(content)
+                    validate_geojson(json.loads(content))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self._count('errors')
+                logger.warning("Gagal mengambil GeoJSON %s: %s", self.url, e)
+                self._write_meta({**meta, 'failed_at': now, 'error': str(e)})
+                return 'failed'
+
+            digest = hashlib.sha256(content).hexdigest()
+            file = f"{self.name}.{digest[:16]}.geojson"
+            if not (self.cache_dir / file).exists():
+                write_atomic(self.cache_dir / file, lambda sink: sink.write(content))
+            self._write_meta({
+                'url': self.url,
+                'file': file,
+                'digest': digest,
+                'bytes': len(content),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': now,
+                'checked_at': now,
+                'failed_at': None,
+                'error': None,
+            })
+            # Salinan lama dihapus setelah metadata menunjuk ke file baru.
+            if meta.get('file') and meta['file'] != file:
+                (self.cache_dir / meta['file']).unlink(missing_ok=True)
+            return 'updated'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Isi atau revalidasi cache GeoJSON jarak jauh.")
+    parser.add_argument('--url', default=GEOJSON_URL, help="URL GeoJSON.")
+    parser.add_argument('--cache-dir', default=str(GEOJSON_CACHE_DIR), help="Direktori cache.")
+    parser.add_argument('--force', action='store_true', help="Revalidasi walaupun cache masih segar.")
+    args = parser.parse_args(argv)
+
+    source = RemoteGeoJSON(args.url, args.cache_dir)
+    status = source.refresh(force=args.force)
+    meta = source.meta()
+    print(f"{status}: {meta.get('file') or '-'} ({meta.get('bytes') or 0:,} byte)")
+    if meta.get('error'):
+        print(f"Error terakhir: {meta['error']}")
+
+
+if __name__ == '__main__':
+    main()
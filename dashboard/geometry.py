@@ -0,0 +1,418 @@
+"""
+Penyederhanaan dan kuantisasi geometri provinsi untuk peta choropleth.
+
+Pipeline offline ini memecah setiap ring menjadi arc di titik pertemuan
+antarprovinsi, menyederhanakan setiap arc unik sekali (Douglas-Peucker),
+lalu menulis varian GeoJSON dan TopoJSON per tingkat detail. Karena batas
+bersama memakai arc yang sama, penyederhanaan tidak menimbulkan celah antar
+provinsi. Pulau yang sangat kecil dibuang sesuai tingkat detail, kecuali
+poligon terbesar setiap provinsi.
+
+Build dan benchmark manual:
+
+    python -m dashboard.geometry
+    python -m dashboard.geometry --benchmark
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import gzip
+import json
+import time
+
+import numpy as np
+
+from dashboard.config import CACHE_DIR, LOCAL_GEOJSON_PATH
+from dashboard.fsutil import write_atomic
+
+GEOMETRY_DIR = CACHE_DIR / 'geometry'
+FULL_LEVEL = 'full'
+
+
+@dataclass(frozen=True)
+class GeometryLevel:
+    """Parameter satu varian geometri."""
+
+    name: str
+    tolerance: float       # toleransi Douglas-Peucker (derajat)
+    min_area: float        # luas minimum poligon yang dipertahankan (derajat persegi)
+    precision: int         # jumlah desimal koordinat GeoJSON
+    quantization: int      # ukuran grid TopoJSON
+    max_zoom: int          # zoom Leaflet tertinggi yang masih layak memakai varian ini
+
+
+GEOMETRY_LEVELS = {
+    'low': GeometryLevel('low', tolerance=0.05, min_area=0.01, precision=2, quantization=10_000, max_zoom=4),
+    'medium': GeometryLevel('medium', tolerance=0.01, min_area=0.002, precision=3, quantization=100_000, max_zoom=6),
+    'high': GeometryLevel('high', tolerance=0.002, min_area=0.0001, precision=4, quantization=1_000_000, max_zoom=9),
+}
+
+
+def level_for_zoom(zoom):
+    """Pilih varian paling ringan yang masih cukup detail untuk zoom tertentu."""
+    for level in sorted(GEOMETRY_LEVELS.values(), key=lambda item: item.max_zoom):
+        if zoom <= level.max_zoom:
+            return level.name
+    return FULL_LEVEL
+
+
+def iter_polygons(geometry):
+    """Daftar poligon (list of rings) dari Polygon atau MultiPolygon."""
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    raise ValueError(f"Tipe geometri tidak didukung: {geometry['type']}")
+
+
+def ring_area(ring):
+    """Luas absolut ring (rumus shoelace, satuan derajat persegi)."""
+    coords = np.asarray(ring, dtype=float)
+    x, y = coords[:, 0], coords[:, 1]
+    return abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+
+def filter_small_polygons(polygons, min_area):
+    """Buang poligon kecil, tetapi selalu pertahankan poligon terbesar."""
+    if not polygons:
+        return polygons
+    areas = [ring_area(polygon[0]) for polygon in polygons]
+    largest = int(np.argmax(areas))
+    return [
+        polygon for idx, (polygon, area) in enumerate(zip(polygons, areas))
+        if idx == largest or area >= min_area
+    ]
+
+
+def find_junctions(rings):
+    """Titik yang memiliki lebih dari dua tetangga berbeda di seluruh ring."""
+    neighbours = {}
+    for ring in rings:
+        count = len(ring)
+        for idx, point in enumerate(ring):
+            entry = neighbours.setdefault(point, set())
+            entry.add(ring[idx - 1])
+            entry.add(ring[(idx + 1) % count])
+    return {point for point, entry in neighbours.items() if len(entry) > 2}
+
+
+def split_ring(ring, junctions):
+    """Potong ring tertutup (tanpa titik penutup) menjadi arc di setiap junction."""
+    cut_points = [idx for idx, point in enumerate(ring) if point in junctions]
+    if not cut_points:
+        return [ring + [ring[0]]]
+
+    start = cut_points[0]
+    rotated = ring[start:] + ring[:start]
+    cut_points = [idx - start for idx in cut_points] + [len(ring)]
+    rotated.append(rotated[0])
+    return [rotated[begin:end + 1] for begin, end in zip(cut_points, cut_points[1:])]
+
+
+def douglas_peucker(points, tolerance):
+    """Sederhanakan polyline dengan mempertahankan kedua titik ujung."""
+    points = np.asarray(points, dtype=float)
+    count = len(points)
+    if count <= 2 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment = points[first + 1:last]
+        start, end = points[first], points[last]
+        direction = end - start
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(*(segment - start).T)
+        else:
+            offset = segment - start
+            distances = np.abs(direction[0] * offset[:, 1] - direction[1] * offset[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return points[keep]
+
+
+def simplify_arc(arc, tolerance):
+    """Sederhanakan arc; arc tertutup dipecah di titik terjauh dari titik awal."""
+    points = np.asarray(arc, dtype=float)
+    if len(points) > 3 and np.array_equal(points[0], points[-1]):
+        farthest = int(np.argmax(np.hypot(*(points - points[0]).T)))
+        head = douglas_peucker(points[:farthest + 1], tolerance)
+        tail = douglas_peucker(points[farthest:], tolerance)
+        return np.vstack([head, tail[1:]])
+    return douglas_peucker(points, tolerance)
+
+
+def build_topology(geojson_data, level):
+    """
+    Bangun topologi arc bersama untuk satu tingkat detail.
+
+    Mengembalikan (arcs, features) dengan arcs berupa array float yang sudah
+    disederhanakan, dan features berisi referensi arc gaya TopoJSON
+    (indeks negatif `~i` berarti arc dibalik).
+    """
+    features = []
+    rings = []
+    for feature in geojson_data['features']:
+        polygons = filter_small_polygons(iter_polygons(feature['geometry']), level.min_area)
+        feature_rings = []
+        for polygon in polygons:
+            polygon_rings = [[tuple(point) for point in ring[:-1]] for ring in polygon]
+            feature_rings.append(polygon_rings)
+            rings.extend(polygon_rings)
+        features.append((feature, feature_rings))
+
+    junctions = find_junctions(rings)
+
+    arc_index = {}
+    raw_arcs = []
+
+    def register(arc):
+        key = tuple(arc)
+        if key in arc_index:
+            return arc_index[key]
+        reversed_key = key[::-1]
+        if reversed_key in arc_index:
+            return ~arc_index[reversed_key]
+        arc_index[key] = len(raw_arcs)
+        raw_arcs.append(arc)
+        return arc_index[key]
+
+    topo_features = []
+    for feature, feature_rings in features:
+        polygons = [
+            [[register(arc) for arc in split_ring(ring, junctions)] for ring in polygon_rings]
+            for polygon_rings in feature_rings
+        ]
+        topo_features.append((feature, polygons))
+
+    arcs = [simplify_arc(arc, level.tolerance) for arc in raw_arcs]
+    return arcs, topo_features
+
+
+def quantize_arcs(arcs, bbox, quantization):
+    """Kuantisasi arc ke grid integer dan buang titik berurutan yang sama."""
+    min_x, min_y, max_x, max_y = bbox
+    scale = np.array([
+        (max_x - min_x) / (quantization - 1) or 1,
+        (max_y - min_y) / (quantization - 1) or 1,
+    ])
+    translate = np.array([min_x, min_y])
+
+    quantized = []
+    for arc in arcs:
+        grid = np.rint((arc - translate) / scale).astype(np.int64)
+        changed = np.ones(len(grid), dtype=bool)
+        changed[1:] = np.any(grid[1:] != grid[:-1], axis=1)
+        grid = grid[changed]
+        if len(grid) < 2:
+            grid = np.vstack([grid, grid])
+        quantized.append(grid)
+    return quantized, scale, translate
+
+
+def resolve_ring(arc_refs, arcs):
+    """Gabungkan referensi arc menjadi satu ring koordinat."""
+    points = []
+    for ref in arc_refs:
+        arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+        points.extend(arc if not points else arc[1:])
+    return points
+
+
+def geojson_bbox(geojson_data):
+    coords = np.concatenate([
+        np.asarray(ring, dtype=float)
+        for feature in geojson_data['features']
+        for polygon in iter_polygons(feature['geometry'])
+        for ring in polygon
+    ])
+    return (*coords.min(axis=0), *coords.max(axis=0))
+
+
+def simplify_geojson(geojson_data, level):
+    """
+    Buat varian GeoJSON dan TopoJSON untuk satu tingkat detail.
+
+    Urutan dan properti feature dipertahankan agar pemetaan feature di kubus
+    provinsi tetap berlaku.
+    """
+    if isinstance(level, str):
+        level = GEOMETRY_LEVELS[level]
+
+    arcs, topo_features = build_topology(geojson_data, level)
+    quantized, scale, translate = quantize_arcs(arcs, geojson_bbox(geojson_data), level.quantization)
+    dequantized = [np.round(grid * scale + translate, level.precision).tolist() for grid in quantized]
+
+    features = []
+    geometries = []
+    for feature, polygons in topo_features:
+        coordinates = []
+        kept_polygons = []
+        for polygon in polygons:
+            rings = [resolve_ring(ring, dequantized) for ring in polygon]
+            # Ring yang kolaps setelah penyederhanaan (kurang dari 3 titik unik) dibuang.
+            if len(rings[0]) < 4:
+                continue
+            coordinates.append([ring for ring in rings if len(ring) >= 4])
+            kept_polygons.append([ring for ring, resolved in zip(polygon, rings) if len(resolved) >= 4])
+        features.append({
+            'type': 'Feature',
+            'properties': feature.get('properties', {}),
+            'geometry': {'type': 'MultiPolygon', 'coordinates': coordinates},
+        })
+        geometries.append({
+            'type': 'MultiPolygon',
+            'arcs': kept_polygons,
+            'properties': feature.get('properties', {}),
+        })
+
+    deltas = []
+    for grid in quantized:
+        encoded = grid.copy()
+        encoded[1:] -= grid[:-1]
+        deltas.append(encoded.tolist())
+
+    topojson_data = {
+        'type': 'Topology',
+        'transform': {'scale': scale.tolist(), 'translate': translate.tolist()},
+        'objects': {'provinces': {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': deltas,
+    }
+    return {**geojson_data, 'features': features}, topojson_data
+
+
+def count_vertices(geojson_data):
+    return sum(
+        len(ring)
+        for feature in geojson_data['features']
+        for polygon in iter_polygons(feature['geometry'])
+        for ring in polygon
+    )
+
+
+def encode_json(data):
+    """Serialisasi ringkas seperti yang dikirim ke browser."""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def variant_dir(geometry_version, geometry_dir=None):
+    geometry_dir = Path(geometry_dir) if geometry_dir is not None else GEOMETRY_DIR
+    return geometry_dir / geometry_version[:16]
+
+
+def write_variant(path, data):
+    """Tulis artefak JSON secara atomik."""
+    payload = encode_json(data)
+    write_atomic(path, lambda file: file.write(payload))
+
+
+def build_variants(geojson_data, geometry_version, levels=None, geometry_dir=None):
+    """Tulis semua varian GeoJSON/TopoJSON ke direktori cache geometri."""
+    output_dir = variant_dir(geometry_version, geometry_dir)
+    written = {}
+    for name in levels or GEOMETRY_LEVELS:
+        simplified, topology = simplify_geojson(geojson_data, name)
+        write_variant(output_dir / f"{name}.geojson", simplified)
+        write_variant(output_dir / f"{name}.topojson", topology)
+        written[name] = output_dir
+    return written
+
+
+def load_variant(geojson_data, geometry_version, level, geometry_dir=None):
+    """
+    Memuat varian geometri dari cache, atau membangunnya jika belum ada.
+
+    Level `full` mengembalikan GeoJSON asli tanpa perubahan.
+    """
+    if level == FULL_LEVEL:
+        return geojson_data
+    if level not in GEOMETRY_LEVELS:
+        raise ValueError(f"Tingkat detail geometri tidak dikenal: {level}")
+
+    path = variant_dir(geometry_version, geometry_dir) / f"{level}.geojson"
+    try:
+        with path.open(encoding='utf-8') as file:
+            variant = json.load(file)
+        if len(variant.get('features', [])) == len(geojson_data['features']):
+            return variant
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    variant, topology = simplify_geojson(geojson_data, level)
+    try:
+        write_variant(path, variant)
+        write_variant(path.with_suffix('.topojson'), topology)
+    except OSError:
+        # Varian tetap dipakai dari memori jika direktori cache read-only.
+        pass
+    return variant
+
+
+def benchmark_variants(geojson_data):
+    """
+    Ukur biaya setiap varian: jumlah titik, byte mentah dan gzip, serta waktu build.
+
+    Waktu render di browser tidak diukur di sini; jumlah titik dan byte yang
+    dikirim adalah proksi utamanya.
+    """
+    results = []
+    full_bytes = encode_json(geojson_data)
+    results.append({
+        'level': FULL_LEVEL,
+        'vertices': count_vertices(geojson_data),
+        'geojson_bytes': len(full_bytes),
+        'geojson_gzip_bytes': len(gzip.compress(full_bytes)),
+        'topojson_bytes': None,
+        'topojson_gzip_bytes': None,
+        'build_seconds': 0.0,
+    })
+    for name in GEOMETRY_LEVELS:
+        started = time.perf_counter()
+        simplified, topology = simplify_geojson(geojson_data, name)
+        elapsed = time.perf_counter() - started
+        geojson_bytes = encode_json(simplified)
+        topojson_bytes = encode_json(topology)
+        results.append({
+            'level': name,
+            'vertices': count_vertices(simplified),
+            'geojson_bytes': len(geojson_bytes),
+            'geojson_gzip_bytes': len(gzip.compress(geojson_bytes)),
+            'topojson_bytes': len(topojson_bytes),
+            'topojson_gzip_bytes': len(gzip.compress(topojson_bytes)),
+            'build_seconds': round(elapsed, 4),
+        })
+    return results
+
+
+def main(argv=None):
+    from dashboard.snapshot import source_digest
+
+    parser = argparse.ArgumentParser(description="Bangun varian geometri provinsi yang disederhanakan.")
+    parser.add_argument('source', nargs='?', default=str(LOCAL_GEOJSON_PATH), help="GeoJSON sumber.")
+    parser.add_argument('--benchmark', action='store_true', help="Cetak ukuran setiap varian sebagai JSON.")
+    args = parser.parse_args(argv)
+
+    with Path(args.source).open(encoding='utf-8') as file:
+        geojson_data = json.load(file)
+
+    if args.benchmark:
+        print(json.dumps(benchmark_variants(geojson_data), indent=2))
+        return
+
+    output_dir = variant_dir(source_digest(args.source))
+    build_variants(geojson_data, source_digest(args.source))
+    print(f"Varian geometri berhasil disimpan di: {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
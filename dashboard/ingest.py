@@ -0,0 +1,203 @@
+"""
+Ingest streaming untuk ekspor CSV mentah BPS.
+
+Ekspor mentah memakai pemisah `;`, desimal koma, field ber-padding spasi
+(misalnya ` 71,15 `), baris kosong `;;;;` di akhir file, dan nama provinsi
+lama seperti `D I YOGYAKARTA`. File dibaca per blok byte dengan pembaca CSV
+streaming pyarrow lalu setiap kolom diurai dengan kernel `pyarrow.compute`
+yang tervektorisasi, sehingga memori hanya sebesar satu blok. Hasilnya
+memakai nama kolom dan satuan yang sama dengan `data/df_cleaned.csv`:
+
+    python -m dashboard.ingest "data/Klasifikasi Tingkat Kemiskinan di Indonesia.csv" --output data/df_cleaned.csv
+
+File CSV bersih (pemisah koma, desimal titik) juga bisa dibaca lewat jalur
+yang sama; pemisah kolom dideteksi dari baris header.
+
+Setiap blok divalidasi terhadap `DATA_SCHEMA` (lihat `dashboard.schema`) dalam
+pemindaian yang sama. Semua pelanggaran dari seluruh file dikumpulkan beserta
+nomor barisnya; error dilempar sekaligus setelah blok terakhir. Validasi saja,
+tanpa membangun tabel:
+
+    python -m dashboard.ingest data/df_cleaned.csv --validate
+"""
+from pathlib import Path
+import argparse
+import csv
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from dashboard.config import PROVINCE_ALIASES
+from dashboard.fsutil import write_atomic
+from dashboard.schema import DATA_SCHEMA, ValidationReport
+
+BLOCK_SIZE = 4 * 1024 * 1024
+INTEGER_COLUMNS = ['Klasifikasi Kemiskinan']
+
+
+def read_header(path):
+    """Nama kolom dan pemisah (`;` atau `,`) dari baris pertama file."""
+    with Path(path).open(encoding='utf-8-sig', newline='') as file:
+        header = file.readline()
+    delimiter = ';' if header.count(';') > header.count(',') else ','
+    return [name.strip() for name in next(csv.reader([header], delimiter=delimiter))], delimiter
+
+
+def is_raw_export(path):
+    """True jika file memakai format ekspor mentah BPS (pemisah `;`)."""
+    return read_header(path)[1] == ';'
+
+
+def normalize_provinces(values):
+    """Huruf besar, spasi dirapikan, dan alias nama provinsi diganti nama GeoJSON."""
+    values = pc.utf8_upper(pc.utf8_trim_whitespace(values))
+    values = pc.replace_substring_regex(values, r'\s+', ' ')
+    for alias, name in PROVINCE_ALIASES.items():
+        values = pc.if_else(pc.equal(values, alias), name, values)
+    return values
+
+
+def trim_batch(batch, first_row=0):
+    """
+    Kolom teks ter-trim tanpa baris kosong (`;;;;`) beserta nomor barisnya di file.
+
+    Header adalah baris 1, jadi baris data pertama bernomor 2.
+    """
+    values = {name: pc.utf8_trim_whitespace(batch.column(name)) for name in batch.schema.names}
+    non_empty = None
+    for column in values.values():
+        filled = pc.not_equal(column, '')
+        non_empty = filled if non_empty is None else pc.or_(non_empty, filled)
+
+    row_numbers = np.flatnonzero(non_empty.to_numpy(zero_copy_only=False)) + first_row + 2
+    columns = {}
+    for name, column in values.items():
+        column = pc.filter(column, non_empty)
+        columns[name] = normalize_provinces(column) if name == 'Provinsi' else column
+    return columns, row_numbers
+
+
+def clean_batch(batch, first_row=0, report=None):
+    """
+    Bersihkan satu batch teks mentah menjadi tabel bertipe; baris kosong dibuang.
+
+    Pelanggaran skema dicatat di `report`; sel yang tidak valid menjadi null.
+    """
+    report = report if report is not None else ValidationReport()
+    columns, row_numbers = trim_batch(batch, first_row)
+    columns = report.check_columns(columns, row_numbers)
+    for name in INTEGER_COLUMNS:
+        if name in columns and columns[name].null_count == 0:
+            columns[name] = pc.cast(columns[name], pa.int64())
+    return pa.table(columns)
+
+
+def open_reader(path, block_size=BLOCK_SIZE):
+    """Pembaca CSV streaming dengan semua kolom sebagai teks; mengembalikan (nama kolom, reader)."""
+    names, delimiter = read_header(path)
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_size, encoding='utf-8'),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    return names, reader
+
+
+def iter_tables(path, block_size=BLOCK_SIZE, report=None):
+    """
+    Baca file per blok byte dan hasilkan tabel Arrow yang sudah dibersihkan.
+
+    Error validasi dari seluruh file dilempar sebagai satu ValueError setelah
+    blok terakhir; peringatan tersedia di `report` jika diberikan.
+    """
+    report = report if report is not None else ValidationReport()
+    names, reader = open_reader(path, block_size)
+    report.check_header(names)
+    first_row = 0
+    for batch in reader:
+        if batch.num_rows:
+            table = clean_batch(batch, first_row, report)
+            first_row += batch.num_rows
+            if table.num_rows:
+                yield table
+    report.raise_for_errors()
+
+
+def validate_file(path, schema=DATA_SCHEMA, block_size=BLOCK_SIZE):
+    """Validasi file per blok tanpa membangun tabel; mengembalikan ValidationReport."""
+    report = ValidationReport(schema)
+    names, reader = open_reader(path, block_size)
+    report.check_header(names)
+    first_row = 0
+    for batch in reader:
+        if batch.num_rows:
+            columns, row_numbers = trim_batch(batch, first_row)
+            report.check_columns(columns, row_numbers)
+            first_row += batch.num_rows
+    return report
+
+
+def iter_frames(path, block_size=BLOCK_SIZE, report=None):
+    """Seperti `iter_tables`, tetapi menghasilkan DataFrame pandas."""
+    for table in iter_tables(path, block_size, report):
+        yield table.to_pandas()
+
+
+def read_source(path, block_size=BLOCK_SIZE, report=None):
+    """Baca CSV bersih atau ekspor mentah menjadi satu DataFrame dengan nama kolom mentah."""
+    tables = list(iter_tables(path, block_size, report))
+    if not tables:
+        raise ValueError(f"File tidak berisi baris data: {Path(path).name}")
+    return pa.concat_tables(tables, promote_options='permissive').to_pandas()
+
+
+def ingest_csv(source_path, output_path, block_size=BLOCK_SIZE):
+    """Tulis dataset bersih ke CSV per blok secara atomik; mengembalikan jumlah baris."""
+    rows = 0
+
+    def write(file):
+        nonlocal rows
+        writer = schema = None
+        for table in iter_tables(source_path, block_size):
+            if writer is None:
+                schema = table.schema
+                writer = pa_csv.CSVWriter(
+                    file, schema, write_options=pa_csv.WriteOptions(quoting_style='needed')
+                )
+            writer.write_table(table.cast(schema))
+            rows += table.num_rows
+        if writer is not None:
+            writer.close()
+
+    write_atomic(output_path, write)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest ekspor CSV mentah BPS menjadi CSV bersih.")
+    parser.add_argument('source', help="CSV mentah (pemisah `;`, desimal koma).")
+    parser.add_argument('--output', help="Lokasi CSV bersih.")
+    parser.add_argument('--validate', action='store_true', help="Hanya validasi file terhadap skema.")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help="Ukuran blok baca dalam byte.")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        report = validate_file(args.source, block_size=args.block_size)
+        print(report.summary() or f"{report.rows:,} baris valid.")
+        raise SystemExit(0 if report.ok else 1)
+    if not args.output:
+        parser.error("--output wajib diisi kecuali memakai --validate.")
+
+    rows = ingest_csv(args.source, args.output, args.block_size)
+    print(f"{rows:,} baris bersih disimpan di: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Lapisan pemuatan dataset dengan kunci cache dari sidik jari file.
+
+Jalur cache hit hanya melakukan `os.stat` pada file sumber lalu mencari kunci
+di dict; data tidak pernah di-hash. Pada cache miss, frame dimuat dari data
+store bersama, snapshot Arrow, atau CSV lewat `dashboard.ingest` (urutan dari yang termurah), lalu
+dipublikasikan kembali ke data store untuk worker lain.
+
+Saat file sumber berubah, agregat provinsi diperbarui secara inkremental dari
+versi sebelumnya (lihat `dashboard.aggregation`): hanya provinsi yang barisnya
+berubah yang dihitung ulang.
+
+`load_partitions` memuat pilihan tahun/provinsi/kolom dari `PartitionStore`;
+kunci cache-nya adalah versi hasil pemangkasan manifest, jadi hanya partisi
+dan kolom yang cocok yang pernah dibaca.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+import time
+
+import pandas as pd
+
+from dashboard import ingest, snapshot, tracing
+from dashboard.aggregation import ProvinceAggregator
+from dashboard.config import DATA_YEAR, PIPELINE_VERSION
+from dashboard.data_store import DataStore
+from dashboard.fingerprint import fingerprint
+from dashboard.pipeline import clean_dataframe
+from dashboard.schema import ValidationReport
+
+
+@dataclass(frozen=True)
+class LoadedDataset:
+    """Frame terproses (read-only) beserta versinya dan laporan validasi CSV (jika dibaca dari CSV)."""
+
+    version: str
+    df_processed: pd.DataFrame
+    df_provinsi: pd.DataFrame
+    aggregator: ProvinceAggregator = None
+    validation: ValidationReport = None
+
+
+def dataset_version(source_digest, pipeline_version=PIPELINE_VERSION):
+    """Versi dataset terproses: hash isi CSV sumber ditambah versi pipeline."""
+    return f"{source_digest}:{pipeline_version}"
+
+
+class DatasetLoader:
+    """Memuat dataset terproses dengan cache per sidik jari file sumber."""
+
+    def __init__(self, store=None, pipeline_version=PIPELINE_VERSION):
+        self.store = store if store is not None else DataStore()
+        self.pipeline_version = pipeline_version
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.compute_seconds = 0.0
+        self.incremental_updates = 0
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def load(self, data_path):
+        """Kembalikan LoadedDataset untuk file sumber; hanya dihitung jika file berubah."""
+        source = fingerprint(data_path)
+        key = source.cache_key(self.pipeline_version)
+        return self._load(source.path, key, lambda previous: self._compute(Path(data_path), previous))
+
+    def load_partitions(self, store, years=None, provinces=None, columns=None):
+        """
+        LoadedDataset dari partisi `store` yang cocok dengan pilihan tahun/provinsi/kolom.
+
+        Hanya manifest yang dibaca pada cache hit; pada cache miss hanya partisi
+        dan kolom terpilih yang dibaca dari Parquet.
+        """
+        selection = store.select(years, provinces, columns)
+        entry = ('partitions', str(store.root), selection.years, selection.provinces, selection.columns)
+        return self._load(
+            entry, selection.version, lambda previous: self._compute_selection(store, selection, previous)
+        )
+
+    def _load(self, entry, key, compute):
+        dataset = self._lookup(entry, key)
+        if dataset is not None:
+            tracing.annotate(cache='hit')
+            return dataset
+
+        with self._key_lock(entry):
+            dataset = self._lookup(entry, key)
+            if dataset is not None:
+                tracing.annotate(cache='hit')
+                return dataset
+            tracing.annotate(cache='miss')
+
+            with self._lock:
+                _, previous = self._datasets.get(entry, (None, None))
+            started = time.perf_counter()
+            dataset = compute(previous)
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                # Satu entri per sumber (file atau pilihan partisi); versi lama langsung tergantikan.
+                self._datasets[entry] = (key, dataset)
+                self.misses += 1
+                self.compute_seconds += elapsed
+        return dataset
+
+    def _lookup(self, path, key):
+        with self._lock:
+            cached_key, dataset = self._datasets.get(path, (None, None))
+            if cached_key == key:
+                self.hits += 1
+                return dataset
+        return None
+
+    def _aggregate(self, df_processed, previous):
+        """Agregator provinsi, diperbarui dari versi sebelumnya jika ada."""
+        if previous is not None and previous.aggregator is not None:
+            try:
+                aggregator, _ = previous.aggregator.update(df_processed)
+            except (KeyError, ValueError):
+                # Kunci kab/kota ganda atau kolom berubah: hitung ulang penuh.
+                pass
+            else:
+                with self._lock:
+                    self.incremental_updates += 1
+                return aggregator
+        return ProvinceAggregator.from_frame(df_processed)
+
+    def _compute(self, data_path, previous=None):
+        source_digest = fingerprint(data_path, with_digest=True).digest
+        version = dataset_version(source_digest, self.pipeline_version)
+
+        df_processed = self.store.attach_frame('processed', version)
+        df_provinsi = self.store.attach_frame('provinsi', version)
+        if df_processed is not None and df_provinsi is not None:
+            return LoadedDataset(version, df_processed, df_provinsi, self._aggregate(df_processed, previous))
+
+        # Snapshot Arrow dipakai jika hash CSV sumber masih cocok.
+        df_processed = snapshot.load_snapshot(data_path, source_sha256=source_digest)
+        validation = None
+        if df_processed is None:
+            # Validasi skema berjalan di pemindaian yang sama; error dilempar, peringatan disimpan.
+            validation = ValidationReport()
+            df_processed = clean_dataframe(ingest.read_source(data_path, report=validation))
+            try:
+                snapshot.write_snapshot(
+                    df_processed, snapshot.snapshot_path_for(data_path), source_digest, data_path.name
+                )
+            except OSError:
+                # Snapshot hanya optimasi; direktori cache yang read-only tidak boleh menggagalkan halaman.
+                pass
+
+        aggregator = self._aggregate(df_processed, previous)
+        frames = {'processed': df_processed, 'provinsi': aggregator.means()}
+        df_processed, df_provinsi = self._publish(version, frames)
+        # Agregator merujuk frame memory-map bersama, bukan salinan privat hasil baca.
+        return LoadedDataset(version, df_processed, df_provinsi, aggregator.with_frame(df_processed), validation)
+
+    def _compute_selection(self, store, selection, previous=None):
+        version = f"{selection.version}:{self.pipeline_version}"
+        df_processed = self.store.attach_frame('processed', version)
+        if df_processed is None:
+            with tracing.span('read_partitions') as span:
+                df_processed = store.read(selection)
+                if span.enabled:
+                    span.bytes = int(df_processed.memory_usage(deep=True).sum())
+        aggregator = self._aggregate(df_processed, previous)
+        frames = {'processed': df_processed, 'provinsi': aggregator.means()}
+        df_processed, df_provinsi = self._publish(version, frames)
+        # Agregator merujuk frame memory-map bersama, bukan salinan privat hasil baca.
+        return LoadedDataset(version, df_processed, df_provinsi, aggregator.with_frame(df_processed))
+
+    def _publish(self, version, frames):
+        """Publikasikan frame ke data store lalu attach ulang versi memory-map-nya."""
+        try:
+            for name, df in frames.items():
+                self.store.publish_frame(name, version, df)
+        except OSError:
+            # Data store hanya optimasi; tetap pakai frame di memori jika gagal menulis.
+            return tuple(frames.values())
+
+        attached = tuple(self.store.attach_frame(name, version) for name in frames)
+        return attached if all(df is not None for df in attached) else tuple(frames.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'compute_seconds': round(self.compute_seconds, 6),
+                'incremental_updates': self.incremental_updates,
+                'entries': len(self._datasets),
+            }
+
+
+def available_years(store, data_path, data_year=DATA_YEAR):
+    """Tahun yang bisa dipilih: isi manifest ditambah tahun `DATA_PATH` (disinkronkan saat dimuat)."""
+    years = set(store.years())
+    if Path(data_path).exists():
+        years.add(data_year)
+    return sorted(years)
+
+
+def resolve_year(store, data_path, year=None, data_year=DATA_YEAR):
+    """Tahun yang dipilih, atau tahun terbaru yang tersedia."""
+    if year is not None:
+        return year
+    years = available_years(store, data_path, data_year)
+    return years[-1] if years else data_year
+
+
+def load_year(data_path, year, dataset_loader, store, data_year=DATA_YEAR):
+    """
+    Dataset satu tahun dari penyimpanan partisi.
+
+    `DATA_PATH` disinkronkan dulu sebagai tahun `DATA_YEAR`; hanya partisi tahun
+    yang dipilih yang dibaca. Jika direktori partisi tidak bisa ditulis,
+    `DATA_PATH` dimuat langsung seperti sebelum ada penyimpanan partisi.
+    """
+    data_path = Path(data_path)
+    year = resolve_year(store, data_path, year, data_year)
+    if data_path.exists():
+        try:
+            store.sync_source(data_path, data_year)
+        except OSError:
+            if year == data_year:
+                return dataset_loader.load(data_path)
+    if year not in store.years():
+        raise FileNotFoundError(data_path if year == data_year else f"Data tahun {year} tidak tersedia.")
+    return dataset_loader.load_partitions(store, years=(year,))
@@ -0,0 +1,499 @@
+"""
+Uji beban sesi bersamaan terhadap server Streamlit sungguhan.
+
+Harness menjalankan `streamlit run app.py` headless (log trace JSON aktif) di
+proses terpisah, lalu membuka N sesi websocket yang berbicara protokol yang
+sama dengan browser (BackMsg/ForwardMsg protobuf). Setiap sesi menjalankan
+`SCENARIO`: membuka peta, mengubah agregasi dan layer prediksi, pindah ke
+EDA, memilih indikator, memfilter provinsi, kembali ke peta, lalu mereset
+filter. Sebelum sesi bersamaan, satu sesi pemanasan menjalankan skenario
+sekali sehingga biaya cold start dilaporkan terpisah.
+
+Laporan JSON per jumlah sesi:
+
+- latensi rerun di sisi klien (kirim rerun sampai `script_finished`) dan di
+  sisi server (`total_ms` trace), p50/p95/p99, total dan per langkah;
+- byte payload websocket yang diterima (sebelum kompresi websocket; tile,
+  media, dan file komponen yang diambil lewat HTTP tidak termasuk);
+- RSS proses server: idle, setelah sesi pemanasan, saat semua sesi masih
+  terbuka, puncak, dan tambahan RSS per sesi;
+- hit rate cache per span dari log trace server.
+
+    python -m dashboard.loadtest --sessions 1 4 8 16 --iterations 3
+    python -m dashboard.loadtest --sessions 8 --compare .cache/loadtests/baseline.json
+
+Variabel lingkungan `POVERTY_DASHBOARD_*` diteruskan ke server.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from dashboard.benchmark import git_commit
+from dashboard.config import BASE_DIR, CACHE_DIR
+
+LOADTEST_DIR = CACHE_DIR / 'loadtests'
+APP_PATH = BASE_DIR / 'app.py'
+DEFAULT_SESSIONS = [1, 4, 8]
+PERCENTILES = (50, 95, 99)
+SERVER_START_TIMEOUT = 60
+RSS_SAMPLE_SECONDS = 0.25
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    Satu interaksi pengguna.
+
+    `target` adalah key atau label widget (None = rerun tanpa perubahan);
+    `value` berupa nilai langsung atau `callable(options, rng)`.
+    """
+
+    name: str
+    target: str = None
+    value: object = None
+
+
+SCENARIO = (
+    Step('peta'),
+    Step('peta:agregasi', 'Agregasi provinsi', lambda options, rng: options[-1]),
+    Step('peta:prediksi', 'Tampilkan layer prediksi model', True),
+    Step('eda', 'Pilih Halaman:', 'Analisis Data Eksplorasi'),
+    Step('eda:indikator', 'province_statistics_column', lambda options, rng: rng.choice(options)),
+    Step('eda:filter', 'filter_provinces', lambda options, rng: sorted(rng.sample(options, 3))),
+    Step('peta:filter', 'Pilih Halaman:', 'Visualisasi Peta'),
+    Step('peta:reset', 'filter_provinces', []),
+)
+
+
+def percentiles(values):
+    """p50/p95/p99, rata-rata, dan maksimum (dibulatkan), atau None untuk daftar kosong."""
+    if not values:
+        return None
+    values = np.asarray(values, dtype=float)
+    summary = {f'p{q}': round(float(np.percentile(values, q)), 1) for q in PERCENTILES}
+    summary.update(mean=round(float(values.mean()), 1), max=round(float(values.max()), 1), count=len(values))
+    return summary
+
+
+def widget_key(widget_id):
+    """Key widget dari ID `$$ID-<hash>-<key>`, atau None untuk widget tanpa key."""
+    key = widget_id.split('-', 2)[-1]
+    return None if key == 'None' else key
+
+
+def widget_state(element_type, widget_id, value):
+    """WidgetState protobuf untuk nilai baru satu widget."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    state = WidgetState(id=widget_id)
+    if element_type == 'checkbox':
+        state.bool_value = bool(value)
+    elif element_type in ('radio', 'selectbox'):
+        state.string_value = str(value)
+    elif element_type == 'multiselect':
+        state.string_array_value.data.extend(str(item) for item in value)
+    else:
+        raise ValueError(f"Tipe widget tidak didukung: {element_type}")
+    return state
+
+
+def rss_mb(pid):
+    """RSS saat ini proses `pid` (MB) dari /proc, atau None jika tidak tersedia."""
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+class Session:
+    """Satu sesi browser tiruan: widget dari rerun terakhir dan nilai yang sudah diubah."""
+
+    def __init__(self, websocket, rng, timeout):
+        self.websocket = websocket
+        self.rng = rng
+        self.timeout = timeout
+        self.widgets = {}
+        self.values = {}
+        self.records = []
+        self.errors = []
+
+    def find(self, target):
+        for widget_id, (element_type, widget) in self.widgets.items():
+            if widget_key(widget_id) == target or widget.label == target:
+                return widget_id, element_type, widget
+        return None
+
+    async def run_step(self, step):
+        """Terapkan satu langkah lalu tunggu rerun selesai; hasilnya dicatat di `records`."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        if step.target is not None:
+            found = self.find(step.target)
+            if found is None:
+                self.errors.append(f"{step.name}: widget {step.target!r} tidak ditemukan")
+            else:
+                widget_id, element_type, widget = found
+                value = step.value
+                if callable(value):
+                    value = value(list(getattr(widget, 'options', [])), self.rng)
+                self.values[widget_id] = widget_state(element_type, widget_id, value)
+
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.page_script_hash = ''
+        message.rerun_script.widget_states.widgets.extend(self.values.values())
+        started = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        received = await asyncio.wait_for(self.receive_run(), self.timeout)
+        self.records.append({
+            'step': step.name,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'bytes': received,
+        })
+
+    async def receive_run(self):
+        """Baca ForwardMsg sampai script selesai; kembalikan jumlah byte payload."""
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        widgets, received = {}, 0
+        while True:
+            payload = await self.websocket.recv()
+            received += len(payload)
+            message = ForwardMsg()
+            message.ParseFromString(payload)
+            kind = message.WhichOneof('type')
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    self.errors.append(element.exception.message)
+                elif element_type is not None:
+                    widget = getattr(element, element_type)
+                    if getattr(widget, 'id', '').startswith('$$ID'):
+                        widgets[widget.id] = (element_type, widget)
+            elif kind == 'script_finished' and (
+                message.script_finished != ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+            ):
+                break
+        # Seperti frontend: nilai widget yang tidak dirender lagi dibuang.
+        self.widgets = widgets
+        self.values = {widget_id: state for widget_id, state in self.values.items() if widget_id in widgets}
+        return received
+
+
+class ServerProcess:
+    """`streamlit run app.py` headless di port bebas, dengan log trace JSON ke file."""
+
+    def __init__(self, app_path=APP_PATH, env=None):
+        self.app_path = Path(app_path)
+        self.env = env
+        self.port = None
+        self.process = None
+        self._log_dir = None
+        self.log_path = None
+
+    def __enter__(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self._log_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self._log_dir.name) / 'server.log'
+        env = {**os.environ, **(self.env or {}), 'POVERTY_DASHBOARD_TRACE_LOG': '1'}
+        with self.log_path.open('wb') as log:
+            self.process = subprocess.Popen(
+                [
+                    sys.executable, '-m', 'streamlit', 'run', str(self.app_path),
+                    '--server.headless', 'true',
+                    '--server.address', '127.0.0.1',
+                    '--server.port', str(self.port),
+                    '--server.fileWatcherType', 'none',
+                    '--browser.gatherUsageStats', 'false',
+                ],
+                cwd=self.app_path.parent, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server Streamlit berhenti saat start:\n{self.log_path.read_text()[-2000:]}")
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/_stcore/health', timeout=1):
+                    return self
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Server Streamlit tidak siap dalam batas waktu.")
+
+    def __exit__(self, *exc_info):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._log_dir is not None:
+            self._log_dir.cleanup()
+        return False
+
+    @property
+    def url(self):
+        return f'ws://127.0.0.1:{self.port}/_stcore/stream'
+
+    def rss_mb(self):
+        return rss_mb(self.process.pid)
+
+    def log_offset(self):
+        return self.log_path.stat().st_size
+
+    def events(self, offset=0):
+        """Event JSON (rerun/startup) dari log server mulai `offset` byte."""
+        with self.log_path.open('rb') as file:
+            file.seek(offset)
+            lines = file.read().decode('utf-8', errors='replace').splitlines()
+        events = []
+        for line in lines:
+            if line.startswith('{'):
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+        return events
+
+
+def cache_rates(traces):
+    """Jumlah status cache per span dan hit rate (`hit` dibanding semua span berstatus cache)."""
+    spans = {}
+    for trace in traces:
+        for span in trace['spans']:
+            if span.get('cache'):
+                counts = spans.setdefault(span['name'], {})
+                counts[span['cache']] = counts.get(span['cache'], 0) + 1
+    total = sum(sum(counts.values()) for counts in spans.values())
+    hits = sum(counts.get('hit', 0) for counts in spans.values())
+    for counts in spans.values():
+        counts['hit_rate'] = round(counts.get('hit', 0) / sum(counts.values()), 3)
+    return {'hit_rate': round(hits / total, 3) if total else None, 'spans': spans}
+
+
+def summarize(records):
+    """Ringkasan latensi dan byte dari catatan rerun, total dan per langkah."""
+    steps = {}
+    for record in records:
+        steps.setdefault(record['step'], []).append(record)
+    return {
+        'latency_ms': percentiles([record['latency_ms'] for record in records]),
+        'bytes': {
+            'total': sum(record['bytes'] for record in records),
+            'per_rerun': round(sum(record['bytes'] for record in records) / len(records)) if records else None,
+        },
+        'steps': {
+            name: {
+                **percentiles([record['latency_ms'] for record in items]),
+                'bytes_mean': round(sum(record['bytes'] for record in items) / len(items)),
+            }
+            for name, items in steps.items()
+        },
+    }
+
+
+async def run_session(url, scenario, iterations, rng, think, timeout, done=None, release=None):
+    """Jalankan skenario `iterations` kali dalam satu koneksi; websocket ditutup setelah `release`."""
+    try:
+        import websockets
+    except ImportError as exc:
+        raise ImportError("Uji beban membutuhkan paket websockets (pip install websockets).") from exc
+
+    async with websockets.connect(url, subprotocols=['streamlit'], max_size=None) as websocket:
+        session = Session(websocket, rng, timeout)
+        try:
+            for _ in range(iterations):
+                for step in scenario:
+                    await session.run_step(step)
+                    if think:
+                        await asyncio.sleep(think)
+        except (asyncio.TimeoutError, websockets.ConnectionClosed) as e:
+            session.errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            if done is not None:
+                done.set_result(None)
+        if release is not None:
+            await release.wait()
+    return session
+
+
+async def sample_rss(server, samples, stop):
+    while not stop.is_set():
+        rss = server.rss_mb()
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(server, sessions, scenario, iterations, think, seed, timeout):
+    """Satu sesi pemanasan lalu `sessions` sesi bersamaan pada server yang sama."""
+    rss_idle = server.rss_mb()
+    offset = server.log_offset()
+    cold = await run_session(server.url, scenario, 1, random.Random(seed), 0, timeout)
+    rss_after_first = server.rss_mb()
+    cold_traces = [event for event in server.events(offset) if event.get('event') == 'rerun']
+
+    offset = server.log_offset()
+    loop = asyncio.get_running_loop()
+    release, stop, samples = asyncio.Event(), asyncio.Event(), []
+    done = [loop.create_future() for _ in range(sessions)]
+    sampler = asyncio.create_task(sample_rss(server, samples, stop))
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(run_session(
+            server.url, scenario, iterations, random.Random(seed + index + 1), think, timeout, done[index], release
+        ))
+        for index in range(sessions)
+    ]
+    await asyncio.gather(*done)
+    elapsed = time.perf_counter() - started
+    # RSS diukur selagi semua sesi masih terbuka, sebelum state sesi dibebaskan.
+    rss_live = server.rss_mb()
+    release.set()
+    results = await asyncio.gather(*tasks)
+    stop.set()
+    await sampler
+
+    # Log trace ditulis setelah rerun selesai; beri waktu sebentar agar ter-flush.
+    await asyncio.sleep(0.2)
+    events = server.events(offset)
+    traces = [event for event in events if event.get('event') == 'rerun']
+    records = [record for session in results for record in session.records]
+    summary = summarize(records)
+    per_session = None
+    if rss_live is not None and rss_after_first is not None:
+        per_session = round((rss_live - rss_after_first) / sessions, 2)
+    return {
+        'sessions': sessions,
+        'iterations': iterations,
+        'reruns': len(records),
+        'elapsed_seconds': round(elapsed, 3),
+        'reruns_per_second': round(len(records) / elapsed, 2) if elapsed else None,
+        **summary,
+        'bytes': {**summary['bytes'], 'per_session': round(summary['bytes']['total'] / sessions)},
+        'server_ms': percentiles([trace['total_ms'] for trace in traces]),
+        'cache': cache_rates(traces),
+        'rss_mb': {
+            'idle': rss_idle,
+            'after_first_session': rss_after_first,
+            'live': rss_live,
+            'peak': max(samples) if samples else None,
+            'per_session': per_session,
+        },
+        'cold': {
+            'latency_ms': {record['step']: record['latency_ms'] for record in cold.records},
+            'bytes': sum(record['bytes'] for record in cold.records),
+            'server_ms': percentiles([trace['total_ms'] for trace in cold_traces]),
+            'cache': cache_rates(cold_traces),
+        },
+        'errors': sorted({error for session in (cold, *results) for error in session.errors}),
+    }
+
+
+def run_loadtest(sessions=DEFAULT_SESSIONS, iterations=3, think=0.0, seed=0, timeout=120,
+                 app_path=APP_PATH, scenario=SCENARIO):
+    """Jalankan setiap jumlah sesi pada server baru; hasilnya siap ditulis sebagai JSON."""
+    import streamlit
+
+    results = []
+    startup = None
+    for count in sessions:
+        with ServerProcess(app_path) as server:
+            result = asyncio.run(run_level(server, count, scenario, iterations, think, seed, timeout))
+            startup = startup or next((event for event in server.events() if event.get('event') == 'startup'), None)
+        results.append(result)
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'streamlit': streamlit.__version__,
+            'iterations': iterations,
+            'think_seconds': think,
+            'seed': seed,
+            'scenario': [step.name for step in scenario],
+            'startup': startup,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """Rasio latensi dan RSS per sesi terhadap baseline per jumlah sesi; >1 berarti lebih buruk."""
+    previous = {item['sessions']: item for item in baseline['results']}
+    comparison = []
+    for item in current['results']:
+        base = previous.get(item['sessions'])
+        row = {'sessions': item['sessions']}
+        metrics = [(f'p{q}', lambda result, q=q: (result['latency_ms'] or {}).get(f'p{q}')) for q in PERCENTILES]
+        metrics.append(('rss_per_session', lambda result: result['rss_mb']['per_session']))
+        metrics.append(('bytes_per_rerun', lambda result: result['bytes']['per_rerun']))
+        for name, value in metrics:
+            now, before = value(item), value(base) if base else None
+            row[name] = now
+            row[f'{name}_ratio'] = round(now / before, 3) if now is not None and before else None
+        comparison.append(row)
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban sesi Streamlit bersamaan terhadap app.py.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS,
+                        help="Jumlah sesi bersamaan; setiap nilai memakai server baru.")
+    parser.add_argument('--iterations', type=int, default=3, help="Pengulangan skenario per sesi.")
+    parser.add_argument('--think', type=float, default=0.0, help="Jeda antarlangkah per sesi (detik).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed pilihan acak widget.")
+    parser.add_argument('--timeout', type=float, default=120, help="Batas waktu satu rerun (detik).")
+    parser.add_argument('--output', default=None, help="Lokasi file JSON hasil.")
+    parser.add_argument('--compare', default=None, help="File JSON baseline untuk dibandingkan.")
+    args = parser.parse_args(argv)
+
+    report = run_loadtest(args.sessions, args.iterations, args.think, args.seed, args.timeout)
+    output = Path(args.output) if args.output else (
+        LOADTEST_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    for result in report['results']:
+        latency = result['latency_ms'] or {}
+        print(
+            f"{result['sessions']} sesi: p50 {latency.get('p50')} ms, p95 {latency.get('p95')} ms, "
+            f"p99 {latency.get('p99')} ms, {result['reruns_per_second']} rerun/detik, "
+            f"RSS {result['rss_mb']['live']} MB ({result['rss_mb']['per_session']} MB/sesi), "
+            f"hit rate cache {result['cache']['hit_rate']}, {len(result['errors'])} error"
+        )
+    print(f"Hasil uji beban disimpan di: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        print(json.dumps(compare(report, baseline), indent=2))
+
+
+if __name__ == '__main__':
+    main()
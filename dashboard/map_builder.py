@@ -0,0 +1,526 @@
+"""
+Pembuat peta Folium satu layer untuk halaman peta.
+
+Sebelumnya peta memakai `folium.Choropleth` ditambah layer `GeoJson`
+transparan berisi geometri yang sama hanya untuk tooltip dan popup, sehingga
+geometri terserialisasi dua kali. Di sini pewarnaan choropleth (bin histogram
+dan palet ColorBrewer yang sama dengan Folium) dihitung di Python dan
+dipasang sebagai `style_function` pada satu layer `GeoJson` yang juga
+membawa tooltip dan popup.
+
+`create_tiled_map` memakai vector tile dari `dashboard.tiles`: warna isi dan
+teks popup sudah tertanam di tile, sehingga HTML peta hanya berisi URL tile
+dan fungsi style kecil.
+
+Kedua peta memuat pemilih indikator (`IndicatorSwitcher`). Bin dan warna
+setiap indikator dihitung di server lalu dikirim sekali sebagai tabel kecil
+per feature (`indicator_styles`); mengganti indikator hanya mengubah style
+layer yang sudah ada di browser, tanpa rerun dan tanpa mengirim ulang geometri.
+"""
+import json
+
+import folium
+import numpy as np
+from branca.colormap import StepColormap
+from branca.element import MacroElement
+from branca.utilities import color_brewer
+from folium.plugins import VectorGridProtobuf
+from folium.template import Template
+
+from dashboard import tiles
+from dashboard.config import MAP_CENTER, MAP_ZOOM_START
+from dashboard.province_cube import PROPERTY_FORMATS
+
+MAP_COLUMN = 'Persentase Kemiskinan (P0)'
+LEGEND_NAME = 'Persentase Penduduk Miskin (%)'
+FILL_COLOR = 'YlOrRd'
+FILL_OPACITY = 0.7
+NAN_FILL_COLOR = 'lightgray'
+LINE_COLOR = 'black'
+LINE_OPACITY = 0.5
+LINE_WEIGHT = 1
+BINS = 6
+DISTRICT_LEGEND_NAME = 'Persentase Penduduk Miskin Kab/Kota (%)'
+PREDICTION_LEGEND_NAME = 'Kabupaten/Kota Diprediksi Miskin (%)'
+PREDICTION_FILL_COLOR = 'PuRd'
+NO_DATA_LABEL = 'Data Tidak Tersedia'
+
+TOOLTIP_FIELDS = ['name', 'PENDUDUK_MISKIN']
+TOOLTIP_ALIASES = ['Provinsi:', 'Penduduk Miskin:']
+INDICATOR_PROPERTY = 'INDIKATOR'
+INDICATOR_VALUE_PROPERTY = 'NILAI_INDIKATOR'
+INDICATOR_TOOLTIP_FIELDS = ['name', INDICATOR_PROPERTY, INDICATOR_VALUE_PROPERTY]
+INDICATOR_TOOLTIP_ALIASES = ['Provinsi:', 'Indikator:', 'Nilai:']
+POPUP_FIELDS = [
+    'name', 'IPM_DISPLAY', 'PENDUDUK_MISKIN', 'LAMA_SEKOLAH',
+    'PENGELUARAN_KAPITA', 'UMUR_HARAPAN_HIDUP', 'SANITASI_LAYAK',
+    'AIR_MINUM_LAYAK', 'PENGANGGURAN', 'ANGKATAN_KERJA', 'PDRB'
+]
+POPUP_ALIASES = [
+    'Provinsi:', 'IPM:', 'Penduduk Miskin:', 'Lama Sekolah:',
+    'Pengeluaran per Kapita:', 'Harapan Hidup:', 'Sanitasi Layak:',
+    'Air Minum Layak:', 'Pengangguran:', 'Partisipasi Angkatan Kerja:', 'PDRB:'
+]
+
+
+def choropleth_scale(values, fill_color=FILL_COLOR, bins=BINS, caption=LEGEND_NAME):
+    """
+    Hitung legenda dan fungsi warna dengan aturan yang sama seperti `folium.Choropleth`.
+
+    Mengembalikan (colormap, color_for) dengan `color_for(value)` memberi warna
+    isi untuk satu nilai, atau None jika nilai kosong.
+    """
+    real_values = np.asarray(values, dtype=float)
+    real_values = real_values[~np.isnan(real_values)]
+    _, bin_edges = np.histogram(real_values, bins=bins)
+
+    color_range = color_brewer(fill_color, n=len(bin_edges) - 1)
+    colormap = StepColormap(
+        color_range,
+        index=list(bin_edges),
+        vmin=min(bin_edges),
+        vmax=max(bin_edges),
+        caption=caption,
+    )
+
+    # Sisi kanan bin terakhir dibuat inklusif, sama seperti Folium.
+    digitize_edges = bin_edges.astype(float)
+    digitize_edges[-1] = np.nextafter(digitize_edges[-1], np.inf)
+
+    def color_for(value):
+        if value is None or np.isnan(value):
+            return None
+        return color_range[np.digitize(value, digitize_edges, right=False) - 1]
+
+    return colormap, color_for
+
+
+def feature_fill_colors(df_provinsi, geojson_data, column=MAP_COLUMN, fill_color=FILL_COLOR, caption=LEGEND_NAME):
+    """Warna isi setiap feature, dengan kunci `properties.name` seperti Choropleth."""
+    color_data = df_provinsi.set_index('Provinsi')[column].to_dict()
+    colormap, color_for = choropleth_scale(list(color_data.values()), fill_color=fill_color, caption=caption)
+    colors = {}
+    for feature in geojson_data['features']:
+        name = feature['properties'].get('name')
+        colors[name] = color_for(color_data.get(name, np.nan)) or NAN_FILL_COLOR
+    return colormap, colors
+
+
+def indicator_styles(df_provinsi, geojson_data, formats=PROPERTY_FORMATS):
+    """
+    Warna isi, label nilai, dan legenda setiap indikator untuk semua feature.
+
+    Nama feature dikirim sekali di `names`; setiap indikator hanya membawa
+    array warna dan label yang sejajar dengan `names`. Indikator peta utama
+    (`MAP_COLUMN`) selalu berada di urutan pertama sebagai tampilan awal.
+    """
+    names = [feature['properties'].get('name') for feature in geojson_data['features']]
+    values = df_provinsi.set_index('Provinsi')
+    formats = sorted(formats, key=lambda item: item[1] != MAP_COLUMN)
+    indicators = []
+    for _, column, template in formats:
+        if column not in values.columns:
+            continue
+        caption = LEGEND_NAME if column == MAP_COLUMN else column
+        colormap, colors = feature_fill_colors(df_provinsi, geojson_data, column, caption=caption)
+        column_values = values[column].to_dict()
+        labels = []
+        for name in names:
+            value = column_values.get(name)
+            labels.append(NO_DATA_LABEL if value is None or np.isnan(value) else template.format(value))
+        edges = colormap.index
+        bin_colors = color_brewer(FILL_COLOR, n=len(edges) - 1)
+        indicators.append({
+            'column': column,
+            'caption': caption,
+            'colors': [colors[name] for name in names],
+            'labels': labels,
+            'legend': [
+                [color, f"{low:,.2f} \u2013 {high:,.2f}"]
+                for color, low, high in zip(bin_colors, edges[:-1], edges[1:])
+            ],
+        })
+    return {'names': names, 'indicators': indicators}
+
+
+def with_indicator_properties(geojson_data, styles):
+    """Salinan dangkal GeoJSON dengan properti tooltip indikator awal; geometri tidak disalin."""
+    first = styles['indicators'][0] if styles['indicators'] else None
+    features = []
+    for idx, feature in enumerate(geojson_data['features']):
+        properties = dict(feature.get('properties', {}))
+        properties[INDICATOR_PROPERTY] = first['column'] if first else ''
+        properties[INDICATOR_VALUE_PROPERTY] = first['labels'][idx] if first else NO_DATA_LABEL
+        features.append({**feature, 'properties': properties})
+    return {**geojson_data, 'features': features}
+
+
+class IndicatorSwitcher(MacroElement):
+    """
+    Kontrol Leaflet untuk mengganti indikator choropleth di browser.
+
+    Tabel `styles` dari `indicator_styles` disematkan sekali; pergantian
+    indikator hanya memanggil `setStyle` (GeoJSON) atau `setFeatureStyle`
+    (vector tile) pada layer yang sudah ada dan memperbarui legenda.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            var map = {{ this._parent.get_name() }};
+            var layer = {{ this.layer.get_name() }};
+            var styles = {{ this.styles|tojson }};
+            var tiled = {{ this.tiled|tojson }};
+            var index = {};
+            styles.names.forEach(function(name, i) { index[name] = i; });
+            var current = styles.indicators[0];
+
+            function fillColor(name) {
+                var i = index[name];
+                return (i === undefined ? null : current.colors[i]) || {{ this.nan_color|tojson }};
+            }
+            function label(name) {
+                var i = index[name];
+                return i === undefined ? {{ this.no_data|tojson }} : current.labels[i];
+            }
+
+            if (tiled) {
+                var provinceStyle = layer.options.vectorTileLayerStyles[{{ this.province_layer|tojson }}];
+                // ID feature diberi awalan layer sehingga kab/kota bernama sama tidak ikut diwarnai.
+                var restyle = function() {
+                    var zoom = map.getZoom();
+                    styles.names.forEach(function(name) {
+                        layer.setFeatureStyle(
+                            {{ this.province_layer|tojson }} + ':' + name, provinceStyle({fill: fillColor(name)}, zoom)
+                        );
+                    });
+                };
+                map.on('zoomend', restyle);
+            } else {
+                // resetStyle (setelah highlight) memakai options.style, jadi warna indikator ikut dipertahankan.
+                var baseStyle = layer.options.style;
+                layer.options.style = function(feature) {
+                    return Object.assign({}, baseStyle(feature), {fillColor: fillColor(feature.properties.name)});
+                };
+                var restyle = function() {
+                    layer.eachLayer(function(feature) {
+                        var properties = feature.feature.properties;
+                        properties[{{ this.name_property|tojson }}] = current.column;
+                        properties[{{ this.value_property|tojson }}] = label(properties.name);
+                    });
+                    layer.setStyle(layer.options.style);
+                };
+            }
+
+            function renderLegend(element) {
+                element.innerHTML = '';
+                var caption = L.DomUtil.create('div', '', element);
+                caption.textContent = current.caption;
+                caption.style.cssText = 'font-weight: bold; margin: 4px 0;';
+                current.legend.forEach(function(item) {
+                    var row = L.DomUtil.create('div', '', element);
+                    var swatch = L.DomUtil.create('span', '', row);
+                    swatch.style.cssText = 'display: inline-block; width: 14px; height: 10px; margin-right: 6px; '
+                        + 'opacity: {{ this.fill_opacity }}; background: ' + item[0] + ';';
+                    row.appendChild(document.createTextNode(item[1]));
+                });
+            }
+
+            var control = L.control({position: 'bottomright'});
+            control.onAdd = function() {
+                var container = L.DomUtil.create('div', 'leaflet-bar');
+                container.style.cssText = 'background: white; padding: 6px 8px; font: 12px arial;';
+                var select = L.DomUtil.create('select', '', container);
+                styles.indicators.forEach(function(indicator, i) {
+                    var option = document.createElement('option');
+                    option.value = i;
+                    option.textContent = indicator.column;
+                    select.appendChild(option);
+                });
+                var legend = L.DomUtil.create('div', '', container);
+                L.DomEvent.disableClickPropagation(container);
+                L.DomEvent.disableScrollPropagation(container);
+                select.addEventListener('change', function() {
+                    current = styles.indicators[+select.value];
+                    restyle();
+                    renderLegend(legend);
+                });
+                renderLegend(legend);
+                return container;
+            };
+            control.addTo(map);
+            restyle();
+
+            return {
+                properties: function(properties) {
+                    if (properties[{{ this.layer_property|tojson }}] !== {{ this.province_layer|tojson }}
+                        || index[properties.name] === undefined) { return properties; }
+                    var extra = {};
+                    extra[{{ this.name_property|tojson }}] = current.column;
+                    extra[{{ this.value_property|tojson }}] = label(properties.name);
+                    return Object.assign({}, properties, extra);
+                }
+            };
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, layer, styles, tiled=False):
+        super().__init__()
+        self._name = 'IndicatorSwitcher'
+        self.layer = layer
+        self.styles = styles
+        self.tiled = tiled
+        self.province_layer = tiles.PROVINCE_LAYER
+        self.layer_property = tiles.LAYER_PROPERTY
+        self.name_property = INDICATOR_PROPERTY
+        self.value_property = INDICATOR_VALUE_PROPERTY
+        self.nan_color = NAN_FILL_COLOR
+        self.no_data = NO_DATA_LABEL
+        self.fill_opacity = FILL_OPACITY
+
+
+def district_fill_colors(df_processed, column=MAP_COLUMN, caption=DISTRICT_LEGEND_NAME):
+    """Warna isi per kab/kota dengan kunci `tiles.district_key`."""
+    keys = df_processed['Kab/Kota'].map(tiles.district_key)
+    colormap, color_for = choropleth_scale(df_processed[column], caption=caption)
+    return colormap, {key: color_for(value) or NAN_FILL_COLOR for key, value in zip(keys, df_processed[column])}
+
+
+def prediction_layer(geojson_data, df_prediksi, column, legend_name):
+    """
+    Layer overlay hasil prediksi model per provinsi.
+
+    Feature baru hanya membawa properti tooltip dan memakai objek geometri
+    kubus tanpa menyalinnya. Geometri tetap terserialisasi ulang di HTML,
+    sehingga layer ini hanya ditambahkan jika pengguna memintanya.
+    """
+    colormap, fill_colors = feature_fill_colors(
+        df_prediksi, geojson_data, column, fill_color=PREDICTION_FILL_COLOR, caption=legend_name
+    )
+    values = df_prediksi.set_index('Provinsi')[column].to_dict()
+    features = []
+    for feature in geojson_data['features']:
+        name = feature['properties'].get('name')
+        value = values.get(name)
+        label = f"{value:.1f}%" if value is not None else NO_DATA_LABEL
+        features.append({
+            'type': 'Feature',
+            'geometry': feature['geometry'],
+            'properties': {'name': name, 'PREDIKSI': label},
+        })
+
+    layer = folium.features.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name='Prediksi Model',
+        style_function=lambda feature: {
+            'weight': LINE_WEIGHT,
+            'opacity': LINE_OPACITY,
+            'color': LINE_COLOR,
+            'fillOpacity': FILL_OPACITY,
+            'fillColor': fill_colors.get(feature['properties'].get('name'), NAN_FILL_COLOR),
+        },
+        tooltip=folium.features.GeoJsonTooltip(
+            fields=['name', 'PREDIKSI'],
+            aliases=['Provinsi:', f'{legend_name}:'],
+            sticky=False,
+        ),
+    )
+    return layer, colormap
+
+
+def base_map():
+    return folium.Map(
+        location=MAP_CENTER,
+        zoom_start=MAP_ZOOM_START,
+        tiles='OpenStreetMap',
+        control_scale=True
+    )
+
+
+def add_prediction_layer(m, cube, df_prediksi, prediction_column):
+    if df_prediksi is None:
+        return
+    layer, prediction_colormap = prediction_layer(
+        cube.geojson_data, df_prediksi, prediction_column, PREDICTION_LEGEND_NAME
+    )
+    layer.add_to(m)
+    prediction_colormap.add_to(m)
+
+
+def create_folium_map(cube, df_prediksi=None, prediction_column=None):
+    """
+    Create interactive folium map
+
+    Jika `df_prediksi` diberikan, hasil prediksi model ditambahkan sebagai
+    layer overlay di atas layer kemiskinan; keduanya bisa diatur dari LayerControl.
+    """
+    styles = indicator_styles(cube.df_provinsi, cube.geojson_data)
+    # Warna awal diambil dari indikator pertama (P0), bukan dihitung ulang.
+    first = styles['indicators'][0]['colors'] if styles['indicators'] else []
+    fill_colors = dict(zip(styles['names'], first))
+    m = base_map()
+
+    tooltip = folium.features.GeoJsonTooltip(
+        fields=INDICATOR_TOOLTIP_FIELDS,
+        aliases=INDICATOR_TOOLTIP_ALIASES,
+        localize=True,
+        sticky=False,
+        style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px; border-radius: 5px;"
+    )
+
+    popup = folium.features.GeoJsonPopup(
+        fields=POPUP_FIELDS,
+        aliases=POPUP_ALIASES,
+        localize=True,
+        sticky=False,
+        labels=True,
+        max_width=450,
+        style="font-family: arial; font-size: 12px;"
+    )
+
+    layer = folium.features.GeoJson(
+        with_indicator_properties(cube.geojson_data, styles),
+        name='Peta Kemiskinan',
+        style_function=lambda feature: {
+            'weight': LINE_WEIGHT,
+            'opacity': LINE_OPACITY,
+            'color': LINE_COLOR,
+            'fillOpacity': FILL_OPACITY,
+            'fillColor': fill_colors.get(feature['properties'].get('name'), NAN_FILL_COLOR),
+        },
+        highlight_function=lambda feature: {
+            'weight': LINE_WEIGHT + 2,
+            'fillOpacity': FILL_OPACITY + 0.2,
+        },
+        tooltip=tooltip,
+        popup=popup
+    )
+    layer.add_to(m)
+    # Legenda indikator dirender oleh pemilih indikator, bukan colormap branca.
+    IndicatorSwitcher(layer, styles).add_to(m)
+    add_prediction_layer(m, cube, df_prediksi, prediction_column)
+    folium.LayerControl().add_to(m)
+
+    return m
+
+
+
+class VectorTileInteraction(MacroElement):
+    """Tooltip saat hover dan popup saat klik untuk layer vector tile."""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var layer = {{ this.layer.get_name() }};
+            var map = {{ this._parent.get_name() }};
+            var popupFields = {{ this.popup_fields|tojson }};
+            var tooltipFields = {{ this.tooltip_fields|tojson }};
+            var switcher = {{ this.switcher.get_name() if this.switcher else 'null' }};
+            function properties(e) {
+                return switcher ? switcher.properties(e.layer.properties) : e.layer.properties;
+            }
+            function table(properties, fields) {
+                var element = document.createElement('table');
+                fields.forEach(function(field) {
+                    if (properties[field[0]] === undefined) { return; }
+                    var row = element.insertRow();
+                    var label = document.createElement('th');
+                    label.textContent = field[1];
+                    row.appendChild(label);
+                    row.insertCell().textContent = properties[field[0]];
+                });
+                element.style.cssText = 'font-family: arial; font-size: 12px; text-align: left;';
+                return element;
+            }
+            var tooltip = L.tooltip({sticky: true});
+            layer.on('mouseover', function(e) {
+                tooltip.setLatLng(e.latlng).setContent(table(properties(e), tooltipFields)).addTo(map);
+            });
+            layer.on('mouseout', function() { map.closeTooltip(tooltip); });
+            layer.on('click', function(e) {
+                L.popup({maxWidth: 450}).setLatLng(e.latlng)
+                    .setContent(table(properties(e), popupFields)).openOn(map);
+            });
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, layer, popup_fields, tooltip_fields, switcher=None):
+        super().__init__()
+        self._name = 'VectorTileInteraction'
+        self.layer = layer
+        self.popup_fields = popup_fields
+        self.tooltip_fields = tooltip_fields
+        self.switcher = switcher
+
+
+def vector_tile_options(tileset):
+    """Opsi `L.vectorGrid.protobuf` (JavaScript) dengan style dari properti `fill` di tile."""
+    layers = {layer['id']: layer for layer in tileset['layers']}
+    district = layers.get(tiles.DISTRICT_LAYER)
+    # Saat layer kab/kota terlihat, provinsi hanya digambar sebagai garis batas.
+    outline_zoom = district['min_zoom'] if district else tileset['max_zoom'] + 1
+    style = {
+        'weight': LINE_WEIGHT,
+        'opacity': LINE_OPACITY,
+        'color': LINE_COLOR,
+        'fill': True,
+    }
+    return f"""{{
+        "interactive": true,
+        "minNativeZoom": {tileset['min_zoom']},
+        "maxNativeZoom": {tileset['max_zoom']},
+        "getFeatureId": function(feature) {{
+            return feature.properties.{tiles.LAYER_PROPERTY} + ":" + feature.properties.name;
+        }},
+        "vectorTileLayerStyles": {{
+            "{tiles.PROVINCE_LAYER}": function(properties, zoom) {{
+                return Object.assign({json.dumps(style)}, {{
+                    "fillColor": properties.fill || "{NAN_FILL_COLOR}",
+                    "fillOpacity": zoom >= {outline_zoom} ? 0 : {FILL_OPACITY},
+                    "weight": zoom >= {outline_zoom} ? {LINE_WEIGHT + 1} : {LINE_WEIGHT}
+                }});
+            }},
+            "{tiles.DISTRICT_LAYER}": function(properties, zoom) {{
+                return Object.assign({json.dumps(style)}, {{
+                    "fillColor": properties.fill || "{NAN_FILL_COLOR}",
+                    "fillOpacity": {FILL_OPACITY},
+                    "weight": 0.5
+                }});
+            }}
+        }}
+    }}"""
+
+
+def create_tiled_map(cube, tileset, url, df_prediksi=None, prediction_column=None, district_colormap=None):
+    """
+    Peta choropleth berbasis vector tile.
+
+    `tileset` adalah metadata dari `tiles.load_tileset` dan `url` template
+    `{z}/{x}/{y}` tempat tile disajikan. Layer prediksi tetap GeoJSON inline.
+    """
+    m = base_map()
+
+    layer = VectorGridProtobuf(url, name='Peta Kemiskinan', options=vector_tile_options(tileset))
+    layer.add_to(m)
+    # Tile tetap membawa warna P0; pemilih indikator menimpa style feature provinsi.
+    switcher = IndicatorSwitcher(layer, indicator_styles(cube.df_provinsi, cube.geojson_data), tiled=True)
+    switcher.add_to(m)
+    VectorTileInteraction(
+        layer,
+        # Tile bisa berisi provinsi maupun kab/kota, jadi label nama dibuat umum.
+        popup_fields=[('name', 'Wilayah:'), *zip(POPUP_FIELDS[1:], POPUP_ALIASES[1:])],
+        tooltip_fields=[
+            ('name', 'Wilayah:'),
+            *zip(INDICATOR_TOOLTIP_FIELDS[1:], INDICATOR_TOOLTIP_ALIASES[1:]),
+            *zip(TOOLTIP_FIELDS[1:], TOOLTIP_ALIASES[1:]),
+        ],
+        switcher=switcher,
+    ).add_to(m)
+    if district_colormap is not None:
+        district_colormap.add_to(m)
+
+    add_prediction_layer(m, cube, df_prediksi, prediction_column)
+    folium.LayerControl().add_to(m)
+    return m
@@ -0,0 +1,300 @@
+"""
+Penyimpanan dataset terproses multi-tahun yang dipartisi per tahun dan provinsi.
+
+Tata letak (gaya Hive), satu file Parquet per partisi:
+
+    data/partitions/
+        manifest.json
+        tahun=2021/provinsi=ACEH/<digest>.parquet
+        ...
+
+Manifest mencatat setiap partisi beserta jumlah baris, digest isi, dan
+statistik min/max setiap kolom numerik. `PartitionStore.select` memangkas
+partisi hanya dari manifest (tahun, provinsi, dan predikat rentang), lalu
+`PartitionStore.read` membaca kolom yang diminta dari file yang tersisa dan
+meneruskan predikat yang sama ke pembaca Parquet (pushdown ke row group).
+
+Manifest adalah satu-satunya sumber kebenaran dan ditulis ulang secara
+atomik; file partisi diberi nama dari digest isinya sehingga penulisan ulang
+tahun yang sama tidak pernah menimpa file yang sedang dibaca worker lain.
+File generasi sebelumnya baru dihapus pada penulisan berikutnya, sehingga
+worker yang masih memegang `select()` lama tetap bisa membacanya.
+Tahun baru ditambahkan dari CSV bersih atau ekspor mentah BPS:
+
+    python -m dashboard.partitions add "data/Klasifikasi Tingkat Kemiskinan di Indonesia.csv" --year 2021
+    python -m dashboard.partitions list
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote
+import argparse
+import hashlib
+import json
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
+
+from dashboard import ingest
+from dashboard.config import PARTITION_DIR, PIPELINE_VERSION
+from dashboard.fingerprint import fingerprint
+from dashboard.fsutil import write_atomic
+from dashboard.pipeline import clean_dataframe
+from dashboard.schema import ValidationReport
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+YEAR_COLUMN = 'Tahun'
+
+
+@dataclass(frozen=True)
+class PartitionSelection:
+    """Hasil pemangkasan partisi untuk satu kueri; `version` menjadi kunci cache."""
+
+    years: tuple
+    provinces: tuple
+    columns: tuple
+    predicates: tuple
+    partitions: tuple
+    version: str
+
+    @property
+    def rows(self):
+        return sum(partition['rows'] for partition in self.partitions)
+
+
+def frame_digest(df):
+    """Digest isi frame (nilai dan nama kolom), stabil antarproses."""
+    digest = hashlib.sha256(json.dumps(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def column_stats(df):
+    """Min/max setiap kolom numerik (None jika semua kosong)."""
+    stats = {}
+    for column in df.select_dtypes(include=np.number).columns:
+        values = df[column].to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        stats[column] = [float(values.min()), float(values.max())] if len(values) else None
+    return stats
+
+
+def may_match(stats, low, high):
+    """False hanya jika rentang [low, high] pasti tidak beririsan dengan [min, max] partisi."""
+    if stats is None:
+        return False
+    minimum, maximum = stats
+    return (low is None or maximum >= low) and (high is None or minimum <= high)
+
+
+def predicate_filter(predicates):
+    """Ekspresi filter pyarrow dari `((kolom, min, max), ...)`, atau None."""
+    expression = None
+    for column, low, high in predicates:
+        field = pa_ds.field(column)
+        for condition in (field >= low if low is not None else None, field <= high if high is not None else None):
+            if condition is not None:
+                expression = condition if expression is None else expression & condition
+    return expression
+
+
+class PartitionStore:
+    """Dataset terproses yang dipartisi per tahun dan provinsi."""
+
+    def __init__(self, root=PARTITION_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._manifest = None
+        self._manifest_stat = None
+
+    def manifest(self):
+        """Manifest saat ini; dibaca ulang hanya jika file berubah (satu `os.stat`)."""
+        try:
+            stat = self.manifest_path.stat()
+            stat_key = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            return {'format': MANIFEST_FORMAT_VERSION, 'sources': {}, 'partitions': []}
+        with self._lock:
+            if self._manifest_stat == stat_key:
+                return self._manifest
+        with self.manifest_path.open(encoding='utf-8') as file:
+            manifest = json.load(file)
+        with self._lock:
+            self._manifest, self._manifest_stat = manifest, stat_key
+        return manifest
+
+    def years(self):
+        return sorted({partition['year'] for partition in self.manifest()['partitions']})
+
+    def provinces(self, year=None):
+        return sorted({
+            partition['province'] for partition in self.manifest()['partitions']
+            if year is None or partition['year'] == year
+        })
+
+    def write_year(self, df_processed, year, source=None):
+        """
+        Ganti seluruh partisi satu tahun dengan `df_processed`.
+
+        Mengembalikan jumlah partisi yang benar-benar ditulis; partisi yang
+        isinya tidak berubah dipakai ulang tanpa menulis file.
+        """
+        year = int(year)
+        manifest = self.manifest()
+        existing = {partition['path'] for partition in manifest['partitions']}
+        previous = {partition['path'] for partition in manifest['partitions'] if partition['year'] == year}
+        entries, written = [], 0
+        # Urutan provinsi mengikuti kemunculan pertama agar urutan baris terjaga.
+        for province, part in df_processed.groupby('Provinsi', sort=False):
+            part = part.reset_index(drop=True)
+            digest = frame_digest(part)
+            path = f"tahun={year}/provinsi={quote(str(province), safe='')}/{digest[:16]}.parquet"
+            if path not in existing or not (self.root / path).exists():
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                write_atomic(self.root / path, lambda file: pq.write_table(table, file, compression='zstd'))
+                written += 1
+            entries.append({
+                'year': year,
+                'province': str(province),
+                'path': path,
+                'rows': len(part),
+                'digest': digest,
+                'stats': column_stats(part),
+            })
+
+        partitions = [partition for partition in manifest['partitions'] if partition['year'] != year]
+        partitions = sorted(partitions + entries, key=lambda partition: partition['year'])
+        sources = dict(manifest.get('sources', {}))
+        if source is not None:
+            sources[str(year)] = source
+        else:
+            sources.pop(str(year), None)
+        self._write_manifest({
+            'format': MANIFEST_FORMAT_VERSION,
+            'columns': list(df_processed.columns),
+            'sources': sources,
+            'partitions': partitions,
+        })
+        # Generasi sebelumnya dibiarkan satu penulisan lagi untuk pembaca yang masih memakainya.
+        self._remove_unreferenced(year, previous | {entry['path'] for entry in entries})
+        return written
+
+    def _write_manifest(self, manifest):
+        payload = json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8')
+        write_atomic(self.manifest_path, lambda file: file.write(payload))
+
+    def _remove_unreferenced(self, year, keep):
+        """Hapus file partisi milik `year` di luar `keep` (generasi saat ini dan sebelumnya)."""
+        year_dir = self.root / f"tahun={year}"
+        for path in year_dir.glob('*/*.parquet'):
+            if path.relative_to(self.root).as_posix() not in keep:
+                path.unlink(missing_ok=True)
+        for directory in year_dir.glob('*'):
+            if directory.is_dir() and not any(directory.iterdir()):
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def sync_source(self, source_path, year):
+        """
+        Pastikan partisi `year` berasal dari isi file sumber saat ini.
+
+        Cek cepat memakai sidik jari file (stat + digest yang diingat); CSV
+        hanya dibaca ulang jika isinya atau versi pipeline berubah. Peringatan
+        validasi disimpan di manifest. Mengembalikan True jika partisi ditulis ulang.
+        """
+        source = {
+            'path': str(source_path),
+            'digest': fingerprint(source_path, with_digest=True).digest,
+            'pipeline_version': PIPELINE_VERSION,
+        }
+        # Pemanasan awal dan halaman pertama bisa menyinkronkan bersamaan; cukup sekali.
+        with self._sync_lock:
+            recorded = self.manifest().get('sources', {}).get(str(year), {})
+            if all(recorded.get(key) == value for key, value in source.items()):
+                return False
+            report = ValidationReport()
+            df_processed = clean_dataframe(ingest.read_source(source_path, report=report))
+            source['warnings'] = [violation.message() for violation in report.warnings]
+            self.write_year(df_processed, year, source)
+        return True
+
+    def warnings(self, year):
+        """Pesan peringatan validasi dari file sumber sebuah tahun."""
+        return list(self.manifest().get('sources', {}).get(str(year), {}).get('warnings', []))
+
+    def select(self, years=None, provinces=None, columns=None, predicates=()):
+        """Pangkas partisi dari manifest tanpa membuka file Parquet."""
+        years = tuple(sorted(int(year) for year in years)) if years else ()
+        provinces = tuple(sorted(provinces)) if provinces else ()
+        columns = tuple(columns) if columns else ()
+        predicates = tuple(tuple(predicate) for predicate in predicates)
+        partitions = tuple(
+            partition for partition in self.manifest()['partitions']
+            if (not years or partition['year'] in years)
+            and (not provinces or partition['province'] in provinces)
+            and all(may_match(partition['stats'].get(column), low, high) for column, low, high in predicates)
+        )
+        key = json.dumps([
+            PIPELINE_VERSION, columns, predicates,
+            [(partition['year'], partition['province'], partition['digest']) for partition in partitions],
+        ], default=str)
+        version = f"partitions:{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}"
+        return PartitionSelection(years, provinces, columns, predicates, partitions, version)
+
+    def read(self, selection):
+        """
+        Baca partisi terpilih; hanya kolom yang diminta yang didekode.
+
+        Jika selection mencakup lebih dari satu tahun, kolom `Tahun` ditambahkan.
+        """
+        columns = list(selection.columns) or None
+        if not selection.partitions:
+            return pd.DataFrame(columns=columns or self.manifest().get('columns', []))
+
+        expression = predicate_filter(selection.predicates)
+        by_year = {}
+        for partition in selection.partitions:
+            by_year.setdefault(partition['year'], []).append(str(self.root / partition['path']))
+        frames = []
+        for year, paths in by_year.items():
+            table = pa_ds.dataset(paths, format='parquet').to_table(columns=columns, filter=expression)
+            frame = table.to_pandas()
+            if len(by_year) > 1:
+                frame.insert(0, YEAR_COLUMN, year)
+            frames.append(frame)
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def scan(self, years=None, provinces=None, columns=None, predicates=()):
+        """`select` lalu `read` dalam satu langkah."""
+        return self.read(self.select(years, provinces, columns, predicates))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola dataset multi-tahun yang dipartisi per tahun dan provinsi.")
+    parser.add_argument('--root', default=str(PARTITION_DIR), help="Direktori penyimpanan partisi.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="Tambah atau ganti satu tahun dari CSV bersih/mentah.")
+    add.add_argument('source', help="CSV bersih atau ekspor mentah BPS.")
+    add.add_argument('--year', type=int, required=True, help="Tahun rilis data.")
+    commands.add_parser('list', help="Tampilkan tahun, jumlah partisi, dan jumlah baris.")
+    args = parser.parse_args(argv)
+
+    store = PartitionStore(args.root)
+    if args.command == 'add':
+        store.sync_source(Path(args.source), args.year)
+        selection = store.select(years=[args.year])
+        print(f"Tahun {args.year}: {len(selection.partitions)} partisi, {selection.rows:,} baris di {store.root}")
+    else:
+        for year in store.years():
+            selection = store.select(years=[year])
+            print(f"{year}: {len(selection.partitions)} partisi, {selection.rows:,} baris")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Pembersihan dan agregasi data kemiskinan tanpa ketergantungan ke Streamlit."""
+import pandas as pd
+
+from dashboard.aggregation import ProvinceStats
+from dashboard.config import COLUMN_MAPPING, NUMERIC_COLUMNS, PROVINCE_ALIASES, REQUIRED_COLUMNS
+from dashboard.schema import validate_frame
+
+
+def clean_dataframe(df):
+    """
+    Membersihkan DataFrame mentah menjadi data kabupaten/kota yang siap dipakai.
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing_columns)}")
+
+    # Filter kolom yang ada di DataFrame
+    valid_columns = {k: v for k, v in COLUMN_MAPPING.items() if k in df.columns}
+    df_processed = df[list(valid_columns.keys())].copy()
+    df_processed.rename(columns=valid_columns, inplace=True)
+
+    for column in NUMERIC_COLUMNS:
+        if column not in df_processed.columns:
+            continue
+        # Kolom yang sudah numerik (misalnya hasil dashboard.ingest) tidak perlu diurai ulang.
+        if pd.api.types.is_numeric_dtype(df_processed[column]):
+            df_processed[column] = df_processed[column].astype('float64')
+        else:
+            df_processed[column] = pd.to_numeric(
+                df_processed[column].astype(str).str.strip().str.replace(',', '.', regex=False),
+                errors='coerce'
+            )
+
+    # Konversi Pengeluaran Per Kapita dari tahunan ke bulanan
+    if 'Pengeluaran Per Kapita' in df_processed.columns:
+        df_processed['Pengeluaran Per Kapita'] = df_processed['Pengeluaran Per Kapita'] / 12
+
+    # Normalisasi nama provinsi; NaN yang ikut dikonversi ke teks dianggap kosong.
+    if 'Provinsi' in df_processed.columns:
+        provinces = df_processed['Provinsi'].astype(str).str.upper().str.strip().replace(PROVINCE_ALIASES)
+        df_processed['Provinsi'] = provinces.mask(provinces.isin(['NAN', 'NONE', '<NA>']), '')
+
+    # Semua kolom divalidasi sekaligus; error dilaporkan bersama nomor barisnya.
+    validate_frame(df_processed).raise_for_errors()
+    return df_processed
+
+
+def aggregate_provinces(df_processed, weight=None):
+    """
+    Agregasi data ke tingkat provinsi dengan rata-rata sederhana kabupaten/kota.
+
+    Jika `weight` diberikan (misalnya 'PDRB'), rata-rata dibobot kolom tersebut.
+    """
+    return ProvinceStats.from_frame(df_processed).means(weight)
+
+
+def process_dataframe(df):
+    """Membersihkan lalu mengagregasi DataFrame mentah."""
+    df_processed = clean_dataframe(df)
+    return df_processed, aggregate_provinces(df_processed)
@@ -0,0 +1,195 @@
+"""
+Prediksi klasifikasi kemiskinan dengan model XGBoost dari notebook.
+
+Model (`Model/xgb_poverty_model.pkl`) dan StandardScaler (`Model/scaler.pkl`)
+disimpan dengan joblib, sehingga `joblib`, `scikit-learn`, dan `xgboost` hanya
+dibutuhkan jika prediksi dipakai. Skoring dilakukan per batch vektor di atas
+`df_processed`; mode streaming membaca CSV besar (bersih maupun ekspor mentah
+BPS) per blok lewat `dashboard.ingest` sehingga memori tetap terbatas:
+
+    python -m dashboard.prediction "data/Klasifikasi Tingkat Kemiskinan di Indonesia.csv"
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from dashboard import ingest
+from dashboard.config import CACHE_DIR, DATA_PATH, MODEL_PATH, SCALER_PATH
+from dashboard.fingerprint import fingerprint
+from dashboard.fsutil import write_atomic
+from dashboard.pipeline import clean_dataframe
+
+PREDICTION_DIR = CACHE_DIR / 'predictions'
+BATCH_ROWS = 65_536
+
+# Urutan fitur sama dengan `X` di notebook (nama kolom setelah pipeline).
+FEATURE_COLUMNS = [
+    'Persentase Kemiskinan (P0)',
+    'Rata-Rata Lama Sekolah',
+    'Pengeluaran Per Kapita',
+    'Indeks Pembangunan Manusia',
+    'Umur Harapan Hidup',
+    'Akses Sanitasi Layak',
+    'Akses Air Minum Layak',
+    'Tingkat Pengangguran Terbuka',
+    'Tingkat Partisipasi Angkatan Kerja',
+]
+# Pipeline mengubah pengeluaran menjadi bulanan; model dilatih dengan nilai tahunan.
+FEATURE_FACTORS = {'Pengeluaran Per Kapita': 12.0}
+ID_COLUMNS = ['Provinsi', 'Kab/Kota']
+
+PROBABILITY_COLUMN = 'Probabilitas Kemiskinan Tinggi'
+CLASS_COLUMN = 'Prediksi Klasifikasi Kemiskinan'
+SHARE_COLUMN = 'Proporsi Prediksi Miskin (%)'
+
+
+@dataclass(frozen=True)
+class PovertyModel:
+    """Model dan parameter scaler yang sudah dimuat. Perlakukan sebagai read-only."""
+
+    version: str
+    model: object
+    mean: np.ndarray
+    scale: np.ndarray
+
+
+def load_model(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """
+    Muat model dan scaler dengan joblib.
+
+    Melempar ImportError jika dependency prediksi belum terpasang.
+    """
+    try:
+        import joblib
+    except ImportError as exc:
+        raise ImportError(
+            "Prediksi membutuhkan paket joblib, scikit-learn, dan xgboost "
+            "(pip install joblib scikit-learn xgboost)."
+        ) from exc
+
+    digest = hashlib.sha256()
+    for path in (model_path, scaler_path):
+        digest.update(fingerprint(path, with_digest=True).digest.encode('ascii'))
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    if getattr(scaler, 'n_features_in_', None) != len(FEATURE_COLUMNS):
+        raise ValueError(f"Scaler harus memiliki {len(FEATURE_COLUMNS)} fitur.")
+
+    # Transformasi StandardScaler diterapkan langsung dengan NumPy per batch.
+    n_features = len(FEATURE_COLUMNS)
+    mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(n_features)
+    scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(n_features)
+    return PovertyModel(digest.hexdigest()[:16], model, np.asarray(mean, dtype=float), np.asarray(scale, dtype=float))
+
+
+def feature_matrix(df):
+    """Matriks fitur float64 dengan satuan yang sama seperti saat pelatihan."""
+    missing_columns = [col for col in FEATURE_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Kolom fitur tidak ditemukan: {', '.join(missing_columns)}")
+
+    features = np.empty((len(df), len(FEATURE_COLUMNS)), dtype=float)
+    for idx, column in enumerate(FEATURE_COLUMNS):
+        features[:, idx] = df[column].to_numpy(dtype=float)
+        features[:, idx] *= FEATURE_FACTORS.get(column, 1.0)
+    return features
+
+
+def predict_proba(poverty_model, df, batch_rows=BATCH_ROWS):
+    """Probabilitas kelas kemiskinan tinggi (1), dihitung per batch."""
+    probabilities = np.empty(len(df), dtype=np.float32)
+    for start in range(0, len(df), batch_rows):
+        features = feature_matrix(df.iloc[start:start + batch_rows])
+        features -= poverty_model.mean
+        features /= poverty_model.scale
+        probabilities[start:start + len(features)] = poverty_model.model.predict_proba(features)[:, 1]
+    return probabilities
+
+
+def predict_frame(poverty_model, df, batch_rows=BATCH_ROWS):
+    """Kolom prediksi untuk setiap baris `df` (indeks 0..n-1)."""
+    probabilities = predict_proba(poverty_model, df, batch_rows)
+    # Ambang 0.5 sama dengan XGBClassifier.predict.
+    return pd.DataFrame({
+        PROBABILITY_COLUMN: probabilities,
+        CLASS_COLUMN: (probabilities > 0.5).astype(np.int8),
+    })
+
+
+def aggregate_predictions(df_processed, predictions):
+    """Persentase kabupaten/kota per provinsi yang diprediksi berkemiskinan tinggi."""
+    grouped = pd.DataFrame({
+        'Provinsi': df_processed['Provinsi'].to_numpy(),
+        SHARE_COLUMN: predictions[CLASS_COLUMN].to_numpy(dtype=float) * 100,
+        PROBABILITY_COLUMN: predictions[PROBABILITY_COLUMN].to_numpy(dtype=float),
+    })
+    return grouped.groupby('Provinsi').mean().reset_index()
+
+
+def load_predictions(poverty_model, df_processed, dataset_version, store):
+    """
+    Prediksi untuk satu versi dataset dan versi model.
+
+    Hasil dipublikasikan ke data store sehingga worker lain cukup me-memory-map
+    frame yang sama; skoring hanya dijalankan sekali per kombinasi versi.
+    """
+    version = f"{dataset_version}-{poverty_model.version}"
+    predictions = store.attach_frame('predictions', version)
+    if predictions is not None:
+        return predictions
+
+    predictions = predict_frame(poverty_model, df_processed)
+    try:
+        store.publish_frame('predictions', version, predictions)
+    except OSError:
+        # Data store hanya optimasi; tetap pakai hasil di memori jika gagal menulis.
+        return predictions
+    attached = store.attach_frame('predictions', version)
+    return attached if attached is not None else predictions
+
+
+def iter_score_csv(poverty_model, csv_path, block_size=ingest.BLOCK_SIZE):
+    """
+    Skor CSV bersih atau ekspor mentah BPS per blok dengan memori terbatas.
+
+    Setiap blok dibaca lewat `dashboard.ingest` lalu dibersihkan dengan pipeline yang sama.
+    """
+    for chunk in ingest.iter_frames(csv_path, block_size):
+        df_chunk = clean_dataframe(chunk)
+        id_columns = [col for col in ID_COLUMNS if col in df_chunk.columns]
+        yield pd.concat([df_chunk[id_columns], predict_frame(poverty_model, df_chunk)], axis=1)
+
+
+def score_csv(poverty_model, csv_path, output_path, block_size=ingest.BLOCK_SIZE):
+    """Tulis prediksi CSV besar ke file secara atomik; mengembalikan jumlah baris."""
+    rows = 0
+
+    def write(file):
+        nonlocal rows
+        for scored in iter_score_csv(poverty_model, csv_path, block_size):
+            scored.to_csv(file, index=False, header=rows == 0)
+            rows += len(scored)
+
+    write_atomic(output_path, write, 'w', encoding='utf-8', newline='')
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skor CSV kemiskinan dengan model XGBoost secara streaming.")
+    parser.add_argument('source', nargs='?', default=str(DATA_PATH), help="CSV sumber.")
+    parser.add_argument('--output', default=None, help="Lokasi CSV hasil prediksi.")
+    parser.add_argument('--block-size', type=int, default=ingest.BLOCK_SIZE, help="Ukuran blok baca dalam byte.")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output) if args.output else PREDICTION_DIR / f"{Path(args.source).stem}_prediksi.csv"
+    rows = score_csv(load_model(), args.source, output, args.block_size)
+    print(f"{rows:,} baris diprediksi dan disimpan di: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+Prerender kedua halaman dashboard menjadi bundle statis yang bisa disajikan CDN.
+
+Keluaran halaman hanya bergantung pada versi dataset, versi geometri, dan
+versi kode, bukan pada pengunjung. Perintah ini merender semuanya sekali:
+
+    build/site/
+        index.html              # halaman peta (cache pendek)
+        eda.html                # halaman EDA (cache pendek)
+        build-manifest.json     # kunci input -> file aset, untuk build inkremental
+        assets/<nama>.<hash>.<ext>
+
+Aset berisi HTML peta Folium, GeoJSON varian peta (juga `.gz`), grafik (PNG
+matplotlib atau spesifikasi Vega-Lite beserta datanya), dan unduhan CSV/CSV
+gzip/Parquet. Nama aset memuat hash isinya sehingga aman di-cache selamanya
+(`Cache-Control: immutable`). Tabel ringkasan ditanam langsung di halaman.
+
+Build inkremental: setiap aset punya kunci input (versi dataset/geometri,
+backend, parameter, dan `PRERENDER_VERSION`). Aset yang kuncinya sama dan
+filenya masih ada tidak dirender ulang; aset yang tidak lagi dirujuk dihapus.
+
+    python -m dashboard.prerender --output build/site
+    python -m dashboard.prerender --output build/site --year 2022 --backend matplotlib
+"""
+from html import escape
+from pathlib import Path
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import re
+import time
+
+from dashboard import charts, export, geometry, loader, province_cube, snapshot
+from dashboard.config import (
+    CHART_BACKEND,
+    DATA_PATH,
+    GEOMETRY_LEVEL,
+    LOCAL_GEOJSON_PATH,
+    MAP_ZOOM_START,
+    PARTITION_DIR,
+    PIPELINE_VERSION,
+)
+from dashboard.correlation import CorrelationEngine
+from dashboard.fsutil import write_atomic
+from dashboard.partitions import PartitionStore
+
+PRERENDER_VERSION = '1'
+MANIFEST_NAME = 'build-manifest.json'
+ASSET_DIR = 'assets'
+DOWNLOAD_NAME = 'data_kemiskinan_indonesia'
+VEGA_SCRIPTS = [
+    'https://cdn.jsdelivr.net/npm/vega@5',
+    'https://cdn.jsdelivr.net/npm/vega-lite@5',
+    'https://cdn.jsdelivr.net/npm/vega-embed@6',
+]
+PAGE_STYLE = """
+body { font-family: Arial, sans-serif; margin: 0 auto; max-width: 1200px; padding: 0 16px 32px; color: #333; }
+nav a { margin-right: 16px; }
+table { border-collapse: collapse; font-size: 13px; margin: 8px 0 16px; }
+th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.metrics { display: flex; gap: 32px; margin: 16px 0; }
+.metric strong { display: block; font-size: 24px; }
+.charts { display: grid; grid-template-columns: repeat(auto-fit, minmax(480px, 1fr)); gap: 16px; }
+.charts img { max-width: 100%; }
+iframe { border: 0; width: 100%; height: 600px; }
+"""
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def input_key(*parts):
+    """Kunci input sebuah aset: berubah jika salah satu bagian atau versi prerender berubah."""
+    payload = json.dumps([PRERENDER_VERSION, PIPELINE_VERSION, *parts], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BundleBuilder:
+    """Menulis aset content-hashed dan halaman; melewati aset yang kunci inputnya tidak berubah."""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        try:
+            with (self.output_dir / MANIFEST_NAME).open(encoding='utf-8') as file:
+                self.previous = json.load(file).get('assets', {})
+        except (OSError, json.JSONDecodeError):
+            self.previous = {}
+        self.assets = {}
+        self.pages = []
+        self.built = []
+        self.reused = []
+
+    def asset(self, name, key, extension, render):
+        """Path relatif aset `name`; `render()` (mengembalikan bytes) hanya dipanggil jika perlu."""
+        previous = self.previous.get(name)
+        if previous and previous['key'] == key and (self.output_dir / previous['file']).exists():
+            self.assets[name] = previous
+            self.reused.append(name)
+            return previous['file']
+
+        data = render()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        file = f"{ASSET_DIR}/{slug(name)}.{digest}.{extension}"
+        if not (self.output_dir / file).exists():
+            write_atomic(self.output_dir / file, lambda sink: sink.write(data))
+        self.assets[name] = {'key': key, 'file': file, 'bytes': len(data)}
+        self.built.append(name)
+        return file
+
+    def page(self, filename, html):
+        """Tulis halaman hanya jika isinya berubah (halaman tidak di-hash namanya)."""
+        data = html.encode('utf-8')
+        path = self.output_dir / filename
+        try:
+            unchanged = path.read_bytes() == data
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            write_atomic(path, lambda sink: sink.write(data))
+        (self.reused if unchanged else self.built).append(filename)
+        self.pages.append(filename)
+
+    def finish(self, prune=True):
+        """Tulis manifest build dan hapus aset lama yang tidak dirujuk lagi."""
+        manifest = {
+            'version': PRERENDER_VERSION,
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'pages': self.pages,
+            'assets': self.assets,
+        }
+        payload = json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8')
+        write_atomic(self.output_dir / MANIFEST_NAME, lambda sink: sink.write(payload))
+        removed = []
+        if prune:
+            keep = {asset['file'] for asset in self.assets.values()}
+            for path in sorted((self.output_dir / ASSET_DIR).glob('*')):
+                if path.relative_to(self.output_dir).as_posix() not in keep:
+                    path.unlink()
+                    removed.append(path.name)
+        return {'built': self.built, 'reused': self.reused, 'removed': removed}
+
+
+def table_html(df, float_format='{:,.2f}'.format):
+    return df.to_html(index=False, border=0, float_format=float_format, na_rep='-', escape=True)
+
+
+def page_html(title, body, scripts=()):
+    script_tags = ''.join(f'<script src="{src}"></script>' for src in scripts)
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<style>{PAGE_STYLE}</style>
+{script_tags}
+</head>
+<body>
+<h1>Dashboard Analisis Kemiskinan di Indonesia</h1>
+<nav><a href="index.html">Visualisasi Peta</a><a href="eda.html">Analisis Data Eksplorasi</a></nav>
+<hr>
+{body}
+</body>
+</html>
+"""
+
+
+def chart_asset(builder, backend, name, key, build):
+    """Simpan satu grafik sebagai PNG atau spesifikasi Vega-Lite lengkap; mengembalikan (jenis, file)."""
+    def render():
+        chart = build()
+        if chart is None:
+            return b''
+        if chart.kind == 'image':
+            return chart.image
+        spec = {
+            '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+            'width': 'container',
+            **chart.spec,
+            'data': {'values': json.loads(chart.data.to_json(orient='records', double_precision=6))},
+        }
+        return json.dumps(spec, separators=(',', ':')).encode('utf-8')
+
+    extension = 'png' if backend.cacheable else 'vl.json'
+    file = builder.asset(name, key, extension, render)
+    if not builder.assets[name]['bytes']:
+        return None
+    return ('image' if backend.cacheable else 'vega_lite'), file
+
+
+def chart_html(chart, element_id):
+    if chart is None:
+        return ''
+    kind, file = chart
+    if kind == 'image':
+        return f'<div><img src="{file}" alt="{element_id}" loading="lazy"></div>'
+    return (f'<div id="{element_id}" style="width: 100%"></div>'
+            f'<script>vegaEmbed("#{element_id}", "{file}", {{"actions": false}});</script>')
+
+
+def map_level():
+    return geometry.level_for_zoom(MAP_ZOOM_START) if GEOMETRY_LEVEL == 'auto' else GEOMETRY_LEVEL
+
+
+def build_site(output_dir, dataset, geojson_path=LOCAL_GEOJSON_PATH, backend_name=CHART_BACKEND,
+               level=None, prune=True):
+    """Render halaman peta dan EDA untuk `dataset` ke `output_dir`; mengembalikan ringkasan build."""
+    from dashboard.map_builder import create_folium_map
+
+    builder = BundleBuilder(output_dir)
+    backend = charts.get_backend(backend_name)
+    level = level or map_level()
+    geometry_version = snapshot.source_digest(geojson_path)
+    df_processed, df_provinsi = dataset.df_processed, dataset.df_provinsi
+
+    geojson_cache = {}
+
+    def geojson_variant():
+        # GeoJSON hanya dibaca jika ada aset peta yang perlu dirender ulang.
+        if 'data' not in geojson_cache:
+            with Path(geojson_path).open(encoding='utf-8') as file:
+                geojson_cache['data'] = geometry.load_variant(json.load(file), geometry_version, level)
+        return geojson_cache['data']
+
+    geometry_key = input_key('geojson', geometry_version, level)
+    geojson_file = builder.asset(
+        'provinces', geometry_key, 'geojson', lambda: geometry.encode_json(geojson_variant())
+    )
+    geojson_gz_file = builder.asset(
+        'provinces-gz', geometry_key, 'geojson.gz',
+        lambda: gzip.compress(geometry.encode_json(geojson_variant()), compresslevel=9, mtime=0),
+    )
+
+    def render_map():
+        cube = province_cube.load_province_cube(
+            df_provinsi, geojson_variant(), dataset.version, f"{geometry_version}:{level}", persist=False
+        )
+        return create_folium_map(cube).get_root().render().encode('utf-8')
+
+    map_file = builder.asset('map', input_key('map', dataset.version, geometry_version, level), 'html', render_map)
+
+    poverty = charts.POVERTY_COLUMN
+    ranking = df_provinsi[['Provinsi', poverty]]
+    builder.page('index.html', page_html('Peta Sebaran Kemiskinan di Indonesia', f"""
+<h2>Peta Sebaran Kemiskinan di Indonesia</h2>
+<p>Klik pada provinsi untuk melihat detail lengkap, atau arahkan kursor untuk informasi cepat.</p>
+<iframe src="{map_file}" title="Peta kemiskinan" loading="lazy"></iframe>
+<p><small>Catatan: angka provinsi dihitung sebagai rata-rata sederhana kabupaten/kota dalam dataset.
+GeoJSON peta: <a href="{geojson_file}">GeoJSON</a> · <a href="{geojson_gz_file}">GeoJSON (gzip)</a></small></p>
+<h3>Ringkasan Statistik Provinsi</h3>
+<div class="charts">
+<div><strong>5 Provinsi Kemiskinan Tertinggi</strong>{table_html(ranking.nlargest(province_cube.TOP_N, poverty))}</div>
+<div><strong>5 Provinsi Kemiskinan Terendah</strong>{table_html(ranking.nsmallest(province_cube.TOP_N, poverty))}</div>
+</div>
+"""))
+
+    engine_cache = {}
+
+    def correlation():
+        if 'matrix' not in engine_cache:
+            engine_cache['matrix'] = CorrelationEngine.from_frame(df_processed).correlation()
+        return engine_cache['matrix']
+
+    heatmap = chart_asset(
+        builder, backend, 'heatmap', input_key('heatmap', dataset.version, backend.name),
+        lambda: backend.correlation_heatmap(df_processed, correlation()),
+    )
+    scatters = [
+        chart_asset(
+            builder, backend, f'scatter-{feature}', input_key('scatter', dataset.version, backend.name, feature),
+            lambda feature=feature: backend.scatter_plot(df_processed, feature),
+        )
+        for feature in charts.SCATTER_FEATURES if feature in df_processed.columns
+    ]
+
+    downloads = []
+    for fmt, spec in export.EXPORT_FORMATS.items():
+        def encode(fmt=fmt):
+            buffer = io.BytesIO()
+            export.encode_export(df_processed, fmt, buffer)
+            return buffer.getvalue()
+
+        file = builder.asset(
+            f'{DOWNLOAD_NAME}-{fmt}', input_key('export', dataset.version, fmt, export.EXPORT_FORMAT_VERSION),
+            spec.extension, encode,
+        )
+        downloads.append(f'<a href="{file}" download="{DOWNLOAD_NAME}.{spec.extension}">Download Data {spec.label}</a>')
+
+    numeric = df_processed.select_dtypes(include='number')
+    metrics = [
+        ("Total Provinsi", f"{df_provinsi['Provinsi'].nunique()}"),
+        ("Rata-rata Kemiskinan", f"{df_provinsi[poverty].mean():.2f}%"),
+        ("Total Data Points", f"{len(df_processed):,}"),
+        ("Jumlah Fitur", f"{len(numeric.columns)}"),
+    ]
+    metrics_html = ''.join(
+        f'<div class="metric">{escape(label)}<strong>{escape(value)}</strong></div>' for label, value in metrics
+    )
+    province_table = dataset.aggregator.stats.summary(poverty) if dataset.aggregator is not None else ranking
+    builder.page('eda.html', page_html('Analisis Data Eksplorasi Kemiskinan', f"""
+<h2>Analisis Data Eksplorasi Kemiskinan</h2>
+<div class="metrics">{metrics_html}</div>
+<p><small>Catatan: ringkasan provinsi menggunakan rata-rata sederhana dari kabupaten/kota yang tersedia.</small></p>
+<h3>Pratinjau Data</h3>
+<details><summary>Lihat Data</summary>{table_html(df_processed.head(20))}<p>{' · '.join(downloads)}</p></details>
+<h3>Statistik Deskriptif</h3>
+<details><summary>Lihat Statistik</summary>{numeric.describe().reset_index(names='').to_html(index=False, border=0, float_format='{:,.2f}'.format)}</details>
+<details><summary>Statistik per Provinsi ({escape(poverty)})</summary>{table_html(province_table)}</details>
+<h3>Heatmap Korelasi Antar Variabel</h3>
+<p>Heatmap menunjukkan korelasi antar variabel. Nilai mendekati 1 (merah) = korelasi positif kuat,
+mendekati -1 (biru) = korelasi negatif kuat.</p>
+{chart_html(heatmap, 'heatmap')}
+<h3>Distribusi Fitur vs Persentase Kemiskinan</h3>
+<div class="charts">{''.join(chart_html(chart, f'scatter-{idx}') for idx, chart in enumerate(scatters))}</div>
+""", scripts=() if backend.cacheable else VEGA_SCRIPTS))
+
+    return builder.finish(prune)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prerender dashboard menjadi bundle statis.")
+    parser.add_argument('--output', default='build/site', help="Direktori bundle.")
+    parser.add_argument('--data', default=str(DATA_PATH), help="CSV bersih atau ekspor mentah BPS.")
+    parser.add_argument('--year', type=int, default=None, help="Tahun data (default: tahun terbaru).")
+    parser.add_argument('--backend', default=CHART_BACKEND, choices=sorted(charts.CHART_BACKENDS),
+                        help="Backend grafik EDA.")
+    parser.add_argument('--no-prune', action='store_true', help="Jangan hapus aset lama yang tidak dirujuk.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    dataset = loader.load_year(Path(args.data), args.year, loader.DatasetLoader(), PartitionStore(PARTITION_DIR))
+    report = build_site(args.output, dataset, backend_name=args.backend, prune=not args.no_prune)
+    print(
+        f"Bundle di {args.output}: {len(report['built'])} dibuat, {len(report['reused'])} dipakai ulang, "
+        f"{len(report['removed'])} dihapus ({time.perf_counter() - started:.1f} detik)."
+    )
+    for name in report['built']:
+        print(f"  dibuat: {name}")
+
+
+if __name__ == '__main__':
+    main()
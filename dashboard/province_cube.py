@@ -0,0 +1,180 @@
+"""
+Kubus provinsi: agregat indikator, teks tooltip/popup, dan pemetaan feature GeoJSON.
+
+Semua isi kubus hanya bergantung pada versi dataset dan versi geometri, bukan
+pada input pengguna, sehingga cukup dibangun sekali lalu disimpan sebagai
+artefak JSON di `.cache/province_cube/`. Halaman peta hanya membaca kubus ini.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+
+import pandas as pd
+
+from dashboard.config import CACHE_DIR, PIPELINE_VERSION
+from dashboard.fsutil import write_atomic
+
+CUBE_DIR = CACHE_DIR / 'province_cube'
+CUBE_FORMAT_VERSION = '1'
+POVERTY_COLUMN = 'Persentase Kemiskinan (P0)'
+NO_DATA_LABEL = "Data Tidak Tersedia"
+TOP_N = 5
+
+# Properti tampilan GeoJSON: (nama properti, kolom indikator, format).
+PROPERTY_FORMATS = [
+    ('IPM_DISPLAY', 'Indeks Pembangunan Manusia', '{:.2f}'),
+    ('PENDUDUK_MISKIN', 'Persentase Kemiskinan (P0)', '{:.2f}%'),
+    ('LAMA_SEKOLAH', 'Rata-Rata Lama Sekolah', '{:.2f} Tahun'),
+    ('PENGELUARAN_KAPITA', 'Pengeluaran Per Kapita', '{:,.0f} Ribu Rupiah/Bulan'),
+    ('UMUR_HARAPAN_HIDUP', 'Umur Harapan Hidup', '{:.2f} Tahun'),
+    ('SANITASI_LAYAK', 'Akses Sanitasi Layak', '{:.2f}%'),
+    ('AIR_MINUM_LAYAK', 'Akses Air Minum Layak', '{:.2f}%'),
+    ('PENGANGGURAN', 'Tingkat Pengangguran Terbuka', '{:.2f}%'),
+    ('ANGKATAN_KERJA', 'Tingkat Partisipasi Angkatan Kerja', '{:.2f}%'),
+    ('PDRB', 'PDRB', '{:,.0f} Rupiah'),
+]
+
+
+@dataclass(frozen=True)
+class ProvinceCube:
+    """Artefak siap pakai untuk halaman peta. Perlakukan sebagai read-only."""
+
+    version: str
+    df_provinsi: pd.DataFrame
+    geojson_data: dict
+    feature_provinces: list
+    top_provinces: pd.DataFrame
+    bottom_provinces: pd.DataFrame
+    missing_in_geojson: list
+    missing_in_data: list
+
+
+def geometry_version(geojson_data):
+    """Hash stabil dari GeoJSON yang sudah dimuat."""
+    payload = json.dumps(geojson_data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def cube_version(dataset_version, geometry_version):
+    """Kunci kubus dari versi dataset, versi geometri, dan versi format."""
+    key = f"{CUBE_FORMAT_VERSION}:{PIPELINE_VERSION}:{dataset_version}:{geometry_version}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def feature_province_name(feature):
+    """Nama provinsi ternormalisasi dari sebuah feature GeoJSON."""
+    return feature.get('properties', {}).get('name', '').upper().strip()
+
+
+def format_properties(df_provinsi):
+    """Format seluruh teks tooltip/popup per provinsi sekali jalan."""
+    formatted = {}
+    for prop, column, template in PROPERTY_FORMATS:
+        values = df_provinsi[column] if column in df_provinsi.columns else pd.Series(0, index=df_provinsi.index)
+        formatted[prop] = [template.format(value) for value in values]
+
+    provinces = df_provinsi['Provinsi'].tolist()
+    return {
+        province: {prop: formatted[prop][idx] for prop, _, _ in PROPERTY_FORMATS}
+        for idx, province in enumerate(provinces)
+    }
+
+
+def build_cube_payload(df_provinsi, geojson_data, version):
+    """Bangun isi kubus dalam bentuk yang bisa diserialisasi ke JSON."""
+    province_properties = format_properties(df_provinsi)
+    no_data_properties = {prop: NO_DATA_LABEL for prop, _, _ in PROPERTY_FORMATS}
+
+    feature_provinces = []
+    feature_properties = []
+    for feature in geojson_data['features']:
+        province_name = feature_province_name(feature)
+        if province_name in province_properties:
+            feature_provinces.append(province_name)
+            feature_properties.append(province_properties[province_name])
+        else:
+            feature_provinces.append(None)
+            feature_properties.append(no_data_properties)
+
+    geojson_provinces = {feature_province_name(feature) for feature in geojson_data['features']}
+    data_provinces = set(df_provinsi['Provinsi'])
+
+    return {
+        'version': version,
+        'indicators': json.loads(df_provinsi.to_json(orient='split', index=False, double_precision=15)),
+        'feature_provinces': feature_provinces,
+        'feature_properties': feature_properties,
+        'missing_in_geojson': sorted(data_provinces - geojson_provinces),
+        'missing_in_data': sorted(geojson_provinces - data_provinces),
+    }
+
+
+def cube_from_payload(payload, geojson_data):
+    """Rakit ProvinceCube dari payload JSON dan geometri sumber."""
+    indicators = payload['indicators']
+    df_provinsi = pd.DataFrame(indicators['data'], columns=indicators['columns'])
+
+    # Geometri dipakai bersama (tanpa deepcopy); hanya dict properti yang baru.
+    features = []
+    for feature, properties in zip(geojson_data['features'], payload['feature_properties']):
+        features.append({
+            **feature,
+            'properties': {**feature.get('properties', {}), **properties},
+        })
+    enriched_geojson = {**geojson_data, 'features': features}
+
+    if POVERTY_COLUMN in df_provinsi.columns:
+        ranking_columns = ['Provinsi', POVERTY_COLUMN]
+        top_provinces = df_provinsi.nlargest(TOP_N, POVERTY_COLUMN)[ranking_columns].reset_index(drop=True)
+        bottom_provinces = df_provinsi.nsmallest(TOP_N, POVERTY_COLUMN)[ranking_columns].reset_index(drop=True)
+    else:
+        top_provinces = bottom_provinces = df_provinsi.iloc[0:0]
+
+    return ProvinceCube(
+        version=payload['version'],
+        df_provinsi=df_provinsi,
+        geojson_data=enriched_geojson,
+        feature_provinces=payload['feature_provinces'],
+        top_provinces=top_provinces,
+        bottom_provinces=bottom_provinces,
+        missing_in_geojson=payload['missing_in_geojson'],
+        missing_in_data=payload['missing_in_data'],
+    )
+
+
+def read_cube_payload(path):
+    try:
+        with Path(path).open(encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_cube_payload(payload, path):
+    """Tulis payload kubus secara atomik."""
+    write_atomic(path, lambda file: json.dump(payload, file, ensure_ascii=False), 'w', encoding='utf-8')
+
+
+def load_province_cube(df_provinsi, geojson_data, dataset_version, geometry_version, cube_dir=None, persist=True):
+    """
+    Memuat kubus dari disk, atau membangun dan menyimpannya jika belum ada.
+
+    `persist=False` membangun kubus di memori saja, untuk tampilan sementara
+    seperti hasil filter yang tidak perlu menumpuk file di cache.
+    """
+    version = cube_version(dataset_version, geometry_version)
+    if not persist:
+        return cube_from_payload(build_cube_payload(df_provinsi, geojson_data, version), geojson_data)
+    cube_path = (Path(cube_dir) if cube_dir is not None else CUBE_DIR) / f"{version}.json"
+
+    payload = read_cube_payload(cube_path)
+    if payload is None or len(payload.get('feature_properties', [])) != len(geojson_data['features']):
+        payload = build_cube_payload(df_provinsi, geojson_data, version)
+        try:
+            write_cube_payload(payload, cube_path)
+        except OSError:
+            # Kubus tetap bisa dipakai dari memori jika direktori cache read-only.
+            pass
+
+    return cube_from_payload(payload, geojson_data)
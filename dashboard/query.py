@@ -0,0 +1,219 @@
+"""
+Lapisan kueri berindeks untuk dataset kab/kota terproses.
+
+Indeks dibangun sekali per versi dataset:
+
+- urutan naik dan turun (argsort stabil) per kolom indikator, dibangun saat
+  kolom pertama kali dipakai, sehingga filter rentang cukup dua `searchsorted`
+  dan peringkat top-N cukup membaca ujung urutan tanpa memindai nilai;
+- bitmap per provinsi (`np.packbits`), sehingga filter provinsi dan gabungan
+  filter hanyalah OR/AND bitwise atas n/8 byte.
+
+`DatasetIndex.select(query)` mengembalikan posisi baris terfilter; hasilnya
+disimpan di cache LRU kecil karena rerun Streamlit mengulang kueri yang sama.
+`filtered_dataset` merakit tampilan terfilter dengan bentuk yang sama seperti
+`LoadedDataset`, sehingga peta, tabel, dan grafik memakainya tanpa perubahan.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard.aggregation import ProvinceAggregator
+
+CACHE_SIZE = 64
+LABEL_COLUMNS = ['Provinsi', 'Kab/Kota']
+
+
+@dataclass(frozen=True)
+class Query:
+    """Filter provinsi (kosong = semua) dan rentang inklusif `((kolom, min, max), ...)`."""
+
+    provinces: tuple = ()
+    ranges: tuple = ()
+
+    @property
+    def is_empty(self):
+        return not self.provinces and not self.ranges
+
+    @property
+    def key(self):
+        """Kunci pendek dan stabil untuk cache dan versi tampilan."""
+        payload = json.dumps([sorted(self.provinces), sorted(self.ranges)], default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class DatasetIndex:
+    """Indeks peringkat dan bitmap provinsi untuk satu frame terproses (read-only)."""
+
+    def __init__(self, df, columns=None, cache_size=CACHE_SIZE):
+        if columns is None:
+            columns = list(df.select_dtypes(include=np.number).columns)
+        self.df = df
+        self.columns = list(columns)
+        self.size = len(df)
+        # Urutan per kolom dibangun saat pertama dibutuhkan; sidebar biasanya
+        # hanya menyentuh satu atau dua indikator.
+        self._orders = {}
+        self._sorted = {}
+
+        codes, provinces = pd.factorize(df['Provinsi'].to_numpy(), sort=True)
+        self.provinces = [str(province) for province in provinces]
+        self.province_bitmaps = {
+            province: np.packbits(codes == code) for code, province in enumerate(self.provinces)
+        }
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def order(self, column, largest=False):
+        """Posisi baris terurut (stabil) tanpa NaN, naik atau turun."""
+        if column not in self.columns:
+            raise ValueError(f"Kolom tidak terindeks: {column}")
+        key = (column, largest)
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            values = self.df[column].to_numpy(dtype=float)
+            # NaN berada di akhir kedua urutan lalu dipotong.
+            order = np.argsort(-values if largest else values, kind='stable')
+            order = order[:np.count_nonzero(~np.isnan(values))]
+            order.setflags(write=False)
+            with self._lock:
+                self._orders[key] = order
+                if not largest:
+                    self._sorted[column] = values[order]
+        return order
+
+    def sorted_values(self, column):
+        """Nilai kolom terurut naik tanpa NaN."""
+        self.order(column)
+        return self._sorted[column]
+
+    def bounds(self, column):
+        """Nilai minimum dan maksimum kolom (tanpa NaN)."""
+        values = self.sorted_values(column)
+        if not len(values):
+            return None, None
+        return float(values[0]), float(values[-1])
+
+    def _range_bitmap(self, column, low, high):
+        values = self.sorted_values(column)
+        start = np.searchsorted(values, low, side='left') if low is not None else 0
+        stop = np.searchsorted(values, high, side='right') if high is not None else len(values)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.order(column)[start:stop]] = True
+        return np.packbits(mask)
+
+    def bitmap(self, query):
+        """Bitmap (packed) baris yang lolos semua filter, atau None jika tanpa filter."""
+        bitmap = None
+        if query.provinces:
+            empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            bitmaps = [self.province_bitmaps.get(province, empty) for province in query.provinces]
+            bitmap = np.bitwise_or.reduce(bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+        for column, low, high in query.ranges:
+            ranged = self._range_bitmap(column, low, high)
+            bitmap = ranged if bitmap is None else bitmap & ranged
+        return bitmap
+
+    def select(self, query):
+        """Posisi baris (naik) yang lolos filter."""
+        with self._lock:
+            if query in self._cache:
+                self._cache.move_to_end(query)
+                self.hits += 1
+                return self._cache[query]
+            self.misses += 1
+
+        bitmap = self.bitmap(query)
+        if bitmap is None:
+            rows = np.arange(self.size)
+        else:
+            rows = np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+        rows.setflags(write=False)
+
+        with self._lock:
+            self._cache[query] = rows
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rows
+
+    def count(self, query):
+        return len(self.select(query))
+
+    def top(self, column, n=5, query=None, largest=True):
+        """
+        N baris teratas/terbawah sebuah indikator di dalam filter.
+
+        Urutan dibaca dari ujungnya dalam potongan yang membesar sampai N baris
+        lolos filter, jadi biayanya sebanding dengan N / selektivitas filter.
+        """
+        order = self.order(column, largest)
+        if query is None or query.is_empty:
+            picked = order[:n]
+        else:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.select(query)] = True
+            parts, found, start, chunk = [], 0, 0, max(4 * n, 64)
+            while start < len(order) and found < n:
+                part = order[start:start + chunk]
+                part = part[mask[part]][:n - found]
+                parts.append(part)
+                found += len(part)
+                start += chunk
+                chunk *= 4
+            picked = np.concatenate(parts) if parts else order[:0]
+
+        columns = [col for col in LABEL_COLUMNS if col in self.df.columns] + [column]
+        return self.df.iloc[picked][columns].reset_index(drop=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache),
+                'orders': len(self._orders),
+            }
+
+
+@dataclass(frozen=True)
+class FilteredDataset:
+    """Tampilan terfilter dengan atribut yang sama seperti `LoadedDataset`."""
+
+    version: str
+    df_processed: pd.DataFrame
+    df_provinsi: pd.DataFrame
+    aggregator: ProvinceAggregator
+    rows: np.ndarray
+    query: Query
+    base: object
+
+    validation = None
+
+
+def filtered_dataset(dataset, index, query):
+    """
+    Dataset terfilter untuk `query`; dataset asli dikembalikan jika tanpa filter.
+
+    Agregat provinsi dihitung ulang dari baris terfilter (O(baris terpilih)).
+    """
+    if query.is_empty:
+        return dataset
+    rows = index.select(query)
+    df_processed = dataset.df_processed.iloc[rows].reset_index(drop=True)
+    aggregator = ProvinceAggregator.from_frame(df_processed)
+    return FilteredDataset(
+        version=f"{dataset.version}:q{query.key}",
+        df_processed=df_processed,
+        df_provinsi=aggregator.means(),
+        aggregator=aggregator,
+        rows=rows,
+        query=query,
+        base=dataset,
+    )
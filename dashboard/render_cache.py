@@ -0,0 +1,126 @@
+"""
+Cache hasil render gambar (PNG) untuk halaman EDA.
+
+Gambar matplotlib hanya bergantung pada versi dataset dan parameter plot,
+sehingga byte PNG-nya bisa dipakai ulang lintas rerun dan lintas sesi.
+Cache memiliki dua tingkat: LRU di memori per proses, dan direktori di disk
+yang dipakai bersama oleh semua proses worker.
+"""
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import io
+import json
+import threading
+
+from dashboard import tracing
+from dashboard.config import CACHE_DIR
+from dashboard.fsutil import write_atomic
+
+RENDER_CACHE_DIR = CACHE_DIR / 'renders'
+RENDER_FORMAT_VERSION = '1'
+
+# Sama dengan default `st.pyplot` agar tampilan tidak berubah.
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+
+def figure_key(dataset_version, figure_name, **params):
+    """Kunci cache dari versi dataset, nama gambar, dan parameter plot."""
+    payload = json.dumps(
+        [RENDER_FORMAT_VERSION, dataset_version, figure_name, params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def figure_to_png(fig):
+    """Serialisasi figure matplotlib menjadi byte PNG."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    return buffer.getvalue()
+
+
+class RenderCache:
+    """LRU di memori dengan tingkat kedua di disk. Aman dipakai lintas thread."""
+
+    def __init__(self, max_entries=64, disk_dir=RENDER_CACHE_DIR):
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key):
+        return self.disk_dir / key[:2] / f"{key}.png"
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key, persist=True):
+        """Ambil byte dari memori, lalu dari disk (jika `persist`); None jika tidak ada."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                tracing.annotate(cache='hit')
+                return data
+
+        if persist and self.disk_dir is not None:
+            try:
+                data = self._disk_path(key).read_bytes()
+            except OSError:
+                data = None
+            if data:
+                self._remember(key, data)
+                with self._lock:
+                    self.disk_hits += 1
+                tracing.annotate(cache='disk')
+                return data
+
+        with self._lock:
+            self.misses += 1
+        tracing.annotate(cache='miss')
+        return None
+
+    def put(self, key, data, persist=True):
+        """Simpan byte ke memori dan (jika `persist` dan bisa) ke disk secara atomik."""
+        self._remember(key, data)
+        if not persist or self.disk_dir is None:
+            return
+
+        try:
+            write_atomic(self._disk_path(key), lambda file: file.write(data))
+        except OSError:
+            # Tingkat disk hanya optimasi; cukup pakai memori jika gagal menulis.
+            pass
+
+    def get_or_render(self, key, render, persist=True):
+        """
+        Kembalikan byte dari cache, atau panggil `render()` lalu simpan hasilnya.
+
+        `persist=False` (tampilan terfilter) hanya memakai LRU memori agar
+        kombinasi filter pengguna tidak menumpuk file di disk.
+        """
+        data = self.get(key, persist)
+        if data is None:
+            data = render()
+            if data is not None:
+                self.put(key, data, persist)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,279 @@
+"""
+Skema data deklaratif dan validator kolumnar.
+
+`DATA_SCHEMA` mendeskripsikan kolom dataset kab/kota: jenis nilai, rentang
+(misalnya persentase 0–100), dan himpunan provinsi yang sama dengan
+`prov 34.geojson` (lihat `PROVINCE_REGIONS`). Kolom dikenali dari nama bersih
+maupun nama kolom mentah di `COLUMN_MAPPING`.
+
+Validator bekerja per kolom dengan kernel `pyarrow.compute`, sehingga bisa
+dijalankan per blok file (`dashboard.ingest`) maupun pada DataFrame
+(`validate_frame`). Semua pelanggaran dari semua blok dikumpulkan di satu
+`ValidationReport` beserta nomor barisnya. Error (kolom wajib hilang, nilai
+kosong, angka tidak valid) menggagalkan pemuatan; peringatan (di luar
+rentang, provinsi tidak dikenal atau tidak ada) hanya dilaporkan.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dashboard.config import COLUMN_MAPPING, PROVINCE_REGIONS
+
+REQUIRED = 'required'
+EXPECTED = 'expected'
+OPTIONAL = 'optional'
+
+ERROR = 'error'
+WARNING = 'warning'
+
+NUMBER_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+ROW_LIMIT = 5
+
+PROVINCES = frozenset(province for provinces in PROVINCE_REGIONS.values() for province in provinces)
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Aturan satu kolom. `presence`: REQUIRED (error jika hilang), EXPECTED (peringatan), OPTIONAL."""
+
+    name: str
+    kind: str = 'number'
+    presence: str = EXPECTED
+    min_value: float = None
+    max_value: float = None
+    allowed: frozenset = None
+
+
+@dataclass(frozen=True)
+class Schema:
+    columns: tuple
+    aliases: dict = field(default_factory=dict)
+
+    def spec(self, name):
+        """Spesifikasi kolom dari nama bersih atau nama mentahnya, atau None."""
+        name = self.aliases.get(name, name)
+        for spec in self.columns:
+            if spec.name == name:
+                return spec
+        return None
+
+
+PERCENT = {'min_value': 0.0, 'max_value': 100.0}
+
+DATA_SCHEMA = Schema((
+    ColumnSpec('Provinsi', 'text', REQUIRED, allowed=PROVINCES),
+    ColumnSpec('Kab/Kota', 'text'),
+    ColumnSpec('Persentase Kemiskinan (P0)', presence=REQUIRED, **PERCENT),
+    ColumnSpec('Rata-Rata Lama Sekolah', min_value=0.0, max_value=25.0),
+    ColumnSpec('Pengeluaran Per Kapita', min_value=0.0),
+    ColumnSpec('Indeks Pembangunan Manusia', **PERCENT),
+    ColumnSpec('Umur Harapan Hidup', min_value=0.0, max_value=120.0),
+    ColumnSpec('Akses Sanitasi Layak', **PERCENT),
+    ColumnSpec('Akses Air Minum Layak', **PERCENT),
+    ColumnSpec('Tingkat Pengangguran Terbuka', **PERCENT),
+    ColumnSpec('Tingkat Partisipasi Angkatan Kerja', **PERCENT),
+    ColumnSpec('PDRB', min_value=0.0),
+    ColumnSpec('Klasifikasi Kemiskinan', presence=OPTIONAL, min_value=0.0, max_value=1.0),
+), aliases=COLUMN_MAPPING)
+
+RULE_MESSAGES = {
+    'missing_column': "kolom tidak ditemukan",
+    'empty': "nilai kosong",
+    'not_number': "nilai numerik tidak valid",
+    'below_min': "nilai di bawah {min_value:g}",
+    'above_max': "nilai di atas {max_value:g}",
+    'unknown_value': "nilai tidak dikenal",
+    'missing_values': "nilai yang diharapkan tidak ada",
+}
+
+
+@dataclass(frozen=True)
+class Violation:
+    column: str
+    rule: str
+    severity: str
+    rows: tuple = ()
+    values: tuple = ()
+
+    def message(self, schema=DATA_SCHEMA, limit=ROW_LIMIT):
+        spec = schema.spec(self.column)
+        text = RULE_MESSAGES[self.rule].format(
+            min_value=getattr(spec, 'min_value', 0) or 0, max_value=getattr(spec, 'max_value', 0) or 0
+        )
+        message = f"Kolom {self.column}: {text}"
+        if self.values:
+            message += f" ({', '.join(self.values[:limit])}{', ...' if len(self.values) > limit else ''})"
+        if self.rows:
+            message += f" pada {len(self.rows):,} baris: {list(self.rows[:limit])}"
+        return message
+
+
+def parse_numbers(values):
+    """
+    Urai teks angka (desimal koma atau titik, sudah di-trim) menjadi float64.
+
+    Mengembalikan (angka, mask_tidak_valid); sel kosong menjadi null tanpa
+    dianggap tidak valid, dan nilai tidak valid juga menjadi null.
+    """
+    if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+        return pc.cast(values, pa.float64()), None
+    text = pc.replace_substring(values, ',', '.')
+    text = pc.if_else(pc.equal(text, ''), pa.scalar(None, values.type), text)
+    try:
+        return pc.cast(text, pa.float64()), None
+    except pa.ArrowInvalid:
+        invalid = pc.invert(pc.fill_null(pc.match_substring_regex(text, NUMBER_PATTERN), True))
+        text = pc.if_else(invalid, pa.scalar(None, values.type), text)
+        return pc.cast(text, pa.float64()), invalid
+
+
+def mask_rows(mask, row_numbers):
+    if mask is None:
+        return None
+    mask = pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+    return row_numbers[mask] if mask.any() else None
+
+
+class ValidationReport:
+    """Pelanggaran yang dikumpulkan dari satu atau banyak blok data."""
+
+    def __init__(self, schema=DATA_SCHEMA):
+        self.schema = schema
+        self.rows = 0
+        self._rows = {}
+        self._values = {}
+        self._seen = {}
+        self._columns = set()
+
+    def add(self, column, rule, severity, rows=None, values=()):
+        key = (column, rule, severity)
+        self._rows.setdefault(key, [])
+        if rows is not None and len(rows):
+            self._rows[key].append(np.asarray(rows, dtype=np.int64))
+        if values:
+            self._values.setdefault(key, set()).update(values)
+
+    def check_header(self, names):
+        """Catat kolom skema yang tidak ada di header (sekali per sumber)."""
+        present = {self.schema.aliases.get(name, name) for name in names}
+        for spec in self.schema.columns:
+            if spec.name not in present and spec.presence != OPTIONAL:
+                self.add(spec.name, 'missing_column', ERROR if spec.presence == REQUIRED else WARNING)
+
+    def check_columns(self, columns, row_numbers):
+        """
+        Periksa satu blok kolom (teks ter-trim atau numerik) lalu kembalikan kolom terurai.
+
+        Kolom angka dikembalikan sebagai float64 dengan null untuk sel kosong
+        atau tidak valid; kolom di luar skema diperlakukan sebagai angka opsional.
+        """
+        self.rows += len(row_numbers)
+        parsed = {}
+        for name, values in columns.items():
+            spec = self.schema.spec(name) or ColumnSpec(name, presence=OPTIONAL)
+            self._columns.add(spec.name)
+            if spec.kind == 'text':
+                parsed[name] = self._check_text(spec, values, row_numbers)
+            else:
+                parsed[name] = self._check_number(spec, values, row_numbers)
+        return parsed
+
+    def _check_text(self, spec, values, row_numbers):
+        empty = pc.or_kleene(pc.is_null(values), pc.equal(values, ''))
+        rows = mask_rows(empty, row_numbers)
+        if rows is not None:
+            self.add(spec.name, 'empty', ERROR if spec.presence == REQUIRED else WARNING, rows)
+        if spec.allowed is not None:
+            unique = {value for value in pc.unique(values).to_pylist() if value}
+            self._seen.setdefault(spec.name, set()).update(unique)
+            unknown = unique - spec.allowed
+            if unknown:
+                mask = pc.invert(pc.is_in(values, value_set=pa.array(sorted(spec.allowed))))
+                rows = mask_rows(pc.and_(mask, pc.invert(empty)), row_numbers)
+                self.add(spec.name, 'unknown_value', WARNING, rows, unknown)
+        return values
+
+    def _check_number(self, spec, values, row_numbers):
+        numbers, invalid = parse_numbers(values)
+        rows = mask_rows(invalid, row_numbers)
+        if rows is not None:
+            self.add(spec.name, 'not_number', ERROR, rows)
+        empty = pc.is_null(numbers) if invalid is None else pc.and_(pc.is_null(numbers), pc.invert(invalid))
+        if numbers.null_count:
+            rows = mask_rows(empty, row_numbers)
+            if rows is not None:
+                self.add(spec.name, 'empty', ERROR, rows)
+        if spec.min_value is not None:
+            rows = mask_rows(pc.less(numbers, spec.min_value), row_numbers)
+            if rows is not None:
+                self.add(spec.name, 'below_min', WARNING, rows)
+        if spec.max_value is not None:
+            rows = mask_rows(pc.greater(numbers, spec.max_value), row_numbers)
+            if rows is not None:
+                self.add(spec.name, 'above_max', WARNING, rows)
+        return numbers
+
+    @property
+    def violations(self):
+        violations = [
+            Violation(
+                column, rule, severity,
+                tuple(np.concatenate(parts).tolist()) if parts else (),
+                tuple(sorted(self._values.get((column, rule, severity), ()))),
+            )
+            for (column, rule, severity), parts in self._rows.items()
+        ]
+        # Cakupan himpunan nilai (misalnya 34 provinsi GeoJSON) baru bisa dinilai setelah semua blok.
+        for spec in self.schema.columns:
+            if spec.allowed is not None and spec.name in self._columns and self.rows:
+                missing = spec.allowed - self._seen.get(spec.name, set())
+                if missing:
+                    violations.append(Violation(spec.name, 'missing_values', WARNING, values=tuple(sorted(missing))))
+        return violations
+
+    @property
+    def errors(self):
+        return [violation for violation in self.violations if violation.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [violation for violation in self.violations if violation.severity == WARNING]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self, severity=None, limit=ROW_LIMIT):
+        return '\n'.join(
+            violation.message(self.schema, limit) for violation in self.violations
+            if severity is None or violation.severity == severity
+        )
+
+    def raise_for_errors(self):
+        """Lempar ValueError berisi semua error sekaligus."""
+        if not self.ok:
+            raise ValueError(f"Data tidak valid:\n{self.summary(ERROR)}")
+
+
+def validate_frame(df, schema=DATA_SCHEMA, first_row=2):
+    """
+    Validasi DataFrame (nama kolom bersih atau mentah).
+
+    Nomor baris dihitung dari posisi baris ditambah `first_row` (baris 2 =
+    baris data pertama di file dengan header).
+    """
+    report = ValidationReport(schema)
+    report.check_header(df.columns)
+    columns = {}
+    for name in df.columns:
+        spec = schema.spec(name)
+        if spec is None:
+            continue
+        values = pa.array(df[name], from_pandas=True)
+        if spec.kind == 'text' and not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+            values = pc.cast(values, pa.string())
+        columns[name] = values
+    report.check_columns(columns, np.arange(len(df), dtype=np.int64) + first_row)
+    return report
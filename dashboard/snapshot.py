@@ -0,0 +1,131 @@
+"""
+Snapshot biner (Arrow IPC) dari dataset bersih.
+
+Snapshot menyimpan hasil `clean_dataframe` dengan tipe kolom yang sudah final,
+sehingga aplikasi cukup me-memory-map file ini alih-alih mem-parsing CSV dan
+mengonversi ulang setiap kolom numerik. Setiap snapshot membawa hash SHA-256
+dari CSV sumber dan versi pipeline; jika salah satunya tidak cocok, snapshot
+dianggap kedaluwarsa dan pemanggil kembali ke jalur CSV.
+
+Build manual:
+
+    python -m dashboard.snapshot
+"""
+from pathlib import Path
+import argparse
+
+import pyarrow as pa
+
+from dashboard import ingest
+from dashboard.config import CACHE_DIR, DATA_PATH, NUMERIC_COLUMNS, PIPELINE_VERSION
+from dashboard.fingerprint import fingerprint
+from dashboard.fsutil import write_atomic
+from dashboard.pipeline import clean_dataframe
+
+SNAPSHOT_DIR = CACHE_DIR / 'snapshot'
+
+META_SOURCE_SHA256 = b'source_sha256'
+META_PIPELINE_VERSION = b'pipeline_version'
+META_SOURCE_NAME = b'source_name'
+
+
+def source_digest(path):
+    """Hash SHA-256 isi CSV sumber (diingat selama file tidak berubah)."""
+    return fingerprint(path, with_digest=True).digest
+
+
+def snapshot_path_for(source_path, snapshot_dir=None):
+    """Lokasi default snapshot untuk sebuah CSV sumber."""
+    snapshot_dir = Path(snapshot_dir) if snapshot_dir is not None else SNAPSHOT_DIR
+    return snapshot_dir / f"{Path(source_path).stem}.arrow"
+
+
+def validate_snapshot_frame(df_processed):
+    """Pastikan frame snapshot punya tipe kolom yang diharapkan aplikasi."""
+    if 'Provinsi' not in df_processed.columns:
+        raise ValueError("Snapshot tidak memiliki kolom Provinsi.")
+
+    invalid_columns = [
+        col for col in NUMERIC_COLUMNS
+        if col in df_processed.columns and df_processed[col].dtype != 'float64'
+    ]
+    if invalid_columns:
+        raise ValueError(f"Tipe kolom snapshot tidak valid: {', '.join(invalid_columns)}")
+
+
+def write_snapshot(df_processed, snapshot_path, source_sha256, source_name=''):
+    """Tulis frame bersih ke file Arrow IPC secara atomik."""
+    validate_snapshot_frame(df_processed)
+    table = pa.Table.from_pandas(df_processed, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        META_SOURCE_SHA256: source_sha256.encode(),
+        META_PIPELINE_VERSION: PIPELINE_VERSION.encode(),
+        META_SOURCE_NAME: source_name.encode(),
+    })
+
+    def write(sink):
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    # Tulis ke file sementara lalu rename agar worker lain tidak membaca file setengah jadi.
+    return write_atomic(snapshot_path, write)
+
+
+def read_snapshot_metadata(snapshot_path):
+    """Baca metadata snapshot tanpa memuat datanya."""
+    with pa.memory_map(str(snapshot_path), 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()}
+
+
+def load_snapshot(source_path, snapshot_path=None, source_sha256=None):
+    """
+    Memuat snapshot yang masih sesuai dengan CSV sumber.
+
+    Mengembalikan None jika snapshot belum ada, rusak, atau kedaluwarsa.
+    """
+    snapshot_path = Path(snapshot_path) if snapshot_path is not None else snapshot_path_for(source_path)
+    if not snapshot_path.exists():
+        return None
+
+    if source_sha256 is None:
+        source_sha256 = source_digest(source_path)
+
+    try:
+        with pa.memory_map(str(snapshot_path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            if (metadata.get(META_SOURCE_SHA256) != source_sha256.encode()
+                    or metadata.get(META_PIPELINE_VERSION) != PIPELINE_VERSION.encode()):
+                return None
+            table = reader.read_all()
+        df_processed = table.to_pandas(split_blocks=True)
+        validate_snapshot_frame(df_processed)
+    except (OSError, pa.ArrowInvalid, ValueError):
+        return None
+    return df_processed
+
+
+def build_snapshot(source_path=DATA_PATH, snapshot_path=None):
+    """Kompilasi CSV bersih menjadi snapshot yang tervalidasi."""
+    source_path = Path(source_path)
+    snapshot_path = Path(snapshot_path) if snapshot_path is not None else snapshot_path_for(source_path)
+    source_sha256 = source_digest(source_path)
+    df_processed = clean_dataframe(ingest.read_source(source_path))
+    write_snapshot(df_processed, snapshot_path, source_sha256, source_path.name)
+    return snapshot_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompilasi dataset bersih menjadi snapshot Arrow.")
+    parser.add_argument('source', nargs='?', default=str(DATA_PATH), help="CSV bersih sumber.")
+    parser.add_argument('--output', default=None, help="Lokasi file snapshot (.arrow).")
+    args = parser.parse_args(argv)
+
+    snapshot_path = build_snapshot(args.source, args.output)
+    print(f"Snapshot berhasil disimpan di: {snapshot_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,525 @@
+"""
+Vector tile (Mapbox Vector Tile v2) offline untuk peta choropleth.
+
+Alih-alih mengirim seluruh geometri sebagai GeoJSON inline di HTML peta,
+batas provinsi (dan kabupaten/kota jika GeoJSON-nya tersedia) dipotong
+menjadi tile `.pbf` per zoom dengan properti indikator, warna isi, dan teks
+popup yang sudah jadi. Browser hanya mengambil tile yang terlihat.
+
+Setiap zoom memakai varian geometri dari `dashboard.geometry` (disederhanakan
+per arc bersama sehingga tidak ada celah antarprovinsi), lalu diproyeksikan ke
+Web Mercator, dipotong ke batas tile plus buffer, dan dikuantisasi ke grid
+`EXTENT`. Tile kosong tidak ditulis; Leaflet.VectorGrid memperlakukan 404
+sebagai tile kosong.
+
+Hasilnya ditulis di `static/tiles/<versi>/{z}/{x}/{y}.pbf` beserta
+`metadata.json`, sehingga bisa disajikan oleh static serving Streamlit
+(`server.enableStaticServing`) atau server file statis apa pun. Build manual:
+
+    python -m dashboard.tiles
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard import geometry
+from dashboard.config import PIPELINE_VERSION, TILE_DIR, TILE_MAX_AGE
+
+TILE_FORMAT_VERSION = '2'
+EXTENT = 4096
+BUFFER = 64
+MAX_LATITUDE = 85.0511287798
+PROVINCE_LAYER = 'provinces'
+DISTRICT_LAYER = 'districts'
+# Properti nama layer di setiap feature; ID feature di browser = '<layer>:<name>'.
+LAYER_PROPERTY = 'layer'
+PROVINCE_ZOOMS = (3, 8)
+DISTRICT_ZOOMS = (7, 10)
+METADATA_NAME = 'metadata.json'
+# Jumlah tileset terakhir dipakai yang selalu disimpan, berapa pun umurnya.
+KEEP_LATEST = 8
+
+# Perintah geometri MVT.
+MOVE_TO = 1
+LINE_TO = 2
+CLOSE_PATH = 7
+POLYGON = 3
+
+
+@dataclass(frozen=True)
+class TileLayer:
+    """
+    Satu layer tile: geometri per zoom dan properti per feature.
+
+    `geojson_for_zoom(z)` harus mengembalikan FeatureCollection dengan urutan
+    feature yang sama seperti `properties`.
+    """
+
+    name: str
+    geojson_for_zoom: object
+    properties: list
+    min_zoom: int
+    max_zoom: int
+
+
+# --- Encoder protobuf minimal ---
+
+def encode_varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def field_key(number, wire_type):
+    return encode_varint((number << 3) | wire_type)
+
+
+def length_delimited(number, payload):
+    return field_key(number, 2) + encode_varint(len(payload)) + payload
+
+
+def packed_varints(number, values):
+    return length_delimited(number, b''.join(encode_varint(value) for value in values))
+
+
+def encode_value(value):
+    """Encode `Tile.Value`: teks sebagai string_value, angka sebagai double_value."""
+    if isinstance(value, str):
+        return length_delimited(1, value.encode('utf-8'))
+    return field_key(3, 1) + struct.pack('<d', float(value))
+
+
+def encode_geometry(rings):
+    """Perintah geometri poligon untuk ring bertipe int (tanpa titik penutup)."""
+    commands = []
+    cursor_x = cursor_y = 0
+    for ring in rings:
+        deltas = np.diff(ring, axis=0, prepend=[[cursor_x, cursor_y]])
+        cursor_x, cursor_y = (int(value) for value in ring[-1])
+        encoded = [zigzag(int(value)) for value in deltas.ravel()]
+        commands.append((1 << 3) | MOVE_TO)
+        commands.extend(encoded[:2])
+        commands.append(((len(ring) - 1) << 3) | LINE_TO)
+        commands.extend(encoded[2:])
+        commands.append((1 << 3) | CLOSE_PATH)
+    return commands
+
+
+def encode_layer(name, features):
+    """Encode satu layer dari daftar (id, properti, rings)."""
+    keys, values = {}, {}
+    encoded_features = []
+    for feature_id, properties, rings in features:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value) is str, value), len(values)))
+        body = (
+            field_key(1, 0) + encode_varint(feature_id)
+            + packed_varints(2, tags)
+            + field_key(3, 0) + encode_varint(POLYGON)
+            + packed_varints(4, encode_geometry(rings))
+        )
+        encoded_features.append(length_delimited(2, body))
+
+    layer = field_key(15, 0) + encode_varint(2) + length_delimited(1, name.encode('utf-8'))
+    layer += b''.join(encoded_features)
+    layer += b''.join(length_delimited(3, key.encode('utf-8')) for key in keys)
+    layer += b''.join(length_delimited(4, encode_value(value)) for _, value in values)
+    layer += field_key(5, 0) + encode_varint(EXTENT)
+    return layer
+
+
+def encode_tile(layers):
+    """Encode tile dari daftar (nama layer, features)."""
+    return b''.join(length_delimited(3, encode_layer(name, features)) for name, features in layers if features)
+
+
+# --- Proyeksi dan pemotongan ---
+
+def project(coords):
+    """Lon/lat (derajat) ke koordinat dunia Web Mercator dalam rentang [0, 1]."""
+    coords = np.asarray(coords, dtype=float)
+    lon = coords[:, 0]
+    lat = np.radians(np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE))
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4 + lat / 2)) / (2 * np.pi)
+    return np.column_stack([x, y])
+
+
+def clip_ring(points, minimum, maximum):
+    """
+    Potong ring terbuka ke kotak [minimum, maximum] di kedua sumbu (Sutherland-Hodgman).
+
+    Setiap sisi kotak diproses sekaligus untuk semua titik dengan numpy.
+    """
+    for axis in (0, 1):
+        for bound, keep_below in ((minimum, False), (maximum, True)):
+            if len(points) == 0:
+                return points
+            values = points[:, axis]
+            inside = values <= bound if keep_below else values >= bound
+            if inside.all():
+                continue
+            previous = np.roll(points, 1, axis=0)
+            previous_inside = np.roll(inside, 1)
+            crossing = inside != previous_inside
+
+            # Titik potong untuk setiap sisi (previous -> current) yang melintasi batas.
+            delta = points[crossing] - previous[crossing]
+            ratio = (bound - previous[crossing, axis]) / delta[:, axis]
+            intersections = previous[crossing] + delta * ratio[:, None]
+
+            counts = crossing.astype(int) + inside.astype(int)
+            offsets = np.cumsum(counts) - counts
+            clipped = np.empty((counts.sum(), 2))
+            clipped[offsets[crossing]] = intersections
+            clipped[offsets[inside] + crossing[inside]] = points[inside]
+            points = clipped
+    return points
+
+
+def signed_area(ring):
+    """Luas bertanda ring di sistem koordinat tile (y ke bawah); positif = searah jarum jam."""
+    x, y = ring[:, 0].astype(float), ring[:, 1].astype(float)
+    return (np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+
+def tile_ring(world_ring, zoom, x, y, exterior):
+    """Ring dunia ke ring int di tile (z, x, y), atau None jika kolaps setelah dipotong."""
+    scale = 2 ** zoom
+    local = (world_ring * scale - (x, y)) * EXTENT
+    clipped = clip_ring(local, -BUFFER, EXTENT + BUFFER)
+    if len(clipped) < 3:
+        return None
+    ring = np.round(clipped).astype(np.int64)
+    changed = np.any(ring != np.roll(ring, 1, axis=0), axis=1)
+    ring = ring[changed]
+    if len(ring) < 3:
+        return None
+    area = signed_area(ring)
+    if area == 0:
+        return None
+    # Spesifikasi MVT v2: ring luar searah jarum jam (luas positif), lubang sebaliknya.
+    if (area > 0) != exterior:
+        ring = ring[::-1]
+    return ring
+
+
+def tile_range(bounds, zoom):
+    """Rentang indeks tile (x0, y0, x1, y1) yang bersinggungan dengan bbox dunia plus buffer."""
+    scale = 2 ** zoom
+    margin = BUFFER / EXTENT
+    min_x, min_y, max_x, max_y = bounds
+    x0 = max(int(math.floor(min_x * scale - margin)), 0)
+    y0 = max(int(math.floor(min_y * scale - margin)), 0)
+    x1 = min(int(math.floor(max_x * scale + margin)), scale - 1)
+    y1 = min(int(math.floor(max_y * scale + margin)), scale - 1)
+    return x0, y0, x1, y1
+
+
+def layer_tiles(layer, zoom):
+    """Potong satu layer untuk satu zoom; mengembalikan {(x, y): [(id, properti, rings)]}."""
+    tiles = {}
+    geojson_data = layer.geojson_for_zoom(zoom)
+    for feature_id, (feature, properties) in enumerate(zip(geojson_data['features'], layer.properties)):
+        for polygon in geometry.iter_polygons(feature['geometry']):
+            # Titik penutup GeoJSON dibuang; ring MVT ditutup dengan ClosePath.
+            world_rings = [project(ring[:-1]) for ring in polygon if len(ring) >= 4]
+            if not world_rings:
+                continue
+            exterior = world_rings[0]
+            bounds = (*exterior.min(axis=0), *exterior.max(axis=0))
+            x0, y0, x1, y1 = tile_range(bounds, zoom)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    outer = tile_ring(exterior, zoom, x, y, exterior=True)
+                    if outer is None:
+                        continue
+                    rings = [outer]
+                    for hole in world_rings[1:]:
+                        ring = tile_ring(hole, zoom, x, y, exterior=False)
+                        if ring is not None:
+                            rings.append(ring)
+                    features = tiles.setdefault((x, y), {})
+                    # Semua poligon satu feature di tile yang sama menjadi satu feature MVT.
+                    features.setdefault(
+                        feature_id, (feature_id + 1, {LAYER_PROPERTY: layer.name, **properties}, [])
+                    )[2].extend(rings)
+    return {key: list(features.values()) for key, features in tiles.items()}
+
+
+# --- Tileset di disk ---
+
+def tileset_version(*parts):
+    key = ':'.join([TILE_FORMAT_VERSION, PIPELINE_VERSION, *map(str, parts)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def write_tiles(layers, output_dir):
+    """Tulis semua tile untuk semua layer ke `output_dir`; mengembalikan metadata."""
+    output_dir = Path(output_dir)
+    zooms = sorted({zoom for layer in layers for zoom in range(layer.min_zoom, layer.max_zoom + 1)})
+    tile_count = total_bytes = 0
+    for zoom in zooms:
+        per_tile = {}
+        for layer in layers:
+            if layer.min_zoom <= zoom <= layer.max_zoom:
+                for key, features in layer_tiles(layer, zoom).items():
+                    per_tile.setdefault(key, []).append((layer.name, features))
+        for (x, y), tile_layers in per_tile.items():
+            data = encode_tile(tile_layers)
+            if not data:
+                continue
+            path = output_dir / str(zoom) / str(x) / f"{y}.pbf"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            tile_count += 1
+            total_bytes += len(data)
+
+    return {
+        'format': 'pbf',
+        'min_zoom': zooms[0] if zooms else None,
+        'max_zoom': zooms[-1] if zooms else None,
+        'layers': [
+            {
+                'id': layer.name,
+                'min_zoom': layer.min_zoom,
+                'max_zoom': layer.max_zoom,
+                'fields': sorted({key for properties in layer.properties for key in properties}),
+            }
+            for layer in layers
+        ],
+        'tiles': tile_count,
+        'bytes': total_bytes,
+    }
+
+
+def read_metadata(path):
+    try:
+        with Path(path).open(encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def touch_tileset(version, tile_dir=None):
+    """Tandai tileset baru saja dipakai (mtime metadata); False jika direktorinya sudah tidak ada."""
+    tile_dir = Path(tile_dir) if tile_dir is not None else TILE_DIR
+    try:
+        os.utime(tile_dir / version / METADATA_NAME)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # Folder static read-only: tileset tetap ada, hanya waktu pakainya tidak tercatat.
+        pass
+    return True
+
+
+def remove_stale_tilesets(tile_dir, keep=(), max_age=TILE_MAX_AGE, keep_latest=KEEP_LATEST, now=None):
+    """
+    Hapus tileset yang lama tidak dipakai (LRU menurut mtime metadata).
+
+    `keep` dan `keep_latest` tileset yang terakhir dipakai tidak pernah dihapus;
+    sisanya dihapus hanya jika tidak dipakai lebih dari `max_age` detik, karena
+    worker lain, mode bobot, atau tahun lain bisa masih menyajikannya.
+    Direktori build sementara (`.xxx-`) dibiarkan.
+    """
+    now = time.time() if now is None else now
+    tilesets = []
+    for path in Path(tile_dir).iterdir():
+        if not path.is_dir() or path.name.startswith('.'):
+            continue
+        try:
+            used_at = (path / METADATA_NAME).stat().st_mtime
+        except FileNotFoundError:
+            used_at = path.stat().st_mtime
+        tilesets.append((used_at, path))
+    tilesets.sort(reverse=True)
+
+    removed = []
+    for used_at, path in tilesets[keep_latest:]:
+        if path.name not in keep and now - used_at > max_age:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+    return sorted(removed)
+
+
+def load_tileset(layers, version, tile_dir=None, prune=True):
+    """
+    Memuat metadata tileset dari disk, atau membangunnya jika belum ada.
+
+    Tileset dibangun di direktori sementara lalu di-rename sekaligus, sehingga
+    browser atau worker lain tidak pernah melihat tileset setengah jadi.
+    Setiap pemuatan menandai tileset sebagai baru dipakai; setelah versi baru
+    dibangun, tileset yang lama tidak dipakai dihapus (`prune`, lihat
+    `remove_stale_tilesets`).
+    """
+    tile_dir = Path(tile_dir) if tile_dir is not None else TILE_DIR
+    target = tile_dir / version
+    metadata = read_metadata(target / METADATA_NAME)
+    if metadata is not None:
+        touch_tileset(version, tile_dir)
+        return metadata
+
+    tile_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=tile_dir, prefix=f".{version}-"))
+    try:
+        metadata = {'version': version, **write_tiles(layers, tmp_dir)}
+        (tmp_dir / METADATA_NAME).write_text(json.dumps(metadata, indent=2), encoding='utf-8')
+        for path in [tmp_dir, *tmp_dir.rglob('*')]:
+            os.chmod(path, 0o755 if path.is_dir() else 0o644)
+        try:
+            os.rename(tmp_dir, target)
+        except OSError:
+            # Worker lain sudah lebih dulu menulis tileset yang sama.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    if prune:
+        remove_stale_tilesets(tile_dir, keep=(version,))
+    return metadata
+
+
+def tile_url(version, base_url='', tile_dir=None, static_dir=None):
+    """Template URL `{z}/{x}/{y}` untuk tileset di bawah static serving Streamlit."""
+    tile_dir = Path(tile_dir) if tile_dir is not None else TILE_DIR
+    static_dir = Path(static_dir) if static_dir is not None else tile_dir.parent
+    relative = (tile_dir / version).relative_to(static_dir).as_posix()
+    prefix = f"/{base_url.strip('/')}" if base_url.strip('/') else ''
+    return f"{prefix}/app/static/{relative}/{{z}}/{{x}}/{{y}}.pbf"
+
+
+# --- Layer dashboard ---
+
+def variant_loader(geojson_data, geometry_version):
+    """Fungsi zoom -> varian geometri yang sesuai, dengan cache per level."""
+    variants = {}
+
+    def geojson_for_zoom(zoom):
+        level = geometry.level_for_zoom(zoom)
+        if level not in variants:
+            variants[level] = geometry.load_variant(geojson_data, geometry_version, level)
+        return variants[level]
+
+    return geojson_for_zoom
+
+
+def province_layer(cube, geojson_data, geometry_version, fill_colors):
+    """Layer provinsi: properti popup dari kubus ditambah warna isi choropleth."""
+    properties = []
+    for feature in cube.geojson_data['features']:
+        feature_properties = {
+            key: value for key, value in feature['properties'].items() if isinstance(value, (str, int, float))
+        }
+        feature_properties['fill'] = fill_colors.get(feature['properties'].get('name'))
+        properties.append(feature_properties)
+    return TileLayer(
+        PROVINCE_LAYER, variant_loader(geojson_data, geometry_version), properties, *PROVINCE_ZOOMS
+    )
+
+
+def district_key(name):
+    """Nama kab/kota ternormalisasi untuk mencocokkan data dengan GeoJSON."""
+    name = str(name).upper().strip()
+    for prefix in ('KABUPATEN ', 'KAB. ', 'KAB '):
+        if name.startswith(prefix):
+            return name[len(prefix):].strip()
+    return name
+
+
+def district_layer(geojson_data, geometry_version, key_property, fill_colors, formats):
+    """
+    Layer kabupaten/kota dari GeoJSON batas kab/kota yang disediakan pengguna.
+
+    `fill_colors` dan `formats` dipetakan dari `district_key`; feature tanpa data
+    tetap ditulis dengan warna kosong.
+    """
+    properties = []
+    for feature in geojson_data['features']:
+        name = feature.get('properties', {}).get(key_property, '')
+        key = district_key(name)
+        properties.append({'name': str(name), **formats.get(key, {}), 'fill': fill_colors.get(key)})
+    return TileLayer(
+        DISTRICT_LAYER, variant_loader(geojson_data, geometry_version), properties, *DISTRICT_ZOOMS
+    )
+
+
+def district_formats(df_processed, property_formats):
+    """Teks popup per kab/kota dengan format yang sama seperti kubus provinsi."""
+    formats = {}
+    keys = df_processed['Kab/Kota'].map(district_key)
+    for prop, column, template in property_formats:
+        if column not in df_processed.columns:
+            continue
+        for key, value in zip(keys, df_processed[column]):
+            if not pd.isna(value):
+                formats.setdefault(key, {})[prop] = template.format(value)
+    return formats
+
+
+def main(argv=None):
+    from dashboard import loader, province_cube
+    from dashboard.config import (
+        DATA_PATH, DISTRICT_GEOJSON_KEY, DISTRICT_GEOJSON_PATH, LOCAL_GEOJSON_PATH,
+    )
+    from dashboard.data_store import DataStore
+    from dashboard.map_builder import district_fill_colors, feature_fill_colors
+    from dashboard.snapshot import source_digest
+
+    parser = argparse.ArgumentParser(description="Bangun vector tile peta provinsi dan kabupaten/kota.")
+    parser.add_argument('--district-geojson', default=DISTRICT_GEOJSON_PATH, help="GeoJSON batas kab/kota.")
+    parser.add_argument('--district-key', default=DISTRICT_GEOJSON_KEY, help="Properti nama kab/kota.")
+    args = parser.parse_args(argv)
+
+    dataset = loader.DatasetLoader(DataStore()).load(DATA_PATH)
+    with Path(LOCAL_GEOJSON_PATH).open(encoding='utf-8') as file:
+        geojson_data = json.load(file)
+    geometry_version = source_digest(LOCAL_GEOJSON_PATH)
+    cube = province_cube.load_province_cube(dataset.df_provinsi, geojson_data, dataset.version, geometry_version)
+    _, fill_colors = feature_fill_colors(cube.df_provinsi, geojson_data)
+    layers = [province_layer(cube, geojson_data, geometry_version, fill_colors)]
+    version_parts = [cube.version]
+
+    if args.district_geojson:
+        with Path(args.district_geojson).open(encoding='utf-8') as file:
+            district_geojson = json.load(file)
+        district_version = source_digest(args.district_geojson)
+        _, district_colors = district_fill_colors(dataset.df_processed)
+        formats = district_formats(dataset.df_processed, province_cube.PROPERTY_FORMATS)
+        layers.append(district_layer(
+            district_geojson, district_version, args.district_key, district_colors, formats
+        ))
+        version_parts += [district_version, args.district_key]
+
+    version = tileset_version(*version_parts)
+    metadata = load_tileset(layers, version)
+    print(f"Tileset {version}: {metadata['tiles']} tile, {metadata['bytes']:,} byte di {TILE_DIR / version}")
+
+
+if __name__ == '__main__':
+    main()
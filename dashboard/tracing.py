@@ -0,0 +1,177 @@
+"""
+Tracing ringan untuk jalur panas dashboard.
+
+Satu rerun Streamlit menjadi satu trace berisi span bertingkat: durasi,
+status cache (hit/miss/disk), byte yang dikirim ke frontend, dan puncak RSS
+proses saat span selesai. Trace disimpan di `contextvars`, sehingga setiap
+sesi (thread script runner) punya trace sendiri. Jika tidak ada trace aktif,
+`span()` mengembalikan objek no-op bersama tanpa alokasi, jadi biaya
+instrumentasi saat nonaktif hanya satu pembacaan context variable.
+
+Trace yang selesai bisa ditampilkan di panel Performance dan/atau ditulis
+sebagai satu baris log JSON per rerun (logger `dashboard.tracing`).
+"""
+from dataclasses import dataclass, field
+import contextvars
+import json
+import logging
+import sys
+import time
+import uuid
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger('dashboard.tracing')
+
+_active_trace = contextvars.ContextVar('dashboard_trace', default=None)
+
+
+def peak_rss_mb():
+    """Puncak RSS proses (MB), atau None jika platform tidak mendukung."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte.
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class NullSpan:
+    """Span no-op yang dipakai saat tracing nonaktif; atribut yang di-set diabaikan."""
+
+    __slots__ = ()
+    enabled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+@dataclass(eq=False)
+class Span:
+    """Satu span dalam trace; gunakan lewat `span()` sebagai context manager."""
+
+    trace: 'Trace' = field(repr=False)
+    name: str
+    depth: int = 0
+    cache: str = None
+    bytes: int = None
+    duration_ms: float = None
+    peak_rss_mb: float = None
+    started: float = field(default=0.0, repr=False)
+    enabled = True
+
+    def __enter__(self):
+        self.depth = len(self.trace.stack)
+        self.trace.stack.append(self)
+        self.trace.spans.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 3)
+        self.peak_rss_mb = peak_rss_mb()
+        self.trace.stack.pop()
+        return False
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'duration_ms': self.duration_ms,
+            'cache': self.cache,
+            'bytes': self.bytes,
+            'peak_rss_mb': self.peak_rss_mb,
+        }
+
+
+@dataclass(eq=False)
+class Trace:
+    """Kumpulan span untuk satu rerun."""
+
+    name: str
+    log: bool = False
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    started_at: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter, repr=False)
+    total_ms: float = None
+    spans: list = field(default_factory=list)
+    stack: list = field(default_factory=list, repr=False)
+    token: object = field(default=None, repr=False)
+
+    def to_dict(self):
+        return {
+            'event': 'rerun',
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'started_at': round(self.started_at, 3),
+            'total_ms': self.total_ms,
+            'peak_rss_mb': peak_rss_mb(),
+            'spans': [span.to_dict() for span in self.spans],
+        }
+
+
+def start_trace(name, log=False):
+    """Mulai trace untuk rerun ini dan jadikan trace aktif di context saat ini."""
+    trace = Trace(name, log=log)
+    trace.token = _active_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace):
+    """Tutup trace, lepaskan dari context, dan tulis log JSON jika diminta."""
+    trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 3)
+    _active_trace.reset(trace.token)
+    if trace.log:
+        logger.info(json.dumps(trace.to_dict(), ensure_ascii=False))
+    return trace
+
+
+def current_trace():
+    return _active_trace.get()
+
+
+def is_enabled():
+    """True jika ada trace aktif; pakai untuk melewati pengukuran yang mahal."""
+    return _active_trace.get() is not None
+
+
+def span(name, **attrs):
+    """Context manager span baru di trace aktif, atau NULL_SPAN jika tracing nonaktif."""
+    trace = _active_trace.get()
+    if trace is None:
+        return NULL_SPAN
+    new_span = Span(trace, name)
+    for key, value in attrs.items():
+        setattr(new_span, key, value)
+    return new_span
+
+
+def annotate(**attrs):
+    """Set atribut (misalnya `cache='miss'`) pada span terdalam yang sedang berjalan."""
+    trace = _active_trace.get()
+    if trace is None or not trace.stack:
+        return
+    for key, value in attrs.items():
+        setattr(trace.stack[-1], key, value)
+
+
+def configure_logging(stream=None):
+    """Pasang handler satu-baris-JSON untuk logger tracing (idempoten)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
@@ -0,0 +1,142 @@
+"""
+Pemanasan awal proses worker dan pengukuran cold start.
+
+Saat proses baru melayani sesi pertama, aset berat (snapshot dataset, varian
+GeoJSON peta, artefak model) dimuat bersamaan di thread pool latar sementara
+kerangka halaman pertama dirender. Tugas yang berebut GIL dengan render
+(misalnya impor xgboost untuk model) ditunda lewat `defer()` sampai run
+pertama selesai. Pemakai hasilnya memanggil `result()`, yang menunggu tugas
+latar selesai atau menjalankan fungsinya sendiri jika tugas tidak ada atau
+gagal, sehingga error tetap ditangani di jalur biasa.
+
+Modul berat khusus satu halaman (folium, streamlit_folium) diimpor lewat
+`timed_import` saat halaman itu pertama kali dibuka. Waktu impor, durasi
+setiap tugas, dan first paint dicatat sekali per proses untuk panel
+Performance dan log JSON.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+
+from dashboard import tracing
+from dashboard.config import WARMUP_WORKERS
+
+logger = logging.getLogger('dashboard.tracing')
+
+_lock = threading.Lock()
+_import_timings = {}
+
+
+def record_import(name, seconds):
+    """Catat waktu impor pertama `name` (impor berikutnya sudah ada di sys.modules)."""
+    with _lock:
+        _import_timings.setdefault(name, round(seconds, 4))
+
+
+def import_timings():
+    with _lock:
+        return dict(_import_timings)
+
+
+def timed_import(name):
+    """Impor modul saat dibutuhkan dan catat durasinya pada impor pertama."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with tracing.span(f'import:{name}'):
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        record_import(name, time.perf_counter() - started)
+    return module
+
+
+class Warmup:
+    """Tugas pemanasan latar satu proses beserta catatan waktunya."""
+
+    def __init__(self, max_workers=WARMUP_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = {}
+        self._deferred = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+        self.first_paint_seconds = None
+        self.logged = False
+
+    def submit(self, name, function, *args):
+        """Jalankan `function(*args)` di thread latar; nama yang sama hanya dijalankan sekali."""
+        def run():
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                with self._lock:
+                    self._timings[name] = round(time.perf_counter() - started, 4)
+
+        with self._lock:
+            if name not in self._futures:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='dashboard-warmup')
+                self._futures[name] = self._executor.submit(run)
+            return self._futures[name]
+
+    def defer(self, name, function, *args):
+        """Daftarkan tugas yang baru dijalankan saat `start_deferred()` dipanggil."""
+        with self._lock:
+            if name not in self._futures:
+                self._deferred.setdefault(name, (function, args))
+
+    def start_deferred(self):
+        """Jalankan tugas tertunda, biasanya setelah run skrip pertama selesai dirender."""
+        with self._lock:
+            deferred, self._deferred = self._deferred, {}
+        for name, (function, args) in deferred.items():
+            self.submit(name, function, *args)
+
+    def result(self, name, function=None, *args):
+        """
+        Hasil tugas `name`; tunggu jika masih berjalan.
+
+        Jika tugas tidak ada atau gagal, `function(*args)` dijalankan di thread
+        pemanggil (atau None dikembalikan jika `function` tidak diberikan).
+        """
+        with self._lock:
+            # Tugas tertunda yang dibutuhkan sekarang dijalankan langsung, bukan dua kali.
+            self._deferred.pop(name, None)
+            future = self._futures.get(name)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:  # noqa: BLE001 - error diulang dan ditangani di jalur biasa
+                logger.debug("Pemanasan %s gagal; dimuat ulang di jalur biasa.", name, exc_info=True)
+        return function(*args) if function is not None else None
+
+    def mark_first_paint(self, started):
+        """Catat waktu dari awal run skrip pertama sampai kerangka halaman terkirim."""
+        with self._lock:
+            if self.first_paint_seconds is None:
+                self.first_paint_seconds = round(time.perf_counter() - started, 4)
+
+    def report(self):
+        tasks = {}
+        with self._lock:
+            for name, future in self._futures.items():
+                if not future.done():
+                    status = 'running'
+                else:
+                    status = 'failed' if future.exception() is not None else 'ok'
+                tasks[name] = {'seconds': self._timings.get(name), 'status': status}
+            first_paint = self.first_paint_seconds
+        return {'first_paint_seconds': first_paint, 'imports': import_timings(), 'tasks': tasks}
+
+    def log_once(self):
+        """Tulis laporan startup sebagai satu baris log JSON setelah semua tugas selesai."""
+        with self._lock:
+            if self.logged or not all(future.done() for future in self._futures.values()):
+                return
+            self.logged = True
+        logger.info(json.dumps({'event': 'startup', **self.report()}))
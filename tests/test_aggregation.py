@@ -0,0 +1,126 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard.aggregation import ProvinceAggregator, ProvinceStats  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+POVERTY = "Persentase Kemiskinan (P0)"
+
+
+class ProvinceStatsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+
+    def test_simple_means_match_groupby_exactly(self):
+        expected = self.df.groupby("Provinsi").mean(numeric_only=True).reset_index()
+
+        pd.testing.assert_frame_equal(ProvinceStats.from_frame(self.df).means(), expected, check_exact=True)
+
+    def test_variances_match_groupby(self):
+        expected = self.df.groupby("Provinsi").var(numeric_only=True).reset_index()
+
+        pd.testing.assert_frame_equal(ProvinceStats.from_frame(self.df).variances(), expected, rtol=1e-9)
+
+    def test_weighted_mean_and_variance(self):
+        stats = ProvinceStats.from_frame(self.df)
+        group = self.df[self.df["Provinsi"] == "ACEH"]
+        mean = np.average(group[POVERTY], weights=group["PDRB"])
+        variance = np.average((group[POVERTY] - mean) ** 2, weights=group["PDRB"])
+
+        row = stats.provinces.index("ACEH")
+        self.assertAlmostEqual(stats.means("PDRB")[POVERTY][row], mean, places=9)
+        self.assertAlmostEqual(stats.variances("PDRB")[POVERTY][row], variance, places=9)
+
+    def test_merge_of_regional_batches_equals_full(self):
+        sumatra = self.df["Provinsi"].str.contains("SUMATERA|ACEH|RIAU|JAMBI|BENGKULU|LAMPUNG")
+        full = ProvinceStats.from_frame(self.df)
+        merged = ProvinceStats.from_frame(self.df[sumatra]).merge(ProvinceStats.from_frame(self.df[~sumatra]))
+
+        pd.testing.assert_frame_equal(merged.means(), full.means(), rtol=1e-12)
+        pd.testing.assert_frame_equal(merged.variances(), full.variances(), rtol=1e-9)
+        pd.testing.assert_frame_equal(merged.means("PDRB"), full.means("PDRB"), rtol=1e-12)
+
+    def test_subtract_removes_rows(self):
+        aceh = self.df["Provinsi"] == "ACEH"
+        stats = ProvinceStats.from_frame(self.df).subtract(ProvinceStats.from_frame(self.df[aceh]))
+
+        self.assertNotIn("ACEH", stats.provinces)
+
+    def test_rows_without_province_are_skipped(self):
+        df = self.df.head(3).astype({"Provinsi": object})
+        df.loc[df.index[1], "Provinsi"] = None
+        expected = df.groupby("Provinsi").mean(numeric_only=True).reset_index()
+
+        pd.testing.assert_frame_equal(ProvinceStats.from_frame(df).means(), expected, check_exact=True)
+
+    def test_unknown_weight_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ProvinceStats.from_frame(self.df).means("Jumlah Penduduk")
+
+
+class ProvinceAggregatorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+
+    def assert_matches_full(self, aggregator, df):
+        expected = ProvinceStats.from_frame(df)
+        pd.testing.assert_frame_equal(aggregator.means(), expected.means(), check_exact=True)
+        pd.testing.assert_frame_equal(aggregator.variances(), expected.variances(), rtol=1e-9)
+
+    def test_update_only_recomputes_changed_provinces(self):
+        aggregator = ProvinceAggregator.from_frame(self.df)
+        corrected = self.df.copy()
+        corrected.loc[0, POVERTY] += 1.0
+        corrected = corrected[corrected["Provinsi"] != "BALI"]
+
+        updated, changed = aggregator.update(corrected)
+
+        self.assertEqual(changed, ["ACEH", "BALI"])
+        self.assert_matches_full(updated, corrected)
+        # Agregator lama tidak berubah.
+        self.assert_matches_full(aggregator, self.df)
+
+    def test_frame_rows_are_not_copied_until_needed(self):
+        aggregator = ProvinceAggregator.from_frame(self.df)
+
+        self.assertIsNone(aggregator._partitions)
+        self.assertIs(aggregator._frame, self.df)
+        self.assertEqual(aggregator.row_count, len(self.df))
+
+        corrected = self.df.copy()
+        corrected.loc[0, POVERTY] += 1.0
+        updated, _ = aggregator.update(corrected)
+        self.assertIsNone(updated._partitions)
+        self.assertIs(updated._frame, corrected)
+
+    def test_update_without_changes(self):
+        _, changed = ProvinceAggregator.from_frame(self.df).update(self.df.copy())
+
+        self.assertEqual(changed, [])
+
+    def test_upsert_and_remove_batch(self):
+        aggregator = ProvinceAggregator.from_frame(self.df)
+        batch = self.df.iloc[[10]].assign(**{POVERTY: 50.0})
+        new_row = self.df.iloc[[11]].assign(**{"Kab/Kota": "Kabupaten Baru"})
+
+        updated, changed = aggregator.upsert(pd.concat([batch, new_row]))
+        expected = pd.concat([self.df.drop(index=10), batch, new_row])
+        self.assertEqual(changed, sorted({batch["Provinsi"].iloc[0], new_row["Provinsi"].iloc[0]}))
+        pd.testing.assert_frame_equal(updated.means(), ProvinceStats.from_frame(expected).means(), rtol=1e-12)
+
+        removed, _ = updated.remove(new_row)
+        self.assertEqual(removed.row_count, len(self.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
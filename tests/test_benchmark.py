@@ -0,0 +1,48 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import benchmark, ingest  # noqa: E402
+from dashboard.config import COLUMN_MAPPING  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
+
+
+class BenchmarkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.base_raw = ingest.read_source(DATA_PATH)
+
+    def test_synthetic_dataset_keeps_schema_and_provinces(self):
+        synthetic = benchmark.synthetic_dataset(self.base_raw, 10)
+        with GEOJSON_PATH.open(encoding="utf-8") as file:
+            geojson_provinces = {feature["properties"]["name"] for feature in json.load(file)["features"]}
+
+        self.assertEqual(len(synthetic), 10 * len(self.base_raw))
+        self.assertTrue(set(COLUMN_MAPPING) <= set(synthetic.columns))
+        self.assertEqual(set(synthetic["Provinsi"]), geojson_provinces)
+        self.assertTrue(synthetic["Kab/Kota"].is_unique)
+
+        df_processed = clean_dataframe(synthetic)
+        self.assertTrue(df_processed["Persentase Kemiskinan (P0)"].between(0, 100).all())
+
+    def test_report_is_json_serializable(self):
+        report = benchmark.run_benchmarks(scales=[1], stages=["clean", "aggregate", "export"], memory=False)
+
+        stages = [item["stage"] for item in report["results"]]
+        self.assertEqual(stages, ["clean", "aggregate", "export:csv", "export:csv.gz", "export:parquet"])
+        self.assertTrue(all(item["rows"] == len(self.base_raw) for item in report["results"]))
+        json.dumps(report)
+
+        comparison = benchmark.compare(report, report)
+        self.assertTrue(all(item["ratio"] in (1.0, None) for item in comparison))
+
+
+if __name__ == "__main__":
+    unittest.main()
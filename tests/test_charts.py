@@ -0,0 +1,57 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import charts  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class ChartBackendTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+
+    def test_vega_lite_scatter_sends_only_needed_columns_as_float32(self):
+        chart = charts.get_backend("vega-lite").scatter_plot(self.df, "PDRB")
+
+        self.assertEqual(chart.kind, "vega_lite")
+        self.assertEqual(list(chart.data.columns), ["x", "y"])
+        self.assertTrue(all(dtype == np.float32 for dtype in chart.data.dtypes))
+        self.assertEqual(len(chart.data), len(self.df))
+
+    def test_vega_lite_heatmap_matches_pandas_correlation(self):
+        chart = charts.get_backend("vega-lite").correlation_heatmap(self.df)
+        expected = self.df.select_dtypes(include=np.number).corr()
+
+        values = chart.data.set_index(["x", "y"])["value"]
+        self.assertEqual(len(values), expected.size)
+        self.assertAlmostEqual(values[("PDRB", "Indeks Pembangunan Manusia")],
+                               expected.loc["PDRB", "Indeks Pembangunan Manusia"], places=5)
+
+    def test_matplotlib_backend_renders_png(self):
+        chart = charts.get_backend("matplotlib").scatter_plot(self.df, "PDRB")
+
+        self.assertEqual(chart.kind, "image")
+        self.assertTrue(chart.image.startswith(b"\x89PNG"))
+
+    def test_heatmap_needs_more_than_one_numeric_column(self):
+        frame = self.df[["Provinsi", "PDRB"]]
+        for name in charts.CHART_BACKENDS:
+            with self.subTest(backend=name):
+                self.assertIsNone(charts.get_backend(name).correlation_heatmap(frame))
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            charts.get_backend("plotly")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard.config import PROVINCE_REGIONS  # noqa: E402
+from dashboard.correlation import CoMoments, CorrelationEngine  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class CorrelationEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+        cls.numeric = cls.df.select_dtypes(include=np.number)
+
+    def test_full_matrix_matches_pandas(self):
+        engine = CorrelationEngine.from_frame(self.df)
+
+        pd.testing.assert_frame_equal(engine.correlation(), self.numeric.corr(), rtol=1e-9, atol=1e-12)
+
+    def test_region_subset_matches_pandas(self):
+        provinces = PROVINCE_REGIONS["Jawa"] + PROVINCE_REGIONS["Papua"]
+        subset = self.numeric[self.df["Provinsi"].isin(provinces)]
+
+        result = CorrelationEngine.from_frame(self.df).correlation(provinces)
+
+        pd.testing.assert_frame_equal(result, subset.corr(), rtol=1e-9, atol=1e-12)
+
+    def test_regions_cover_all_provinces(self):
+        regional = sorted(province for provinces in PROVINCE_REGIONS.values() for province in provinces)
+
+        self.assertEqual(regional, sorted(self.df["Provinsi"].unique()))
+
+    def test_streamed_batches_equal_full_frame(self):
+        half = len(self.df) // 2
+        engine = CorrelationEngine.from_frame(self.df.iloc[:half]).with_batch(self.df.iloc[half:])
+        full = CorrelationEngine.from_frame(self.df)
+
+        for province in full.provinces:
+            np.testing.assert_allclose(engine.accumulators[province].m2, full.accumulators[province].m2,
+                                       rtol=1e-9, atol=1e-6)
+        pd.testing.assert_frame_equal(engine.correlation(), full.correlation(), rtol=1e-9, atol=1e-12)
+
+    def test_merge_matches_single_pass(self):
+        values = np.random.default_rng(0).normal(size=(50, 3))
+        merged = CoMoments.from_array(values[:20]).merge(CoMoments.from_array(values[20:]))
+
+        np.testing.assert_allclose(merged.covariance(), np.cov(values, rowvar=False), rtol=1e-12)
+
+    def test_results_are_cached_per_subset(self):
+        engine = CorrelationEngine.from_frame(self.df)
+        provinces = PROVINCE_REGIONS["Sulawesi"]
+
+        first = engine.correlation(provinces)
+        second = engine.correlation(list(reversed(provinces)))
+
+        self.assertIs(first, second)
+        self.assertEqual(engine.stats()["hits"], 1)
+        self.assertIsNone(engine.correlation(["PROVINSI FIKTIF"]))
@@ -1,34 +1,17 @@
-import csv
 import json
+import sys
 import unittest
 from pathlib import Path
 
-
 ROOT = Path(__file__).resolve().parents[1]
-DATA_PATH = ROOT / "data" / "df_cleaned.csv"
-GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
-
-REQUIRED_DATA_COLUMNS = [
-    "Provinsi",
-    "Kab/Kota",
-    "Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)",
-    "Rata-rata Lama Sekolah Penduduk 15+ (Tahun)",
-    "Pengeluaran per Kapita Disesuaikan (Ribu Rupiah/Orang/Tahun)",
-    "Indeks Pembangunan Manusia",
-    "Umur Harapan Hidup (Tahun)",
-    "Persentase rumah tangga yang memiliki akses terhadap sanitasi layak",
-    "Persentase rumah tangga yang memiliki akses terhadap air minum layak",
-    "Tingkat Pengangguran Terbuka",
-    "Tingkat Partisipasi Angkatan Kerja",
-    "PDRB atas Dasar Harga Konstan menurut Pengeluaran (Rupiah)",
-]
+sys.path.insert(0, str(ROOT))
 
-NUMERIC_DATA_COLUMNS = [col for col in REQUIRED_DATA_COLUMNS if col not in {"Provinsi", "Kab/Kota"}]
+from dashboard import ingest  # noqa: E402
+from dashboard.schema import DATA_SCHEMA, PROVINCES, REQUIRED  # noqa: E402
 
-
-def read_clean_rows():
-    with DATA_PATH.open(encoding="utf-8-sig", newline="") as file:
-        return list(csv.DictReader(file))
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+RAW_PATH = ROOT / "data" / "Klasifikasi Tingkat Kemiskinan di Indonesia.csv"
+GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
 
 
 def read_geojson():
@@ -37,25 +20,22 @@ def read_geojson():
 
 
 class DataContractTest(unittest.TestCase):
-    def test_clean_dataset_has_required_columns_and_values(self):
-        rows = read_clean_rows()
+    def test_clean_dataset_satisfies_schema(self):
+        report = ingest.validate_file(DATA_PATH)
 
-        self.assertGreater(len(rows), 0)
-        self.assertEqual(set(REQUIRED_DATA_COLUMNS) - set(rows[0]), set())
+        self.assertEqual(report.rows, 514)
+        self.assertEqual(report.violations, [], report.summary())
 
-        for row_number, row in enumerate(rows, start=2):
-            for column in REQUIRED_DATA_COLUMNS:
-                self.assertNotEqual(row[column].strip(), "", f"{column} kosong di baris {row_number}")
+    def test_raw_export_satisfies_schema(self):
+        report = ingest.validate_file(RAW_PATH)
 
-            for column in NUMERIC_DATA_COLUMNS:
-                with self.subTest(row=row_number, column=column):
-                    float(row[column])
+        self.assertEqual(report.rows, 514)
+        self.assertEqual(report.violations, [], report.summary())
 
-    def test_clean_dataset_contains_34_provinces(self):
-        rows = read_clean_rows()
-        provinces = {row["Provinsi"].strip().upper() for row in rows}
+    def test_schema_requires_province_and_poverty_columns(self):
+        required = {spec.name for spec in DATA_SCHEMA.columns if spec.presence == REQUIRED}
 
-        self.assertEqual(len(provinces), 34)
+        self.assertEqual(required, {"Provinsi", "Persentase Kemiskinan (P0)"})
 
     def test_geojson_contains_34_named_provinces(self):
         geojson_data = read_geojson()
@@ -70,14 +50,13 @@ class DataContractTest(unittest.TestCase):
         self.assertEqual(len(provinces), 34)
         self.assertNotIn("", provinces)
 
-    def test_dataset_and_geojson_provinces_match(self):
-        data_provinces = {row["Provinsi"].strip().upper() for row in read_clean_rows()}
+    def test_schema_provinces_match_geojson(self):
         geojson_provinces = {
             feature.get("properties", {}).get("name", "").strip().upper()
             for feature in read_geojson().get("features", [])
         }
 
-        self.assertEqual(data_provinces, geojson_provinces)
+        self.assertEqual(set(PROVINCES), geojson_provinces)
 
 
 if __name__ == "__main__":
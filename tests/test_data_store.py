@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import data_store  # noqa: E402
+from dashboard.pipeline import process_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class DataStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.df_processed, _ = process_dataframe(pd.read_csv(DATA_PATH))
+
+    def test_published_frame_is_shared_read_only(self):
+        publisher = data_store.DataStore(self.tmp_dir.name)
+        publisher.publish_frame("processed", "v1", self.df_processed)
+
+        # Proses lain cukup membuat instance baru di direktori yang sama.
+        attached = data_store.DataStore(self.tmp_dir.name).attach_frame("processed", "v1")
+
+        pd.testing.assert_frame_equal(attached, self.df_processed, check_dtype=False)
+        self.assertFalse(attached["PDRB"].to_numpy().flags.writeable)
+
+    def test_attach_returns_same_object_within_process(self):
+        store = data_store.DataStore(self.tmp_dir.name)
+        store.publish_frame("processed", "v1", self.df_processed)
+
+        self.assertIs(store.attach_frame("processed", "v1"), store.attach_frame("processed", "v1"))
+
+    def test_attached_versions_are_bounded(self):
+        store = data_store.DataStore(self.tmp_dir.name, max_entries=2)
+        for version in ("v1", "v2", "v3"):
+            store.publish_bytes("geojson", version, version.encode())
+
+        first = store.attach_bytes("geojson", "v1")
+        store.attach_bytes("geojson", "v2")
+        self.assertIs(store.attach_bytes("geojson", "v1"), first)
+        store.attach_bytes("geojson", "v3")
+
+        self.assertEqual([key[2] for key in store._attached], ["v1", "v3"])
+        self.assertEqual(store.attach_bytes("geojson", "v2")[:], b"v2")
+
+    def test_old_published_versions_are_removed_from_disk(self):
+        store = data_store.DataStore(self.tmp_dir.name, keep_versions=2)
+        for age, version in enumerate(("v1", "v2")):
+            path = store.publish_bytes("geojson", version, version.encode())
+            os.utime(path, (1000 + age, 1000 + age))
+        store.publish_frame("processed", "v1", self.df_processed)
+
+        # v1 baru saja di-attach, jadi v2 yang paling lama tidak dipakai.
+        store.attach_bytes("geojson", "v1")
+        store.publish_bytes("geojson", "v3", b"v3")
+
+        names = sorted(path.name for path in Path(self.tmp_dir.name).iterdir())
+        self.assertEqual(names, ["geojson-v1.bin", "geojson-v3.bin", "processed-v1.arrow"])
+
+    def test_missing_entries_return_none(self):
+        store = data_store.DataStore(self.tmp_dir.name)
+
+        self.assertIsNone(store.attach_frame("processed", "missing"))
+        self.assertIsNone(store.attach_bytes("geojson", "missing"))
+
+    def test_bytes_roundtrip(self):
+        store = data_store.DataStore(self.tmp_dir.name)
+        store.publish_bytes("geojson", "abc:medium", b'{"type":"FeatureCollection"}')
+
+        mapped = data_store.DataStore(self.tmp_dir.name).attach_bytes("geojson", "abc:medium")
+
+        self.assertEqual(mapped[:], b'{"type":"FeatureCollection"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import gzip
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import export  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class ExportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+        cls.expected_csv = cls.df.to_csv(index=False).encode("utf-8")
+
+    def test_chunked_csv_matches_to_csv(self):
+        self.assertEqual(b"".join(export.iter_csv_chunks(self.df, chunk_rows=37)), self.expected_csv)
+
+    def test_gzip_csv_decompresses_to_csv(self):
+        compressed = b"".join(export.iter_gzip_chunks(export.iter_csv_chunks(self.df, chunk_rows=100)))
+        self.assertEqual(gzip.decompress(compressed), self.expected_csv)
+
+    def test_parquet_roundtrip(self):
+        buffer = io.BytesIO()
+        export.encode_export(self.df, "parquet", buffer, chunk_rows=100)
+        buffer.seek(0)
+
+        pd.testing.assert_frame_equal(pd.read_parquet(buffer), self.df, check_dtype=False)
+
+    def test_store_builds_each_export_once(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = export.ExportStore(tmp_dir)
+            with mock.patch.object(export, "write_export", wraps=export.write_export) as write_export:
+                first = store.get_bytes(self.df, "v1", "csv")
+                second = store.get_bytes(self.df, "v1", "csv")
+
+        self.assertIs(first, second)
+        self.assertEqual(first, self.expected_csv)
+        self.assertEqual(write_export.call_count, 1)
+
+    def test_unpersisted_export_is_not_written_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = export.ExportStore(tmp_dir)
+            first = store.get_bytes(self.df, "v1:qabc", "csv", persist=False)
+            second = store.get_bytes(self.df, "v1:qabc", "csv", persist=False)
+
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [])
+        self.assertIs(first, second)
+        self.assertEqual(first, self.expected_csv)
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            export.ExportStore(Path(tempfile.gettempdir())).get_bytes(self.df, "v1", "xlsx")
+
+
+if __name__ == "__main__":
+    unittest.main()
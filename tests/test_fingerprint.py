@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import fingerprint  # noqa: E402
+
+
+class DigestMemoTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        patcher = mock.patch.object(fingerprint, "_digest_memo", fingerprint.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name, data, mtime_ns):
+        path = Path(self.tmp_dir.name) / name
+        path.write_bytes(data)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_digest_is_reused_until_file_changes(self):
+        path = self.write("data.csv", b"a", 1_000_000_000)
+        first = fingerprint.fingerprint(path, with_digest=True).digest
+
+        with mock.patch.object(fingerprint, "content_digest") as digest:
+            self.assertEqual(fingerprint.fingerprint(path, with_digest=True).digest, first)
+        digest.assert_not_called()
+
+        self.write("data.csv", b"b", 2_000_000_000)
+        self.assertNotEqual(fingerprint.fingerprint(path, with_digest=True).digest, first)
+        # Hanya stat terakhir per path yang diingat.
+        self.assertEqual(len(fingerprint._digest_memo), 1)
+
+    def test_memo_is_bounded_by_path_count(self):
+        with mock.patch.object(fingerprint, "MEMO_MAX_PATHS", 2):
+            paths = [self.write(f"{idx}.csv", b"x", 1_000_000_000) for idx in range(3)]
+            for path in paths:
+                fingerprint.fingerprint(path, with_digest=True)
+
+        self.assertEqual(list(fingerprint._digest_memo), [str(path.resolve()) for path in paths[1:]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import geo_source  # noqa: E402
+from dashboard.geo_source import GeoJSONUnavailable, RemoteGeoJSON  # noqa: E402
+
+
+def feature_collection(name):
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "properties": {"name": name}, "geometry": None}],
+    }
+
+
+class GeoJSONServer(ThreadingHTTPServer):
+    """Server GeoJSON lokal yang mencatat permintaan dan bisa dibuat lambat atau gagal."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), GeoJSONHandler)
+        self.body = json.dumps(feature_collection("ACEH")).encode("utf-8")
+        self.etag = '"v1"'
+        self.status = 200
+        self.delay = 0.0
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/prov.geojson"
+
+    def publish(self, data, etag):
+        self.body = json.dumps(data).encode("utf-8")
+        self.etag = etag
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class GeoJSONHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        time.sleep(server.delay)
+        if server.status != 200:
+            self.send_response(server.status)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RemoteGeoJSONTest(unittest.TestCase):
+    def setUp(self):
+        self.server = GeoJSONServer()
+        self.addCleanup(self.server.stop)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_dir = Path(self.tmp_dir.name) / "geojson"
+
+    def source(self, **kwargs):
+        return RemoteGeoJSON(self.server.url, self.cache_dir, timeout=5, **kwargs)
+
+    def test_cold_cache_does_not_block_and_fills_in_background(self):
+        self.server.delay = 0.5
+        source = self.source()
+
+        started = time.perf_counter()
+        with self.assertRaises(GeoJSONUnavailable):
+            source.get()
+        self.assertLess(time.perf_counter() - started, 0.3)
+
+        source.refresh_in_background().join(5)
+        self.assertEqual(source.get()["features"][0]["properties"]["name"], "ACEH")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_fresh_cache_is_served_without_requests(self):
+        self.source().refresh()
+        source = self.source()
+
+        for _ in range(3):
+            source.get()
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(source.stats()["hits"], 3)
+
+    def test_stale_cache_revalidates_with_conditional_request(self):
+        source = self.source(max_age=0)
+        source.refresh()
+        version = source.version()
+
+        self.assertEqual(source.get()["type"], "FeatureCollection")
+        source.refresh_in_background().join(5)
+
+        self.assertEqual(self.server.requests[-1].get("If-None-Match"), '"v1"')
+        self.assertEqual(source.stats()["not_modified"], 1)
+        self.assertEqual(source.version(), version)
+
+    def test_changed_upstream_replaces_cache_file(self):
+        source = self.source(max_age=0)
+        source.refresh()
+        old_file = source.meta()["file"]
+        self.server.publish(feature_collection("BALI"), '"v2"')
+
+        self.assertEqual(source.refresh(), "updated")
+
+        self.assertEqual(source.cached()["features"][0]["properties"]["name"], "BALI")
+        self.assertFalse((self.cache_dir / old_file).exists())
+        self.assertEqual(source.meta()["etag"], '"v2"')
+
+    def test_outage_keeps_stale_copy_and_backs_off(self):
+        source = self.source(max_age=0)
+        source.refresh()
+        self.server.status = 503
+
+        self.assertEqual(source.refresh(), "failed")
+        self.assertEqual(source.refresh(), "backoff")
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(source.cached()["features"][0]["properties"]["name"], "ACEH")
+        self.assertIn("503", source.meta()["error"])
+
+    def test_invalid_geojson_is_not_cached(self):
+        self.server.publish({"type": "FeatureCollection", "features": []}, '"bad"')
+        source = self.source()
+
+        self.assertEqual(source.refresh(), "failed")
+
+        with self.assertRaises(GeoJSONUnavailable):
+            source.get(block=True)
+        self.assertIsNone(source.version())
+
+    @unittest.skipIf(geo_source.fcntl is None, "kunci file antarproses tidak tersedia")
+    def test_concurrent_processes_fetch_once(self):
+        self.server.delay = 0.3
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from dashboard.geo_source import RemoteGeoJSON;"
+            "print(RemoteGeoJSON(sys.argv[2], sys.argv[3], timeout=5).refresh())"
+        )
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", code, str(ROOT), self.server.url, str(self.cache_dir)],
+                stdout=subprocess.PIPE, text=True,
+            )
+            for _ in range(3)
+        ]
+        statuses = sorted(process.communicate(timeout=30)[0].strip() for process in processes)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(statuses, ["fresh", "fresh", "updated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import geometry  # noqa: E402
+
+GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
+
+
+def decode_topojson_ring(topology, arc_refs):
+    scale = topology["transform"]["scale"]
+    translate = topology["transform"]["translate"]
+    arcs = []
+    for encoded in topology["arcs"]:
+        x = y = 0
+        points = []
+        for dx, dy in encoded:
+            x, y = x + dx, y + dy
+            points.append((x * scale[0] + translate[0], y * scale[1] + translate[1]))
+        arcs.append(points)
+    return geometry.resolve_ring(arc_refs, arcs)
+
+
+class GeometryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with GEOJSON_PATH.open(encoding="utf-8") as file:
+            cls.geojson_data = json.load(file)
+        cls.simplified, cls.topology = geometry.simplify_geojson(cls.geojson_data, "medium")
+
+    def test_variant_keeps_feature_order_and_properties(self):
+        self.assertEqual(
+            [feature["properties"] for feature in self.simplified["features"]],
+            [feature["properties"] for feature in self.geojson_data["features"]],
+        )
+        for feature in self.simplified["features"]:
+            self.assertGreater(len(feature["geometry"]["coordinates"]), 0)
+
+    def test_variant_is_smaller_than_source(self):
+        self.assertLess(
+            len(geometry.encode_json(self.simplified)),
+            len(geometry.encode_json(self.geojson_data)) / 2,
+        )
+        self.assertLess(geometry.count_vertices(self.simplified), geometry.count_vertices(self.geojson_data))
+
+    def test_rings_stay_closed(self):
+        for feature in self.simplified["features"]:
+            for polygon in feature["geometry"]["coordinates"]:
+                for ring in polygon:
+                    self.assertGreaterEqual(len(ring), 4)
+                    self.assertEqual(ring[0], ring[-1])
+
+    def test_topojson_decodes_to_geojson_variant(self):
+        geojson_ring = self.simplified["features"][0]["geometry"]["coordinates"][0][0]
+        arc_refs = self.topology["objects"]["provinces"]["geometries"][0]["arcs"][0][0]
+        decoded = decode_topojson_ring(self.topology, arc_refs)
+
+        self.assertEqual(len(decoded), len(geojson_ring))
+        for (x1, y1), (x2, y2) in zip(decoded, geojson_ring):
+            self.assertAlmostEqual(x1, x2, places=3)
+            self.assertAlmostEqual(y1, y2, places=3)
+
+    def test_small_islands_are_dropped_but_largest_polygon_kept(self):
+        island = [[0, 0], [0.001, 0], [0.001, 0.001], [0, 0.001], [0, 0]]
+        mainland = [[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]
+
+        kept = geometry.filter_small_polygons([[island], [mainland]], min_area=0.5)
+        only_island = geometry.filter_small_polygons([[island]], min_area=0.5)
+
+        self.assertEqual(kept, [[mainland]])
+        self.assertEqual(only_island, [[island]])
+
+    def test_load_variant_uses_disk_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = geometry.load_variant(self.geojson_data, "abc123", "low", tmp_dir)
+            cached_files = sorted(path.name for path in geometry.variant_dir("abc123", tmp_dir).iterdir())
+            second = geometry.load_variant(self.geojson_data, "abc123", "low", tmp_dir)
+
+        self.assertEqual(cached_files, ["low.geojson", "low.topojson"])
+        self.assertEqual(first, second)
+
+    def test_level_for_zoom(self):
+        self.assertEqual(geometry.level_for_zoom(4), "low")
+        self.assertEqual(geometry.level_for_zoom(5), "medium")
+        self.assertEqual(geometry.level_for_zoom(8), "high")
+        self.assertEqual(geometry.level_for_zoom(12), geometry.FULL_LEVEL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import ingest  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+RAW_PATH = ROOT / "data" / "Klasifikasi Tingkat Kemiskinan di Indonesia.csv"
+
+
+class IngestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_raw(self, text):
+        path = Path(self.tmp_dir.name) / "raw.csv"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_raw_export_matches_cleaned_dataset(self):
+        # Blok kecil memaksa banyak batch, termasuk batch berisi baris kosong saja.
+        df = ingest.read_source(RAW_PATH, block_size=4096)
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(DATA_PATH))
+
+    def test_cleaned_csv_uses_same_path(self):
+        self.assertFalse(ingest.is_raw_export(DATA_PATH))
+        pd.testing.assert_frame_equal(ingest.read_source(DATA_PATH), pd.read_csv(DATA_PATH))
+
+    def test_province_aliases_match_geojson_names(self):
+        path = self.write_raw(
+            "Provinsi;Kab/Kota;Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen)\n"
+            "d i  yogyakarta ;Sleman; 7,74 \n"
+            "KEP. BANGKA BELITUNG;Bangka;4,5\n"
+            ";;\n"
+        )
+        df = ingest.read_source(path)
+
+        self.assertEqual(list(df["Provinsi"]), ["DAERAH ISTIMEWA YOGYAKARTA", "KEPULAUAN BANGKA BELITUNG"])
+        self.assertEqual(list(df.iloc[:, 2]), [7.74, 4.5])
+
+    def test_invalid_number_reports_row(self):
+        path = self.write_raw(
+            "Provinsi;Kab/Kota;Tingkat Pengangguran Terbuka\n"
+            "ACEH;Simeulue;5,71\n"
+            ";;\n"
+            "ACEH;Aceh Singkil;n/a\n"
+        )
+
+        with self.assertRaisesRegex(ValueError, r"Tingkat Pengangguran Terbuka.*\[4\]"):
+            ingest.read_source(path)
+
+    def test_ingest_csv_streams_cleaned_output(self):
+        output = Path(self.tmp_dir.name) / "bersih.csv"
+
+        rows = ingest.ingest_csv(RAW_PATH, output, block_size=4096)
+
+        self.assertEqual(rows, 514)
+        expected = clean_dataframe(pd.read_csv(DATA_PATH))
+        pd.testing.assert_frame_equal(clean_dataframe(pd.read_csv(output)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
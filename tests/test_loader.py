@@ -0,0 +1,89 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import data_store, fingerprint, loader, snapshot  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class DatasetLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        tmp = Path(self.tmp_dir.name)
+        self.csv_path = tmp / "data.csv"
+        shutil.copyfile(DATA_PATH, self.csv_path)
+
+        patcher = mock.patch.object(snapshot, "SNAPSHOT_DIR", tmp / "snapshots")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loader = loader.DatasetLoader(data_store.DataStore(tmp / "store"))
+
+    def test_hit_path_does_not_read_or_hash_data(self):
+        first = self.loader.load(self.csv_path)
+
+        with mock.patch.object(fingerprint, "content_digest") as digest, \
+                mock.patch.object(loader.ingest, "read_source") as read_source:
+            second = self.loader.load(self.csv_path)
+
+        self.assertIs(second, first)
+        digest.assert_not_called()
+        read_source.assert_not_called()
+        self.assertEqual(self.loader.stats()["hits"], 1)
+        self.assertEqual(self.loader.stats()["misses"], 1)
+
+    def test_changed_file_invalidates_entry(self):
+        first = self.loader.load(self.csv_path)
+
+        with self.csv_path.open("a", encoding="utf-8") as file:
+            file.write("\n")
+        second = self.loader.load(self.csv_path)
+
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(self.loader.stats()["misses"], 2)
+        self.assertEqual(self.loader.stats()["entries"], 1)
+
+    def test_touched_file_with_same_content_keeps_version(self):
+        first = self.loader.load(self.csv_path)
+
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = self.loader.load(self.csv_path)
+
+        # Kunci murah berubah, tetapi versi isi (dan frame bersama di data store) tetap sama.
+        self.assertEqual(second.version, first.version)
+        self.assertEqual(self.loader.stats()["misses"], 2)
+
+    def test_changed_file_updates_aggregates_incrementally(self):
+        first = self.loader.load(self.csv_path)
+
+        lines = self.csv_path.read_text(encoding="utf-8").splitlines()
+        self.csv_path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+        second = self.loader.load(self.csv_path)
+
+        self.assertEqual(self.loader.stats()["incremental_updates"], 1)
+        self.assertEqual(len(second.df_processed), len(first.df_processed) - 1)
+        fresh = loader.DatasetLoader(data_store.DataStore(Path(self.tmp_dir.name) / "other")).load(self.csv_path)
+        self.assertTrue(second.df_provinsi.equals(fresh.df_provinsi))
+        # Agregator hanya merujuk frame bersama; tidak ada salinan baris per worker.
+        self.assertIs(second.aggregator._frame, second.df_processed)
+
+    def test_frames_match_snapshot_and_csv_paths(self):
+        dataset = self.loader.load(self.csv_path)
+        fresh = loader.DatasetLoader(data_store.DataStore(Path(self.tmp_dir.name) / "other")).load(self.csv_path)
+
+        self.assertEqual(list(dataset.df_provinsi["Provinsi"]), list(fresh.df_provinsi["Provinsi"]))
+        self.assertEqual(len(dataset.df_processed), len(fresh.df_processed))
+
+
+if __name__ == "__main__":
+    unittest.main()
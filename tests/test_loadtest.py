@@ -0,0 +1,159 @@
+import asyncio
+import json
+import random
+import sys
+import unittest
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import loadtest  # noqa: E402
+from dashboard.loadtest import Session, Step  # noqa: E402
+
+PAGE_ID = "$$ID-aaaa-None"
+FILTER_ID = "$$ID-bbbb-filter_provinces"
+
+
+def radio_message(widget_id, label, options):
+    message = ForwardMsg()
+    radio = message.delta.new_element.radio
+    radio.id, radio.label = widget_id, label
+    radio.options.extend(options)
+    return message.SerializeToString()
+
+
+def multiselect_message(widget_id, label, options):
+    message = ForwardMsg()
+    multiselect = message.delta.new_element.multiselect
+    multiselect.id, multiselect.label = widget_id, label
+    multiselect.options.extend(options)
+    return message.SerializeToString()
+
+
+def finished_message(status=ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY):
+    message = ForwardMsg()
+    message.script_finished = status
+    return message.SerializeToString()
+
+
+class FakeWebSocket:
+    """Mengirim ulang daftar ForwardMsg yang disiapkan untuk setiap rerun dan mencatat BackMsg."""
+
+    def __init__(self, runs):
+        self.runs = list(runs)
+        self.pending = []
+        self.sent = []
+
+    async def send(self, payload):
+        message = BackMsg()
+        message.ParseFromString(payload)
+        self.sent.append(message)
+        self.pending = list(self.runs.pop(0))
+
+    async def recv(self):
+        return self.pending.pop(0)
+
+
+class SessionTest(unittest.TestCase):
+    def run_steps(self, runs, steps):
+        websocket = FakeWebSocket(runs)
+        session = Session(websocket, random.Random(0), timeout=5)
+
+        async def run():
+            for step in steps:
+                await session.run_step(step)
+
+        asyncio.run(run())
+        return session, websocket
+
+    def test_widget_values_follow_rendered_widgets(self):
+        map_page = [
+            radio_message(PAGE_ID, "Pilih Halaman:", ["Visualisasi Peta", "Analisis Data Eksplorasi"]),
+            multiselect_message(FILTER_ID, "Provinsi", ["ACEH", "BALI", "PAPUA"]),
+            finished_message(ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN),
+            finished_message(),
+        ]
+        eda_page = [
+            radio_message(PAGE_ID, "Pilih Halaman:", ["Visualisasi Peta", "Analisis Data Eksplorasi"]),
+            finished_message(),
+        ]
+        steps = [
+            Step("peta"),
+            Step("filter", "filter_provinces", lambda options, rng: options[:2]),
+            Step("eda", "Pilih Halaman:", "Analisis Data Eksplorasi"),
+            Step("peta", "Pilih Halaman:", "Visualisasi Peta"),
+        ]
+
+        session, websocket = self.run_steps([map_page, map_page, eda_page, map_page], steps)
+
+        states = [{state.id: state for state in message.rerun_script.widget_states.widgets} for message in websocket.sent]
+        self.assertEqual(states[0], {})
+        self.assertEqual(list(states[1][FILTER_ID].string_array_value.data), ["ACEH", "BALI"])
+        self.assertEqual(states[2][PAGE_ID].string_value, "Analisis Data Eksplorasi")
+        self.assertIn(FILTER_ID, states[2])
+        # Filter tidak dirender di halaman EDA sehingga nilainya dibuang seperti di frontend.
+        self.assertNotIn(FILTER_ID, states[3])
+        self.assertEqual([record["step"] for record in session.records], ["peta", "filter", "eda", "peta"])
+        self.assertEqual(session.records[0]["bytes"], sum(len(payload) for payload in map_page))
+        self.assertEqual(session.errors, [])
+
+    def test_missing_widget_and_exception_are_reported(self):
+        message = ForwardMsg()
+        message.delta.new_element.exception.message = "boom"
+        runs = [[message.SerializeToString(), finished_message()]]
+
+        session, _ = self.run_steps(runs, [Step("x", "Tidak Ada", True)])
+
+        self.assertEqual(len(session.errors), 2)
+        self.assertIn("boom", session.errors)
+
+
+class ReportTest(unittest.TestCase):
+    def test_summary_and_cache_rates(self):
+        records = [{"step": "peta", "latency_ms": value, "bytes": 10} for value in range(1, 101)]
+        traces = [
+            {"total_ms": 5, "spans": [{"name": "load_dataset", "cache": "hit"}, {"name": "st_folium", "cache": None}]},
+            {"total_ms": 7, "spans": [{"name": "load_dataset", "cache": "miss"}, {"name": "load_map_cube", "cache": "hit"}]},
+        ]
+
+        summary = loadtest.summarize(records)
+        cache = loadtest.cache_rates(traces)
+
+        self.assertEqual(summary["latency_ms"]["p50"], 50.5)
+        self.assertEqual(summary["latency_ms"]["p99"], 99.0)
+        self.assertEqual(summary["bytes"], {"total": 1000, "per_rerun": 10})
+        self.assertEqual(summary["steps"]["peta"]["count"], 100)
+        self.assertEqual(cache["hit_rate"], 0.667)
+        self.assertEqual(cache["spans"]["load_dataset"], {"hit": 1, "miss": 1, "hit_rate": 0.5})
+        self.assertIsNone(loadtest.percentiles([]))
+
+    def test_compare_reports_ratios(self):
+        result = {
+            "sessions": 4,
+            "latency_ms": {"p50": 100.0, "p95": 200.0, "p99": 300.0},
+            "rss_mb": {"per_session": 2.0},
+            "bytes": {"per_rerun": 1000},
+        }
+        slower = {**result, "latency_ms": {"p50": 150.0, "p95": 200.0, "p99": 600.0}}
+
+        comparison = loadtest.compare({"results": [slower]}, {"results": [result]})
+
+        self.assertEqual(comparison[0]["p50_ratio"], 1.5)
+        self.assertEqual(comparison[0]["p99_ratio"], 2.0)
+        self.assertEqual(comparison[0]["rss_per_session_ratio"], 1.0)
+        json.dumps(comparison)
+
+    def test_widget_key_and_state(self):
+        self.assertEqual(loadtest.widget_key(FILTER_ID), "filter_provinces")
+        self.assertIsNone(loadtest.widget_key(PAGE_ID))
+        self.assertTrue(loadtest.widget_state("checkbox", PAGE_ID, True).bool_value)
+        with self.assertRaises(ValueError):
+            loadtest.widget_state("slider", PAGE_ID, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import folium
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import map_builder, province_cube  # noqa: E402
+from dashboard.config import GEOJSON_PROVINCE_KEY  # noqa: E402
+from dashboard.pipeline import process_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
+
+
+def legacy_choropleth(df_provinsi, geojson_data):
+    """Layer Choropleth seperti yang dipakai peta sebelum digabung menjadi satu layer."""
+    return folium.Choropleth(
+        geo_data=geojson_data,
+        name='Peta Kemiskinan',
+        data=df_provinsi,
+        columns=['Provinsi', map_builder.MAP_COLUMN],
+        key_on=GEOJSON_PROVINCE_KEY,
+        fill_color='YlOrRd',
+        fill_opacity=0.7,
+        line_opacity=0.5,
+        line_color='black',
+        line_weight=1,
+        legend_name='Persentase Penduduk Miskin (%)',
+        highlight=True,
+        nan_fill_color='lightgray'
+    )
+
+
+class MapBuilderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _, df_provinsi = process_dataframe(pd.read_csv(DATA_PATH))
+        with GEOJSON_PATH.open(encoding="utf-8") as file:
+            geojson_data = json.load(file)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cls.cube = province_cube.load_province_cube(df_provinsi, geojson_data, "data", "geo", tmp_dir)
+        cls.choropleth = legacy_choropleth(cls.cube.df_provinsi, cls.cube.geojson_data)
+
+    def test_legend_bins_match_choropleth(self):
+        colormap, _ = map_builder.feature_fill_colors(self.cube.df_provinsi, self.cube.geojson_data)
+        expected = self.choropleth.color_scale
+
+        self.assertEqual(colormap.index, expected.index)
+        self.assertEqual(colormap.colors, expected.colors)
+        self.assertEqual(colormap.caption, expected.caption)
+
+    def test_fill_colors_match_choropleth(self):
+        _, fill_colors = map_builder.feature_fill_colors(self.cube.df_provinsi, self.cube.geojson_data)
+        style_function = self.choropleth.geojson.style_function
+
+        for feature in self.cube.geojson_data["features"]:
+            name = feature["properties"]["name"]
+            with self.subTest(province=name):
+                self.assertEqual(fill_colors[name], style_function(feature)["fillColor"])
+
+    def test_folium_map_colors_each_indicator_once(self):
+        styles = map_builder.indicator_styles(self.cube.df_provinsi, self.cube.geojson_data)
+        with mock.patch.object(map_builder, "feature_fill_colors", wraps=map_builder.feature_fill_colors) as colors:
+            m = map_builder.create_folium_map(self.cube)
+
+        self.assertEqual(colors.call_count, len(styles["indicators"]))
+        layer = next(child for child in m._children.values() if isinstance(child, folium.features.GeoJson))
+        style_function = self.choropleth.geojson.style_function
+        for feature in self.cube.geojson_data["features"]:
+            with self.subTest(province=feature["properties"]["name"]):
+                self.assertEqual(layer.style_function(feature)["fillColor"], style_function(feature)["fillColor"])
+
+    def test_missing_province_uses_nan_color(self):
+        df_provinsi = self.cube.df_provinsi[self.cube.df_provinsi["Provinsi"] != "ACEH"]
+        _, fill_colors = map_builder.feature_fill_colors(df_provinsi, self.cube.geojson_data)
+
+        self.assertEqual(fill_colors["ACEH"], map_builder.NAN_FILL_COLOR)
+
+    def test_map_embeds_geometry_once(self):
+        html = map_builder.create_folium_map(self.cube).get_root().render()
+        first_coordinate = json.dumps(self.cube.geojson_data["features"][0]["geometry"]["coordinates"][0][0][1])
+
+        self.assertEqual(html.count(first_coordinate), 1)
+
+    def test_prediction_layer_is_optional_overlay(self):
+        df_prediksi = pd.DataFrame({
+            "Provinsi": self.cube.df_provinsi["Provinsi"],
+            "Proporsi": range(len(self.cube.df_provinsi)),
+        })
+        layer, colormap = map_builder.prediction_layer(
+            self.cube.geojson_data, df_prediksi, "Proporsi", map_builder.PREDICTION_LEGEND_NAME
+        )
+
+        feature = layer.data["features"][0]
+        self.assertIs(feature["geometry"], self.cube.geojson_data["features"][0]["geometry"])
+        self.assertIn("PREDIKSI", feature["properties"])
+        self.assertEqual(colormap.caption, map_builder.PREDICTION_LEGEND_NAME)
+
+    def test_indicator_styles_match_per_column_choropleth(self):
+        styles = map_builder.indicator_styles(self.cube.df_provinsi, self.cube.geojson_data)
+        names = [feature["properties"]["name"] for feature in self.cube.geojson_data["features"]]
+
+        self.assertEqual(styles["names"], names)
+        self.assertEqual(styles["indicators"][0]["column"], map_builder.MAP_COLUMN)
+        self.assertEqual(len(styles["indicators"]), len(province_cube.PROPERTY_FORMATS))
+        for indicator in styles["indicators"]:
+            with self.subTest(column=indicator["column"]):
+                colormap, colors = map_builder.feature_fill_colors(
+                    self.cube.df_provinsi, self.cube.geojson_data, indicator["column"]
+                )
+                self.assertEqual(indicator["colors"], [colors[name] for name in names])
+                self.assertEqual(len(indicator["labels"]), len(names))
+                self.assertEqual(len(indicator["legend"]), len(colormap.index) - 1)
+
+    def test_indicator_switch_sends_style_table_not_geometry(self):
+        styles = map_builder.indicator_styles(self.cube.df_provinsi, self.cube.geojson_data)
+        html = map_builder.create_folium_map(self.cube).get_root().render()
+        first_coordinate = json.dumps(self.cube.geojson_data["features"][0]["geometry"]["coordinates"][0][0][1])
+
+        for indicator in styles["indicators"]:
+            self.assertIn(json.dumps(indicator["labels"]), html)
+        self.assertEqual(html.count(first_coordinate), 1)
+        # Tabel style semua indikator jauh lebih kecil dari geometri yang dikirim sekali.
+        self.assertLess(len(json.dumps(styles)), len(html) / 20)
+
+    def test_tiled_map_embeds_no_geometry(self):
+        tileset = {
+            "version": "abc",
+            "min_zoom": 3,
+            "max_zoom": 8,
+            "layers": [{"id": "provinces", "min_zoom": 3, "max_zoom": 8, "fields": []}],
+        }
+        url = "/app/static/tiles/abc/{z}/{x}/{y}.pbf"
+        html = map_builder.create_tiled_map(self.cube, tileset, url).get_root().render()
+        first_coordinate = json.dumps(self.cube.geojson_data["features"][0]["geometry"]["coordinates"][0][0][1])
+
+        self.assertIn(url, html)
+        self.assertIn("properties.fill", html)
+        self.assertIn("setFeatureStyle", html)
+        self.assertIn('feature.properties.layer + ":" + feature.properties.name', html)
+        self.assertIn('"provinces" + \':\' + name', html)
+        self.assertNotIn(first_coordinate, html)
+
+
+if __name__ == "__main__":
+    unittest.main()
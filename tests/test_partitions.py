@@ -0,0 +1,124 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard.data_store import DataStore  # noqa: E402
+from dashboard.loader import DatasetLoader  # noqa: E402
+from dashboard.partitions import YEAR_COLUMN, PartitionStore  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+POVERTY = "Persentase Kemiskinan (P0)"
+
+
+class PartitionStoreTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+        cls.df_next = cls.df.copy()
+        cls.df_next[POVERTY] = cls.df_next[POVERTY] * 0.9
+        cls.store_dir = tempfile.TemporaryDirectory()
+        cls.store = PartitionStore(Path(cls.store_dir.name) / "partitions")
+        cls.store.write_year(cls.df, 2021)
+        cls.store.write_year(cls.df_next, 2022)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.store_dir.cleanup()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_year_roundtrip_preserves_rows_and_types(self):
+        pd.testing.assert_frame_equal(self.store.scan(years=[2021]), self.df)
+        pd.testing.assert_frame_equal(self.store.scan(years=[2022]), self.df_next)
+        self.assertEqual(self.store.years(), [2021, 2022])
+        self.assertEqual(len(self.store.provinces(2021)), 34)
+
+    def test_selection_prunes_partitions_and_columns(self):
+        selection = self.store.select(years=[2022], provinces=["ACEH", "BALI"], columns=["Kab/Kota", POVERTY])
+
+        self.assertEqual({partition["province"] for partition in selection.partitions}, {"ACEH", "BALI"})
+        df = self.store.read(selection)
+        expected = self.df_next[self.df_next["Provinsi"].isin(["ACEH", "BALI"])]
+        self.assertEqual(list(df.columns), ["Kab/Kota", POVERTY])
+        self.assertEqual(list(df[POVERTY]), list(expected[POVERTY]))
+
+    def test_range_predicate_uses_min_max_statistics(self):
+        predicates = [(POVERTY, 20.0, None)]
+        selection = self.store.select(years=[2021], predicates=predicates)
+
+        matching = self.df[self.df[POVERTY] >= 20.0]
+        self.assertEqual(
+            {partition["province"] for partition in selection.partitions},
+            {province for province, group in self.df.groupby("Provinsi") if group[POVERTY].max() >= 20.0},
+        )
+        self.assertLess(len(selection.partitions), 34)
+        df = self.store.read(selection)
+        self.assertEqual(sorted(df[POVERTY]), sorted(matching[POVERTY]))
+
+    def test_multiple_years_add_year_column(self):
+        df = self.store.scan(years=[2021, 2022], provinces=["PAPUA"], columns=[POVERTY])
+
+        self.assertEqual(list(df.columns), [YEAR_COLUMN, POVERTY])
+        self.assertEqual(sorted(df[YEAR_COLUMN].unique()), [2021, 2022])
+
+    def test_rewrite_reuses_unchanged_partitions_and_removes_stale_files(self):
+        store = PartitionStore(Path(self.tmp_dir.name) / "rewrite")
+        store.write_year(self.df, 2021)
+        version = store.select(years=[2021]).version
+        self.assertEqual(store.write_year(self.df, 2021), 0)
+        self.assertEqual(store.select(years=[2021]).version, version)
+
+        old_selection = store.select(years=[2021])
+        changed = self.df.copy()
+        changed.loc[changed["Provinsi"] == "ACEH", POVERTY] += 1
+        self.assertEqual(store.write_year(changed, 2021), 1)
+
+        self.assertNotEqual(store.select(years=[2021]).version, version)
+        pd.testing.assert_frame_equal(store.scan(years=[2021]), changed)
+        # Selection lama masih bisa dibaca sampai penulisan berikutnya.
+        pd.testing.assert_frame_equal(store.read(old_selection), self.df)
+        self.assertEqual(len(list((store.root / "tahun=2021").glob("*/*.parquet"))), 35)
+
+        changed.loc[changed["Provinsi"] == "ACEH", POVERTY] += 1
+        self.assertEqual(store.write_year(changed, 2021), 1)
+
+        self.assertEqual(len(list((store.root / "tahun=2021").glob("*/*.parquet"))), 35)
+        with self.assertRaises(FileNotFoundError):
+            store.read(old_selection)
+
+    def test_sync_source_rewrites_only_when_file_changes(self):
+        store = PartitionStore(Path(self.tmp_dir.name) / "synced")
+
+        self.assertTrue(store.sync_source(DATA_PATH, 2021))
+        self.assertFalse(store.sync_source(DATA_PATH, 2021))
+        self.assertEqual(store.warnings(2021), [])
+        pd.testing.assert_frame_equal(store.scan(years=[2021]), self.df)
+
+    def test_loader_reads_only_selected_year(self):
+        loader = DatasetLoader(DataStore(Path(self.tmp_dir.name) / "store"))
+
+        first = loader.load_partitions(self.store, years=(2022,))
+        second = loader.load_partitions(self.store, years=(2022,))
+
+        self.assertIs(first, second)
+        self.assertEqual(loader.stats()["misses"], 1)
+        pd.testing.assert_frame_equal(first.df_processed.reset_index(drop=True), self.df_next)
+        self.assertAlmostEqual(
+            first.df_provinsi.set_index("Provinsi").loc["ACEH", POVERTY],
+            self.df_next.loc[self.df_next["Provinsi"] == "ACEH", POVERTY].mean(),
+        )
+        other = loader.load_partitions(self.store, years=(2021,))
+        self.assertNotEqual(other.version, first.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
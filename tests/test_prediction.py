@@ -0,0 +1,112 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import data_store, prediction  # noqa: E402
+from dashboard.pipeline import process_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+RAW_PATH = ROOT / "data" / "Klasifikasi Tingkat Kemiskinan di Indonesia.csv"
+HAS_MODEL_DEPENDENCIES = all(
+    importlib.util.find_spec(name) is not None for name in ("joblib", "sklearn", "xgboost")
+)
+
+
+class LinearModel:
+    """Pengganti model dengan antarmuka predict_proba untuk uji tanpa xgboost."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, features):
+        self.calls.append(len(features))
+        positive = 1 / (1 + np.exp(-features.sum(axis=1)))
+        return np.column_stack([1 - positive, positive])
+
+
+def fake_model(df_processed):
+    features = prediction.feature_matrix(df_processed)
+    return prediction.PovertyModel("fake", LinearModel(), features.mean(axis=0), features.std(axis=0))
+
+
+class PredictionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df_processed, _ = process_dataframe(pd.read_csv(DATA_PATH))
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_features_use_training_units(self):
+        features = prediction.feature_matrix(self.df_processed)
+        raw = pd.read_csv(DATA_PATH)
+
+        np.testing.assert_allclose(
+            features[:, prediction.FEATURE_COLUMNS.index("Pengeluaran Per Kapita")],
+            raw["Pengeluaran per Kapita Disesuaikan (Ribu Rupiah/Orang/Tahun)"],
+        )
+
+    def test_batches_match_single_pass(self):
+        model = fake_model(self.df_processed)
+        batched = prediction.predict_frame(model, self.df_processed, batch_rows=100)
+        single = prediction.predict_frame(model, self.df_processed, batch_rows=len(self.df_processed))
+
+        pd.testing.assert_frame_equal(batched, single)
+        self.assertEqual(max(model.model.calls[:-1]), 100)
+
+    def test_streaming_raw_export_matches_batch(self):
+        model = fake_model(self.df_processed)
+        output = Path(self.tmp_dir.name) / "prediksi.csv"
+
+        rows = prediction.score_csv(model, RAW_PATH, output, block_size=4096)
+        streamed = pd.read_csv(output)
+
+        self.assertEqual(rows, len(self.df_processed))
+        expected = prediction.predict_frame(model, self.df_processed)
+        np.testing.assert_allclose(streamed[prediction.PROBABILITY_COLUMN], expected[prediction.PROBABILITY_COLUMN], rtol=1e-6)
+        self.assertEqual(list(streamed["Kab/Kota"]), list(self.df_processed["Kab/Kota"]))
+
+    def test_predictions_are_shared_per_version(self):
+        model = fake_model(self.df_processed)
+        store = data_store.DataStore(self.tmp_dir.name)
+
+        first = prediction.load_predictions(model, self.df_processed, "data", store)
+        calls = len(model.model.calls)
+        second = prediction.load_predictions(model, self.df_processed, "data", store)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(model.model.calls), calls)
+
+    def test_province_share_is_percentage(self):
+        model = fake_model(self.df_processed)
+        predictions = prediction.predict_frame(model, self.df_processed)
+        df_prediksi = prediction.aggregate_predictions(self.df_processed, predictions)
+
+        self.assertEqual(len(df_prediksi), self.df_processed["Provinsi"].nunique())
+        self.assertTrue(df_prediksi[prediction.SHARE_COLUMN].between(0, 100).all())
+
+    @unittest.skipUnless(HAS_MODEL_DEPENDENCIES, "joblib, scikit-learn, dan xgboost tidak terpasang")
+    def test_model_artifacts_match_notebook_pipeline(self):
+        import joblib
+
+        model = prediction.load_model()
+        raw = pd.read_csv(DATA_PATH)
+        scaler = joblib.load(prediction.SCALER_PATH)
+        xgb_model = joblib.load(prediction.MODEL_PATH)
+        expected = xgb_model.predict(scaler.transform(raw[list(scaler.feature_names_in_)]))
+
+        predictions = prediction.predict_frame(model, self.df_processed)
+        np.testing.assert_array_equal(predictions[prediction.CLASS_COLUMN], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
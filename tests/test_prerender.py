@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import prerender  # noqa: E402
+from dashboard.aggregation import ProvinceAggregator  # noqa: E402
+from dashboard.loader import LoadedDataset  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+POVERTY = "Persentase Kemiskinan (P0)"
+
+
+def make_dataset(df, version):
+    aggregator = ProvinceAggregator.from_frame(df)
+    return LoadedDataset(version, df, aggregator.means(), aggregator)
+
+
+class PrerenderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+        cls.dataset = make_dataset(cls.df, "v1")
+        cls.site_dir = tempfile.TemporaryDirectory()
+        cls.output = Path(cls.site_dir.name) / "site"
+        cls.report = prerender.build_site(cls.output, cls.dataset)
+        with (cls.output / prerender.MANIFEST_NAME).open(encoding="utf-8") as file:
+            cls.manifest = json.load(file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.site_dir.cleanup()
+
+    def test_bundle_contains_pages_and_hashed_assets(self):
+        self.assertEqual(self.manifest["pages"], ["index.html", "eda.html"])
+        for name, asset in self.manifest["assets"].items():
+            with self.subTest(asset=name):
+                data = (self.output / asset["file"]).read_bytes()
+                self.assertEqual(len(data), asset["bytes"])
+                self.assertIn(hashlib.sha256(data).hexdigest()[:16], asset["file"])
+
+        index = (self.output / "index.html").read_text(encoding="utf-8")
+        eda = (self.output / "eda.html").read_text(encoding="utf-8")
+        self.assertIn(self.manifest["assets"]["map"]["file"], index)
+        self.assertIn(self.manifest["assets"]["heatmap"]["file"], eda)
+        self.assertIn(self.manifest["assets"]["data_kemiskinan_indonesia-parquet"]["file"], eda)
+
+    def test_exports_and_geojson_match_sources(self):
+        assets = self.manifest["assets"]
+        csv = pd.read_csv(self.output / assets["data_kemiskinan_indonesia-csv"]["file"])
+        geojson = (self.output / assets["provinces"]["file"]).read_bytes()
+
+        self.assertEqual(len(csv), len(self.df))
+        self.assertEqual(list(csv[POVERTY]), list(self.df[POVERTY]))
+        self.assertEqual(gzip.decompress((self.output / assets["provinces-gz"]["file"]).read_bytes()), geojson)
+        self.assertEqual(len(json.loads(geojson)["features"]), 34)
+
+    def test_unchanged_inputs_reuse_every_asset(self):
+        report = prerender.build_site(self.output, self.dataset)
+
+        self.assertEqual(report["built"], [])
+        self.assertEqual(report["removed"], [])
+        self.assertEqual(len(report["reused"]), len(self.report["built"]))
+
+    def test_changed_dataset_rebuilds_only_data_assets_and_prunes(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        output = Path(tmp_dir.name) / "site"
+        prerender.build_site(output, self.dataset)
+        changed = self.df.copy()
+        changed[POVERTY] = changed[POVERTY] * 0.9
+
+        report = prerender.build_site(output, make_dataset(changed, "v2"))
+
+        self.assertIn("provinces", report["reused"])
+        self.assertIn("provinces-gz", report["reused"])
+        self.assertIn("map", report["built"])
+        self.assertIn("heatmap", report["built"])
+        self.assertIn("eda.html", report["built"])
+        with (output / prerender.MANIFEST_NAME).open(encoding="utf-8") as file:
+            files = {asset["file"] for asset in json.load(file)["assets"].values()}
+        on_disk = {path.relative_to(output).as_posix() for path in (output / prerender.ASSET_DIR).iterdir()}
+        self.assertEqual(on_disk, files)
+        self.assertTrue(report["removed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
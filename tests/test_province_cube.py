@@ -0,0 +1,61 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import province_cube  # noqa: E402
+from dashboard.pipeline import process_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+GEOJSON_PATH = ROOT / "data" / "prov 34.geojson"
+
+
+class ProvinceCubeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _, cls.df_provinsi = process_dataframe(pd.read_csv(DATA_PATH))
+        with GEOJSON_PATH.open(encoding="utf-8") as file:
+            cls.geojson_data = json.load(file)
+
+    def load_cube(self, cube_dir):
+        return province_cube.load_province_cube(self.df_provinsi, self.geojson_data, "data-v1", "geo-v1", cube_dir)
+
+    def test_cube_properties_match_province_aggregates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cube = self.load_cube(tmp_dir)
+
+        aceh = self.df_provinsi.set_index("Provinsi").loc["ACEH"]
+        idx = cube.feature_provinces.index("ACEH")
+        properties = cube.geojson_data["features"][idx]["properties"]
+
+        self.assertEqual(properties["PENDUDUK_MISKIN"], f"{aceh['Persentase Kemiskinan (P0)']:.2f}%")
+        self.assertEqual(properties["PDRB"], f"{aceh['PDRB']:,.0f} Rupiah")
+        self.assertEqual(cube.missing_in_geojson, [])
+        self.assertEqual(cube.missing_in_data, [])
+        self.assertEqual(len(cube.top_provinces), province_cube.TOP_N)
+
+    def test_cube_does_not_mutate_source_geojson(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cube = self.load_cube(tmp_dir)
+
+        self.assertNotIn("PENDUDUK_MISKIN", self.geojson_data["features"][0]["properties"])
+        self.assertIs(cube.geojson_data["features"][0]["geometry"], self.geojson_data["features"][0]["geometry"])
+
+    def test_cube_roundtrips_through_disk(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            built = self.load_cube(tmp_dir)
+            self.assertEqual(len(list(Path(tmp_dir).glob("*.json"))), 1)
+            loaded = self.load_cube(tmp_dir)
+
+        pd.testing.assert_frame_equal(loaded.df_provinsi, built.df_provinsi)
+        self.assertEqual(loaded.feature_provinces, built.feature_provinces)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard.aggregation import ProvinceAggregator  # noqa: E402
+from dashboard.loader import LoadedDataset  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+from dashboard.query import DatasetIndex, Query, filtered_dataset  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+POVERTY = "Persentase Kemiskinan (P0)"
+UNEMPLOYMENT = "Tingkat Pengangguran Terbuka"
+
+
+class DatasetIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = clean_dataframe(pd.read_csv(DATA_PATH))
+        cls.index = DatasetIndex(cls.df)
+
+    def expected_rows(self, provinces=(), ranges=()):
+        mask = pd.Series(True, index=self.df.index)
+        if provinces:
+            mask &= self.df["Provinsi"].isin(provinces)
+        for column, low, high in ranges:
+            mask &= self.df[column].between(low, high)
+        return np.flatnonzero(mask.to_numpy())
+
+    def test_select_matches_boolean_filter(self):
+        cases = [
+            Query(("ACEH",)),
+            Query(("JAWA BARAT", "PAPUA", "BALI")),
+            Query(ranges=((POVERTY, 10.0, 20.0),)),
+            Query(("JAWA TIMUR", "JAWA TENGAH"), ((POVERTY, 5.0, 12.5), (UNEMPLOYMENT, 3.0, 6.0))),
+        ]
+        for query in cases:
+            with self.subTest(query=query):
+                expected = self.expected_rows(query.provinces, query.ranges)
+                np.testing.assert_array_equal(self.index.select(query), expected)
+
+    def test_range_bounds_are_inclusive(self):
+        low, high = self.index.bounds(POVERTY)
+
+        self.assertEqual(self.index.count(Query(ranges=((POVERTY, low, high),))), len(self.df))
+        self.assertEqual(self.index.count(Query(ranges=((POVERTY, high, high),))), 1)
+
+    def test_top_matches_nlargest_and_nsmallest(self):
+        query = Query(("SUMATERA UTARA", "ACEH"), ((UNEMPLOYMENT, 2.0, 8.0),))
+        subset = self.df.iloc[self.expected_rows(query.provinces, query.ranges)]
+
+        for filt, frame in ((None, self.df), (query, subset)):
+            with self.subTest(filtered=filt is not None):
+                largest = self.index.top(POVERTY, 7, filt)
+                smallest = self.index.top(POVERTY, 7, filt, largest=False)
+
+                self.assertEqual(list(largest.columns), ["Provinsi", "Kab/Kota", POVERTY])
+                self.assertEqual(list(largest[POVERTY]), list(frame[POVERTY].nlargest(7)))
+                self.assertEqual(list(smallest[POVERTY]), list(frame[POVERTY].nsmallest(7)))
+
+    def test_empty_result_and_unknown_values(self):
+        self.assertEqual(self.index.count(Query(("ATLANTIS",))), 0)
+        self.assertEqual(len(self.index.top(POVERTY, 5, Query(("ATLANTIS",)))), 0)
+        with self.assertRaises(ValueError):
+            self.index.select(Query(ranges=(("Kolom Hilang", 0, 1),)))
+
+    def test_repeated_queries_hit_cache(self):
+        index = DatasetIndex(self.df)
+        query = Query(("BALI",))
+
+        first = index.select(query)
+        second = index.select(Query(("BALI",)))
+
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(index.stats()["hits"], 1)
+
+
+class FilteredDatasetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        df = clean_dataframe(pd.read_csv(DATA_PATH))
+        aggregator = ProvinceAggregator.from_frame(df)
+        cls.dataset = LoadedDataset("v1", df, aggregator.means(), aggregator)
+        cls.index = DatasetIndex(df)
+
+    def test_empty_query_returns_dataset(self):
+        self.assertIs(filtered_dataset(self.dataset, self.index, Query()), self.dataset)
+
+    def test_view_aggregates_filtered_rows(self):
+        query = Query(("JAWA BARAT", "BALI"), ((POVERTY, 0.0, 10.0),))
+
+        view = filtered_dataset(self.dataset, self.index, query)
+
+        df = self.dataset.df_processed
+        subset = df[df["Provinsi"].isin(query.provinces) & (df[POVERTY] <= 10.0)]
+        self.assertEqual(view.version, f"v1:q{query.key}")
+        self.assertEqual(len(view.df_processed), len(subset))
+        expected = subset.groupby("Provinsi")[POVERTY].mean()
+        means = view.df_provinsi.set_index("Provinsi")[POVERTY]
+        pd.testing.assert_series_equal(means.loc[expected.index], expected, check_names=False, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
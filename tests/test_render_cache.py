@@ -0,0 +1,64 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import render_cache  # noqa: E402
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_figure_key_depends_on_dataset_and_params(self):
+        base = render_cache.figure_key("v1", "scatter", feature="IPM")
+
+        self.assertEqual(base, render_cache.figure_key("v1", "scatter", feature="IPM"))
+        self.assertNotEqual(base, render_cache.figure_key("v2", "scatter", feature="IPM"))
+        self.assertNotEqual(base, render_cache.figure_key("v1", "scatter", feature="PDRB"))
+
+    def test_memory_tier_is_lru_bounded(self):
+        cache = render_cache.RenderCache(max_entries=2, disk_dir=None)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+
+        self.assertEqual(cache.get("a"), b"1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_disk_tier_is_shared_between_instances(self):
+        calls = []
+
+        def render():
+            calls.append(1)
+            return b"png-bytes"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = render_cache.RenderCache(disk_dir=tmp_dir)
+            second = render_cache.RenderCache(disk_dir=tmp_dir)
+
+            self.assertEqual(first.get_or_render("k" * 64, render), b"png-bytes")
+            self.assertEqual(second.get_or_render("k" * 64, render), b"png-bytes")
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.stats()["disk_hits"], 1)
+
+    def test_unpersisted_render_stays_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = render_cache.RenderCache(disk_dir=tmp_dir)
+
+            self.assertEqual(cache.get_or_render("k" * 64, lambda: b"png", persist=False), b"png")
+            self.assertEqual(cache.get_or_render("k" * 64, lambda: b"other", persist=False), b"png")
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [])
+
+    def test_none_result_is_not_cached(self):
+        cache = render_cache.RenderCache(disk_dir=None)
+
+        self.assertIsNone(cache.get_or_render("key", lambda: None))
+        self.assertIsNone(cache.get("key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
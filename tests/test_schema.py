@@ -0,0 +1,103 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import ingest  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+from dashboard.schema import ERROR, WARNING, validate_frame  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+HEADER = "Provinsi;Kab/Kota;Persentase Penduduk Miskin (P0) Menurut Kabupaten/Kota (Persen);Tingkat Pengangguran Terbuka\n"
+
+
+def by_rule(report):
+    return {(violation.column, violation.rule): violation for violation in report.violations}
+
+
+class SchemaValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_raw(self, text):
+        path = Path(self.tmp_dir.name) / "raw.csv"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_all_violations_reported_with_rows_across_blocks(self):
+        rows = [f"ACEH;Kab {idx};10,5;5,1\n" for idx in range(200)]
+        rows[10] = "ACEH;Kab 10;n/a;5,1\n"
+        rows[150] = "ACEH;Kab 150;12;abc\n"
+        rows[199] = ";Kab 199;12;4\n"
+        path = self.write_raw(HEADER + "".join(rows))
+
+        # Blok kecil memaksa banyak batch; pelanggaran dari semua batch tetap terkumpul.
+        report = ingest.validate_file(path, block_size=1024)
+        violations = by_rule(report)
+
+        self.assertEqual(report.rows, 200)
+        self.assertEqual(violations[("Persentase Kemiskinan (P0)", "not_number")].rows, (12,))
+        self.assertEqual(violations[("Tingkat Pengangguran Terbuka", "not_number")].rows, (152,))
+        self.assertEqual(violations[("Provinsi", "empty")].rows, (201,))
+        self.assertEqual(len(report.errors), 3)
+
+        with self.assertRaises(ValueError) as context:
+            ingest.read_source(path, block_size=1024)
+        message = str(context.exception)
+        for fragment in ("[12]", "[152]", "[201]"):
+            self.assertIn(fragment, message)
+
+    def test_ranges_and_provinces_are_warnings(self):
+        path = self.write_raw(
+            HEADER
+            + "ACEH;Simeulue;120;5\n"
+            + "ATLANTIS;Kota Hilang;10;-1\n"
+        )
+
+        report = ingest.validate_file(path)
+        violations = by_rule(report)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(violations[("Persentase Kemiskinan (P0)", "above_max")].rows, (2,))
+        self.assertEqual(violations[("Tingkat Pengangguran Terbuka", "below_min")].rows, (3,))
+        self.assertEqual(violations[("Provinsi", "unknown_value")].values, ("ATLANTIS",))
+        self.assertIn("BALI", violations[("Provinsi", "missing_values")].values)
+        self.assertEqual(violations[("PDRB", "missing_column")].severity, WARNING)
+        self.assertEqual(len(ingest.read_source(path)), 2)
+
+    def test_missing_required_column_is_error(self):
+        path = self.write_raw("Provinsi;Kab/Kota\nACEH;Simeulue\n")
+
+        violations = by_rule(ingest.validate_file(path))
+
+        self.assertEqual(violations[("Persentase Kemiskinan (P0)", "missing_column")].severity, ERROR)
+
+    def test_frame_validation_reports_every_column(self):
+        df = clean_dataframe(pd.read_csv(DATA_PATH))
+        self.assertTrue(validate_frame(df).ok)
+
+        df = df.copy()
+        df.loc[3, "PDRB"] = float("nan")
+        df.loc[7, "Umur Harapan Hidup"] = float("nan")
+        report = validate_frame(df)
+
+        self.assertEqual(by_rule(report)[("PDRB", "empty")].rows, (5,))
+        self.assertEqual(by_rule(report)[("Umur Harapan Hidup", "empty")].rows, (9,))
+
+    def test_clean_dataframe_raises_all_invalid_columns(self):
+        raw = pd.read_csv(DATA_PATH, dtype={"Tingkat Pengangguran Terbuka": str})
+        raw.loc[0, "Tingkat Pengangguran Terbuka"] = "x"
+        raw.loc[5, "Indeks Pembangunan Manusia"] = None
+
+        with self.assertRaisesRegex(ValueError, r"(?s)Indeks Pembangunan Manusia.*\[7\].*Tingkat Pengangguran"):
+            clean_dataframe(raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
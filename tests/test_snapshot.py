@@ -0,0 +1,48 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import snapshot  # noqa: E402
+from dashboard.pipeline import clean_dataframe  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "df_cleaned.csv"
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+
+    def test_snapshot_matches_csv_pipeline(self):
+        snapshot_path = snapshot.build_snapshot(DATA_PATH, self.tmp_path / "df.arrow")
+
+        expected = clean_dataframe(pd.read_csv(DATA_PATH))
+        loaded = snapshot.load_snapshot(DATA_PATH, snapshot_path)
+
+        self.assertIsNotNone(loaded)
+        pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+        self.assertTrue(all(loaded[col].dtype == "float64" for col in expected.select_dtypes("number")))
+
+    def test_stale_snapshot_is_ignored(self):
+        source_path = self.tmp_path / "source.csv"
+        source_path.write_bytes(DATA_PATH.read_bytes())
+        snapshot_path = snapshot.build_snapshot(source_path, self.tmp_path / "df.arrow")
+
+        with source_path.open("a", encoding="utf-8") as file:
+            file.write("ACEH,Tambahan,1,1,1,1,1,1,1,1,1,1,0\n")
+
+        self.assertIsNone(snapshot.load_snapshot(source_path, snapshot_path))
+
+    def test_missing_snapshot_returns_none(self):
+        self.assertIsNone(snapshot.load_snapshot(DATA_PATH, self.tmp_path / "missing.arrow"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import tiles  # noqa: E402
+
+
+def read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def read_message(data):
+    """Decoder protobuf minimal: {nomor field: [nilai]}."""
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise ValueError(wire_type)
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def read_packed(data):
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def decode_rings(commands):
+    rings, pos, x, y = [], 0, 0, 0
+    while pos < len(commands):
+        command, count = commands[pos] & 7, commands[pos] >> 3
+        pos += 1
+        if command == tiles.MOVE_TO:
+            rings.append([])
+        if command in (tiles.MOVE_TO, tiles.LINE_TO):
+            for _ in range(count):
+                dx, dy = commands[pos], commands[pos + 1]
+                x += (dx >> 1) ^ -(dx & 1)
+                y += (dy >> 1) ^ -(dy & 1)
+                rings[-1].append((x, y))
+                pos += 2
+    return [np.array(ring) for ring in rings]
+
+
+def decode_tile(data):
+    """{nama layer: [(properti, rings)]}."""
+    layers = {}
+    for raw_layer in read_message(data)[3]:
+        layer = read_message(raw_layer)
+        keys = [key.decode() for key in layer.get(3, [])]
+        values = []
+        for raw_value in layer.get(4, []):
+            value = read_message(raw_value)
+            values.append(value[1][0].decode() if 1 in value else struct.unpack("<d", value[3][0])[0])
+        features = []
+        for raw_feature in layer.get(2, []):
+            feature = read_message(raw_feature)
+            tags = read_packed(feature[2][0])
+            properties = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            features.append((properties, decode_rings(read_packed(feature[4][0]))))
+        layers[layer[1][0].decode()] = features
+    return layers
+
+
+def square(name, west, south, size):
+    ring = [[west, south], [west + size, south], [west + size, south + size], [west, south + size], [west, south]]
+    return {"type": "Feature", "properties": {"name": name}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+GEOJSON = {"type": "FeatureCollection", "features": [square("A", 100.0, -5.0, 10.0), square("B", 115.0, -5.0, 2.0)]}
+
+
+def square_layer(name=tiles.PROVINCE_LAYER, min_zoom=3, max_zoom=5):
+    properties = [{"name": "A", "fill": "#ff0000", "value": 1.5}, {"name": "B", "fill": "#00ff00", "value": 2.5}]
+    return tiles.TileLayer(name, lambda zoom: GEOJSON, properties, min_zoom, max_zoom)
+
+
+class TileEncodingTest(unittest.TestCase):
+    def test_clip_ring_to_box(self):
+        ring = np.array([[-10.0, -10.0], [10.0, -10.0], [10.0, 10.0], [-10.0, 10.0]])
+        clipped = tiles.clip_ring(ring, 0.0, 5.0)
+
+        self.assertEqual(clipped.min(), 0.0)
+        self.assertEqual(clipped.max(), 5.0)
+        self.assertAlmostEqual(abs(tiles.signed_area(clipped)), 25.0)
+
+    def test_clip_ring_outside_box_is_empty(self):
+        ring = np.array([[10.0, 10.0], [20.0, 10.0], [20.0, 20.0]])
+
+        self.assertEqual(len(tiles.clip_ring(ring, 0.0, 5.0)), 0)
+
+    def test_round_trip_properties_and_orientation(self):
+        layer = square_layer()
+        tile_map = tiles.layer_tiles(layer, 3)
+        (x, y), features = next(iter(tile_map.items()))
+        decoded = decode_tile(tiles.encode_tile([(layer.name, features)]))
+
+        properties, rings = decoded[tiles.PROVINCE_LAYER][0]
+        self.assertIn(properties["name"], {"A", "B"})
+        self.assertIsInstance(properties["value"], float)
+        for ring in rings:
+            self.assertGreater(tiles.signed_area(ring), 0)
+            self.assertTrue((ring >= -tiles.BUFFER).all() and (ring <= tiles.EXTENT + tiles.BUFFER).all())
+
+    def test_only_intersecting_tiles_are_generated(self):
+        layer = square_layer()
+        for zoom in (3, 5):
+            scale = 2 ** zoom
+            tile_map = tiles.layer_tiles(layer, zoom)
+            self.assertLess(len(tile_map), scale * scale)
+            for x, y in tile_map:
+                with self.subTest(zoom=zoom, x=x, y=y):
+                    # Bujur 100..117 derajat.
+                    self.assertGreaterEqual(x, int((100 + 180) / 360 * scale) - 1)
+                    self.assertLessEqual(x, int((117 + 180) / 360 * scale) + 1)
+
+
+class TilesetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tile_dir = Path(self.tmp_dir.name) / "static" / "tiles"
+
+    def test_tileset_written_once_and_reused(self):
+        layers = [square_layer()]
+        metadata = tiles.load_tileset(layers, "v1", self.tile_dir)
+
+        self.assertGreater(metadata["tiles"], 0)
+        self.assertEqual(len(list((self.tile_dir / "v1").rglob("*.pbf"))), metadata["tiles"])
+        self.assertEqual([path.name for path in self.tile_dir.iterdir()], ["v1"])
+
+        with mock.patch.object(tiles, "write_tiles") as write_tiles:
+            self.assertEqual(tiles.load_tileset(layers, "v1", self.tile_dir), metadata)
+        write_tiles.assert_not_called()
+
+    def test_recent_tilesets_survive_a_new_build(self):
+        layers = [square_layer()]
+        tiles.load_tileset(layers, "v1", self.tile_dir)
+        tiles.load_tileset(layers, "v2", self.tile_dir)
+        tiles.load_tileset(layers, "v1", self.tile_dir)
+
+        self.assertEqual(sorted(path.name for path in self.tile_dir.iterdir()), ["v1", "v2"])
+        self.assertTrue(tiles.touch_tileset("v2", self.tile_dir))
+        self.assertFalse(tiles.touch_tileset("v3", self.tile_dir))
+
+    def test_only_old_unused_tilesets_are_pruned(self):
+        layers = [square_layer()]
+        for version in ("old", "kept", "recent"):
+            tiles.load_tileset(layers, version, self.tile_dir, prune=False)
+        (self.tile_dir / ".new-build").mkdir()
+        day = 24 * 3600
+        now = time.time()
+        for version, age in (("old", 10 * day), ("kept", 10 * day), ("recent", 0)):
+            used_at = now - age
+            os.utime(self.tile_dir / version / tiles.METADATA_NAME, (used_at, used_at))
+
+        removed = tiles.remove_stale_tilesets(self.tile_dir, keep=("kept",), max_age=day, keep_latest=1, now=now)
+
+        self.assertEqual(removed, ["old"])
+        self.assertEqual(sorted(path.name for path in self.tile_dir.iterdir()), [".new-build", "kept", "recent"])
+
+    def test_district_layer_only_at_its_zooms(self):
+        layers = [square_layer(max_zoom=4), square_layer(tiles.DISTRICT_LAYER, min_zoom=4, max_zoom=5)]
+        tiles.load_tileset(layers, "v2", self.tile_dir)
+
+        for path in (self.tile_dir / "v2").rglob("*.pbf"):
+            zoom = int(path.relative_to(self.tile_dir / "v2").parts[0])
+            decoded = decode_tile(path.read_bytes())
+            with self.subTest(path=str(path)):
+                self.assertEqual(tiles.PROVINCE_LAYER in decoded, zoom <= 4)
+                self.assertEqual(tiles.DISTRICT_LAYER in decoded, zoom >= 4)
+                # Nama feature sama di kedua layer; properti layer membedakan ID-nya di browser.
+                for name, features in decoded.items():
+                    self.assertEqual({properties[tiles.LAYER_PROPERTY] for properties, _ in features}, {name})
+
+    def test_tile_url_uses_static_route(self):
+        url = tiles.tile_url("v1", "dashboard", self.tile_dir)
+
+        self.assertEqual(url, "/dashboard/app/static/tiles/v1/{z}/{x}/{y}.pbf")
+
+    def test_district_properties_joined_by_name(self):
+        df = pd.DataFrame({"Kab/Kota": ["Kota A", "b"], "Persentase Kemiskinan (P0)": [10.0, 20.0]})
+        formats = tiles.district_formats(df, [("PENDUDUK_MISKIN", "Persentase Kemiskinan (P0)", "{:.2f}%")])
+        geojson_data = json.loads(json.dumps(GEOJSON))
+        geojson_data["features"][0]["properties"]["name"] = "KOTA A"
+        geojson_data["features"][1]["properties"]["name"] = "Kabupaten B"
+
+        layer = tiles.district_layer(geojson_data, "geo", "name", {"KOTA A": "#111111"}, formats)
+
+        self.assertEqual(layer.properties[0]["PENDUDUK_MISKIN"], "10.00%")
+        self.assertEqual(layer.properties[0]["fill"], "#111111")
+        self.assertEqual(layer.properties[1]["PENDUDUK_MISKIN"], "20.00%")
+        self.assertIsNone(layer.properties[1]["fill"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import render_cache, tracing  # noqa: E402
+
+
+class TracingTest(unittest.TestCase):
+    def test_disabled_tracing_uses_shared_null_span(self):
+        span = tracing.span("load_dataset", cache="hit")
+
+        self.assertIs(span, tracing.NULL_SPAN)
+        with span as active:
+            active.bytes = 10
+            tracing.annotate(cache="miss")
+        self.assertFalse(tracing.is_enabled())
+
+    def test_nested_spans_record_depth_and_duration(self):
+        trace = tracing.start_trace("map")
+        with tracing.span("load_map_cube", cache="hit"):
+            with tracing.span("load_geojson") as inner:
+                inner.bytes = 123
+            tracing.annotate(cache="miss")
+        tracing.finish_trace(trace)
+
+        outer, inner = trace.spans
+        self.assertEqual((outer.name, outer.depth, outer.cache), ("load_map_cube", 0, "miss"))
+        self.assertEqual((inner.name, inner.depth, inner.bytes), ("load_geojson", 1, 123))
+        self.assertGreaterEqual(outer.duration_ms, inner.duration_ms)
+        self.assertIsNotNone(trace.total_ms)
+        self.assertFalse(tracing.is_enabled())
+
+    def test_render_cache_annotates_hit_and_miss(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = render_cache.RenderCache(disk_dir=tmp_dir)
+            trace = tracing.start_trace("eda")
+            with tracing.span("first"):
+                cache.get_or_render("key", lambda: b"png")
+            with tracing.span("second"):
+                cache.get_or_render("key", lambda: b"png")
+            tracing.finish_trace(trace)
+
+        self.assertEqual([span.cache for span in trace.spans], ["miss", "hit"])
+
+    def test_trace_is_logged_as_single_json_line(self):
+        stream = io.StringIO()
+        logger = tracing.configure_logging(stream)
+        self.addCleanup(logger.handlers.clear)
+
+        trace = tracing.start_trace("eda", log=True)
+        with tracing.span("create_scatter_plots"):
+            pass
+        tracing.finish_trace(trace)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record["trace_id"], trace.trace_id)
+        self.assertEqual(record["spans"][0]["name"], "create_scatter_plots")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import ast
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dashboard import warmup  # noqa: E402
+
+PAGE_ONLY_MODULES = {"folium", "streamlit_folium", "requests", "dashboard.map_builder", "matplotlib", "seaborn"}
+
+
+class WarmupTest(unittest.TestCase):
+    def test_result_waits_for_background_task(self):
+        release = threading.Event()
+        pool = warmup.Warmup(max_workers=2)
+        pool.submit("dataset", lambda: release.wait(5) and "siap")
+
+        self.assertEqual(pool.report()["tasks"]["dataset"]["status"], "running")
+        release.set()
+
+        self.assertEqual(pool.result("dataset", lambda: "ulang"), "siap")
+        self.assertEqual(pool.report()["tasks"]["dataset"]["status"], "ok")
+
+    def test_failed_task_falls_back_to_foreground(self):
+        pool = warmup.Warmup(max_workers=1)
+
+        def broken():
+            raise OSError("disk penuh")
+
+        pool.submit("geojson", broken)
+
+        self.assertEqual(pool.result("geojson", lambda: "ulang"), "ulang")
+        self.assertIsNone(pool.result("geojson"))
+        self.assertEqual(pool.report()["tasks"]["geojson"]["status"], "failed")
+
+    def test_deferred_task_runs_once(self):
+        calls = []
+        pool = warmup.Warmup(max_workers=1)
+        pool.defer("model", calls.append, "latar")
+
+        self.assertEqual(calls, [])
+        pool.start_deferred()
+        pool.result("model")
+        self.assertEqual(calls, ["latar"])
+
+        pool.defer("model", calls.append, "lagi")
+        pool.start_deferred()
+        self.assertEqual(calls, ["latar"])
+
+    def test_needed_deferred_task_runs_in_foreground_only(self):
+        calls = []
+        pool = warmup.Warmup(max_workers=1)
+        pool.defer("model", calls.append, "latar")
+
+        pool.result("model", calls.append, "langsung")
+        pool.start_deferred()
+
+        self.assertEqual(calls, ["langsung"])
+        self.assertNotIn("model", pool.report()["tasks"])
+
+    def test_first_paint_is_recorded_once(self):
+        pool = warmup.Warmup()
+        pool.mark_first_paint(0.0)
+        first = pool.first_paint_seconds
+        pool.mark_first_paint(0.0)
+
+        self.assertEqual(pool.first_paint_seconds, first)
+
+    def test_timed_import_records_first_import(self):
+        sys.modules.pop("tabnanny", None)
+        module = warmup.timed_import("tabnanny")
+
+        self.assertEqual(module.__name__, "tabnanny")
+        self.assertIn("tabnanny", warmup.import_timings())
+
+    def test_app_defers_page_only_imports(self):
+        tree = ast.parse((ROOT / "app.py").read_text(encoding="utf-8"))
+        imported = set()
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                imported.add(node.module)
+
+        self.assertFalse(imported & PAGE_ONLY_MODULES)
+
+
+if __name__ == "__main__":
+    unittest.main()